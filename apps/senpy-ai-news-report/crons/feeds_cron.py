@@ -1,19 +1,45 @@
 import logging
 import asyncio
-from senpy_ai_news_report.features.news.rss.feed_parser import post_feeds, parse_feeds
+from senpy_ai_news_report.features.ai.batch_poller import drain_batch_jobs
+from senpy_ai_news_report.features.news.rss.feed_parser import submit_feeds_for_posting
+from senpy_ai_news_report.features.news.rss.parse_executor import shutdown_parse_executor
+from senpy_ai_news_report.features.telegram_integration_features.message_outbox import (
+    drain_telegram_outbox,
+    stop_telegram_outbox,
+)
+from senpy_ai_news_report.utils.env import env_bool
+from senpy_ai_news_report.features.telegram_integration_features.telegram_client import (
+    stop_telegram_client,
+)
+from senpy_ai_news_report.utils.http_client import close_http_client
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 async def main():
     logging.info("Starting 'post_feeds' job.")
     try:
-        feeds = await parse_feeds()
-        await post_feeds(feeds)
+        await submit_feeds_for_posting()
         logging.info("'post_feeds' job finished successfully.")
     except Exception as e:
         logging.error(f"'post_feeds' job failed: {e}")
         raise
 
+async def run_standalone():
+    try:
+        await main()
+        # Without a resident poller, wait here until the batch results are posted
+        await drain_batch_jobs()
+        # Scheduled posts are held in the outbox until their slot, so with
+        # FEEDS_SCHEDULE_POSTS the script stays up until the last of them is
+        # sent. Held posts left behind by a killed run go out when the next
+        # run starts the outbox.
+        await drain_telegram_outbox(include_scheduled=env_bool("FEEDS_SCHEDULE_POSTS", False))
+    finally:
+        await stop_telegram_outbox()
+        await stop_telegram_client()
+        await close_http_client()
+        shutdown_parse_executor()
+
 if __name__ == "__main__":
     logging.info("Running feeds cron script.")
-    asyncio.run(main())
+    asyncio.run(run_standalone())
@@ -3,18 +3,38 @@ import asyncio
 from senpy_ai_news_report.features.news.github_trending.post_github_trends import (
     post_github_trends,
 )
+from senpy_ai_news_report.features.news.github_trending.trending_collector import collect_trending
+from senpy_ai_news_report.features.telegram_integration_features.message_outbox import (
+    drain_telegram_outbox,
+    stop_telegram_outbox,
+)
+from senpy_ai_news_report.features.telegram_integration_features.telegram_client import (
+    stop_telegram_client,
+)
+from senpy_ai_news_report.utils.http_client import close_http_client
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 async def main():
     logging.info("Starting 'post_github_trends' job.")
     try:
+        # Refresh every configured trending page concurrently; the post reads from the snapshots
+        await collect_trending()
         await post_github_trends(None, 5, None)
         logging.info("'post_github_trends' job finished successfully.")
     except Exception as e:
         logging.error(f"'post_github_trends' job failed: {e}")
         raise
 
+async def run_standalone():
+    try:
+        await main()
+        await drain_telegram_outbox()
+    finally:
+        await stop_telegram_outbox()
+        await stop_telegram_client()
+        await close_http_client()
+
 if __name__ == "__main__":
     logging.info("Running github trends cron script.")
-    asyncio.run(main())
+    asyncio.run(run_standalone())
@@ -16,6 +16,20 @@ from apscheduler.triggers.cron import CronTrigger
 
 from crons.feeds_cron import main as feeds_job
 from crons.github_trends_cron import main as github_job
+from senpy_ai_news_report.features.ai.batch_poller import start_batch_poller, stop_batch_poller
+from senpy_ai_news_report.features.news.rss.parse_executor import (
+    shutdown_parse_executor,
+    start_parse_executor,
+)
+from senpy_ai_news_report.features.telegram_integration_features.message_outbox import (
+    start_telegram_outbox,
+    stop_telegram_outbox,
+)
+from senpy_ai_news_report.features.telegram_integration_features.telegram_client import (
+    start_telegram_client,
+    stop_telegram_client,
+)
+from senpy_ai_news_report.utils.http_client import close_http_client, start_http_client
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -230,6 +244,14 @@ def get_jobs_overview() -> List[Dict[str, Any]]:
 
 
 async def run_forever() -> None:
+    await start_http_client()
+    start_parse_executor()
+    start_batch_poller()
+    try:
+        await start_telegram_client()
+    except Exception as exc:  # pragma: no cover - defensive logging
+        logger.exception("Failed to connect Telegram client: %s", exc)
+    start_telegram_outbox()
     await ensure_scheduler_started(refresh=True)
 
     stop_event = asyncio.Event()
@@ -248,6 +270,11 @@ async def run_forever() -> None:
         await stop_event.wait()
     finally:
         await shutdown_scheduler(wait=True)
+        await stop_batch_poller()
+        await stop_telegram_outbox()
+        await stop_telegram_client()
+        await close_http_client()
+        shutdown_parse_executor()
 
 
 __all__ = [
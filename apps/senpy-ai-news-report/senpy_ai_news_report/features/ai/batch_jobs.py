@@ -0,0 +1,237 @@
+"""Persistent table of submitted OpenAI Batch API jobs.
+
+Jobs survive restarts: the poller picks up anything still pending from the
+table and hands finished results to the job's named continuation. Large
+workloads are split into shards, each its own OpenAI batch, tracked inside
+the owning job.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List
+
+from senpy_ai_news_report.utils.env import env_float
+from senpy_ai_news_report.utils.storage import connect_sqlite
+
+JOB_SUBMITTED = "submitted"
+JOB_COMPLETED = "completed"
+JOB_DELIVERED = "delivered"
+JOB_FAILED = "failed"
+
+# Batch API statuses after which no more output will appear.
+OPENAI_TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+def initial_poll_interval() -> float:
+    return env_float("BATCH_POLL_INITIAL_SECONDS", 5.0)
+
+
+def next_poll_interval(current: float) -> float:
+    """Grow the poll interval exponentially up to BATCH_POLL_MAX_SECONDS."""
+
+    return min(current * 2, env_float("BATCH_POLL_MAX_SECONDS", 600.0))
+
+
+@dataclass
+class BatchShard:
+    index: int
+    request_count: int
+    byte_size: int
+    batch_id: str | None = None
+    input_file_id: str | None = None
+    output_file_id: str | None = None
+    error_file_id: str | None = None
+    openai_status: str | None = None
+    completed_requests: int = 0
+    failed_requests: int = 0
+    error: str | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.batch_id is None or self.openai_status in OPENAI_TERMINAL_STATUSES
+
+
+@dataclass
+class BatchJob:
+    id: str
+    status: str
+    continuation: str | None
+    shards: List[BatchShard] = field(default_factory=list)
+    context: Dict[str, Any] = field(default_factory=dict)
+    poll_interval: float = 5.0
+    next_poll_at: float = 0.0
+    created_at: float = 0.0
+    updated_at: float = 0.0
+    error: str | None = None
+
+    def failed_shards(self) -> List[BatchShard]:
+        return [shard for shard in self.shards if shard.error or shard.failed_requests]
+
+    def summary(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop("context")
+        return data
+
+
+_COLUMNS = [
+    "id",
+    "status",
+    "continuation",
+    "shards",
+    "context",
+    "poll_interval",
+    "next_poll_at",
+    "created_at",
+    "updated_at",
+    "error",
+]
+
+
+class BatchJobStore:
+    def __init__(self, filename: str = "batch_jobs.sqlite3"):
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(filename)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS batch_jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                continuation TEXT,
+                shards TEXT NOT NULL,
+                context TEXT NOT NULL,
+                poll_interval REAL NOT NULL,
+                next_poll_at REAL NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                error TEXT
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS batch_jobs_due ON batch_jobs (status, next_poll_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def _from_row(row) -> BatchJob:
+        values = dict(row)
+        values["context"] = json.loads(values["context"])
+        values["shards"] = [BatchShard(**shard) for shard in json.loads(values["shards"])]
+        return BatchJob(**values)
+
+    def create(
+        self,
+        shards: List[BatchShard],
+        continuation: str | None,
+        context: Dict[str, Any],
+        status: str = JOB_SUBMITTED,
+    ) -> BatchJob:
+        now = time.time()
+        interval = initial_poll_interval()
+        job = BatchJob(
+            id=uuid.uuid4().hex,
+            shards=shards,
+            status=status,
+            continuation=continuation,
+            context=context,
+            poll_interval=interval,
+            next_poll_at=now + interval,
+            created_at=now,
+            updated_at=now,
+        )
+        self.save(job)
+        return job
+
+    def save(self, job: BatchJob) -> None:
+        job.updated_at = time.time()
+        values = asdict(job)
+        values["context"] = json.dumps(job.context)
+        values["shards"] = json.dumps(values["shards"])
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO batch_jobs ({', '.join(_COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in _COLUMNS)})",
+                [values[column] for column in _COLUMNS],
+            )
+            self._conn.commit()
+
+    def get(self, job_id: str) -> BatchJob | None:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM batch_jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._from_row(row) if row else None
+
+    def due_jobs(self, now: float | None = None) -> List[BatchJob]:
+        """Jobs with a continuation that are waiting on OpenAI or on delivery."""
+
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT * FROM batch_jobs
+                WHERE status IN (?, ?) AND continuation IS NOT NULL AND next_poll_at <= ?
+                ORDER BY next_poll_at
+                """,
+                (JOB_SUBMITTED, JOB_COMPLETED, now),
+            ).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def pending_jobs(self, continuations: List[str]) -> List[BatchJob]:
+        """Jobs for the given continuations that have not been delivered yet."""
+
+        if not continuations:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT * FROM batch_jobs
+                WHERE status IN (?, ?) AND continuation IN ({', '.join('?' for _ in continuations)})
+                """,
+                (JOB_SUBMITTED, JOB_COMPLETED, *continuations),
+            ).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def next_due_at(self) -> float | None:
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT MIN(next_poll_at) FROM batch_jobs
+                WHERE status IN (?, ?) AND continuation IS NOT NULL
+                """,
+                (JOB_SUBMITTED, JOB_COMPLETED),
+            ).fetchone()
+        return row[0]
+
+    def recent(self, limit: int = 50) -> List[BatchJob]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM batch_jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [self._from_row(row) for row in rows]
+
+
+_job_store: BatchJobStore | None = None
+
+
+def get_batch_job_store() -> BatchJobStore:
+    global _job_store
+    if _job_store is None:
+        _job_store = BatchJobStore()
+    return _job_store
+
+
+__all__ = [
+    "BatchJob",
+    "BatchShard",
+    "BatchJobStore",
+    "get_batch_job_store",
+    "initial_poll_interval",
+    "next_poll_interval",
+    "JOB_SUBMITTED",
+    "JOB_COMPLETED",
+    "JOB_DELIVERED",
+    "JOB_FAILED",
+    "OPENAI_TERMINAL_STATUSES",
+]
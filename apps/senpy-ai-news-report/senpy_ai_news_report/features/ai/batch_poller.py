@@ -0,0 +1,153 @@
+"""Background poller that delivers finished Batch API jobs to their continuations."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import suppress
+from typing import Any, Awaitable, Callable, Dict, List
+
+from senpy_ai_news_report.features.ai.batch_jobs import (
+    JOB_COMPLETED,
+    JOB_DELIVERED,
+    JOB_FAILED,
+    BatchJob,
+    get_batch_job_store,
+    next_poll_interval,
+)
+from senpy_ai_news_report.features.ai.openai_client import AiNewsClient
+from senpy_ai_news_report.utils.env import env_float
+
+logger = logging.getLogger(__name__)
+
+Continuation = Callable[[List[Dict[str, Any]], Dict[str, Any]], Awaitable[Any]]
+
+_continuations: Dict[str, Continuation] = {}
+_poller_task: asyncio.Task[None] | None = None
+_wake_event: asyncio.Event | None = None
+
+
+def register_continuation(name: str, handler: Continuation) -> None:
+    """Register the coroutine that receives ``(results, continuation_context)`` for a job."""
+
+    _continuations[name] = handler
+
+
+def notify_new_job() -> None:
+    """Wake the poller so a freshly submitted job is scheduled promptly."""
+
+    if _wake_event is not None:
+        _wake_event.set()
+
+
+async def _deliver(client: AiNewsClient, job: BatchJob) -> None:
+    handler = _continuations.get(job.continuation or "")
+    if handler is None:
+        raise LookupError(f"No continuation registered under '{job.continuation}'")
+
+    results = await client.collect_batch_results(job)
+    await handler(results, job.context.get("continuation_context") or {})
+    failed = job.failed_shards()
+    if failed:
+        # The continuation only got the results that exist; results of the
+        # failed shards are missing, so the job does not count as delivered.
+        job.status = JOB_FAILED
+        logger.error(
+            "Batch job %s delivered %s results to '%s', %s of %s shards failed: %s",
+            job.id,
+            len(results),
+            job.continuation,
+            len(failed),
+            len(job.shards),
+            job.error,
+        )
+    else:
+        job.status = JOB_DELIVERED
+        job.error = None
+        logger.info("Batch job %s delivered to '%s' (%s results)", job.id, job.continuation, len(results))
+    # Record the outcome before deleting the files: a crash in between must not
+    # leave a pending job whose results can no longer be downloaded.
+    get_batch_job_store().save(job)
+    try:
+        await client.delete_batch_files(job)
+    except Exception as exc:
+        logger.warning("Could not delete the files of batch job %s: %s", job.id, exc)
+
+
+async def poll_due_jobs() -> int:
+    """Advance every due job once. Returns how many jobs were looked at."""
+
+    client = AiNewsClient()
+    store = get_batch_job_store()
+    jobs = store.due_jobs()
+    for job in jobs:
+        try:
+            job = await client.refresh_batch_job(job)
+            if job.status == JOB_COMPLETED:
+                await _deliver(client, job)
+        except Exception as exc:
+            # Keep the job; retry later with the same growing interval.
+            logger.exception("Batch job %s could not be advanced: %s", job.id, exc)
+            job.error = str(exc)
+            job.poll_interval = next_poll_interval(job.poll_interval)
+            job.next_poll_at = time.time() + job.poll_interval
+            if time.time() - job.created_at > env_float("BATCH_JOB_MAX_AGE_SECONDS", 2 * 24 * 3600):
+                job.status = JOB_FAILED
+                logger.error("Giving up on batch job %s", job.id)
+            store.save(job)
+    return len(jobs)
+
+
+async def _poll_forever() -> None:
+    idle_seconds = env_float("BATCH_POLLER_IDLE_SECONDS", 30.0)
+    store = get_batch_job_store()
+    assert _wake_event is not None
+    while True:
+        try:
+            await poll_due_jobs()
+        except Exception as exc:  # pragma: no cover - defensive logging
+            logger.exception("Batch poller iteration failed: %s", exc)
+
+        next_due = store.next_due_at()
+        delay = idle_seconds if next_due is None else min(idle_seconds, next_due - time.time())
+        _wake_event.clear()
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(_wake_event.wait(), timeout=max(0.5, delay))
+
+
+def start_batch_poller() -> None:
+    global _poller_task, _wake_event
+    if _poller_task is None or _poller_task.done():
+        _wake_event = asyncio.Event()
+        _poller_task = asyncio.get_running_loop().create_task(_poll_forever())
+        logger.info("Batch job poller started")
+
+
+async def stop_batch_poller() -> None:
+    global _poller_task
+    if _poller_task is not None:
+        _poller_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await _poller_task
+        logger.info("Batch job poller stopped")
+    _poller_task = None
+
+
+async def drain_batch_jobs() -> None:
+    """Poll until no job with a continuation is pending (for one-shot scripts)."""
+
+    store = get_batch_job_store()
+    while (next_due := store.next_due_at()) is not None:
+        await asyncio.sleep(max(0.0, next_due - time.time()))
+        await poll_due_jobs()
+
+
+__all__ = [
+    "register_continuation",
+    "notify_new_job",
+    "poll_due_jobs",
+    "start_batch_poller",
+    "stop_batch_poller",
+    "drain_batch_jobs",
+]
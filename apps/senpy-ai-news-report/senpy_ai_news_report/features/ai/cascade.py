@@ -0,0 +1,162 @@
+"""Cheap relevance triage in front of the expensive writer model.
+
+Items are scored either locally from keyword hits or by a small model, and
+only items at or above the threshold are passed on. Pass rates and the
+writer tokens saved by dropping items, net of the tokens the scoring model
+itself used, are accumulated for reporting.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, List, Sequence, Tuple, TypeVar
+
+from senpy_ai_news_report.utils.env import env_float
+from senpy_ai_news_report.utils.tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CASCADE_OFF = "off"
+CASCADE_KEYWORDS = "keywords"
+CASCADE_MODEL = "model"
+
+DEFAULT_KEYWORDS = (
+    "ai",
+    "llm",
+    "gpt",
+    "model",
+    "open source",
+    "release",
+    "launch",
+    "api",
+    "framework",
+    "python",
+    "rust",
+    "javascript",
+    "typescript",
+    "security",
+    "vulnerability",
+    "database",
+    "cloud",
+    "kubernetes",
+    "developer",
+    "github",
+)
+
+relevance_system_prompt = """
+You triage tech news for a developer-focused Telegram channel. You rate how
+relevant and newsworthy each item is for software developers.
+"""
+
+relevance_user_prompt = """
+Rate every item with an integer from 0 (noise: marketing, off-topic, minor
+updates) to 10 (important news developers must know). The content for each
+item is only the number.
+"""
+
+
+@dataclass
+class CascadeStats:
+    evaluated: int = 0
+    passed: int = 0
+    # Writer tokens of dropped items minus the tokens spent on scoring; can be negative
+    saved_tokens: int = 0
+    scorer_tokens: int = 0
+
+    @property
+    def pass_rate(self) -> float:
+        return self.passed / self.evaluated if self.evaluated else 0.0
+
+    def snapshot(self) -> dict:
+        return {**asdict(self), "pass_rate": round(self.pass_rate, 3)}
+
+
+cascade_stats = CascadeStats()
+
+# Returns one score per text and the number of tokens the scoring itself used
+ModelScorer = Callable[[List[str]], Awaitable[Tuple[List[float], int]]]
+
+
+def _keywords() -> List[str]:
+    raw = os.getenv("CASCADE_KEYWORDS")
+    if raw and raw.strip():
+        return [keyword.strip().lower() for keyword in raw.split(",") if keyword.strip()]
+    return list(DEFAULT_KEYWORDS)
+
+
+def keyword_scores(texts: Sequence[str], keywords: Sequence[str]) -> List[float]:
+    """Score 0..1 from distinct keyword hits; two or more hits count as fully relevant."""
+
+    patterns = [re.compile(rf"\b{re.escape(keyword)}\b") for keyword in keywords]
+    scores = []
+    for text in texts:
+        lowered = text.lower()
+        hits = sum(1 for pattern in patterns if pattern.search(lowered))
+        scores.append(min(1.0, hits / 2))
+    return scores
+
+
+async def filter_relevant(
+    items: Sequence[T],
+    text_of: Callable[[T], str],
+    mode: str,
+    model_scorer: ModelScorer | None = None,
+    threshold: float | None = None,
+) -> List[T]:
+    """Keep the items whose relevance score reaches ``threshold`` (CASCADE_THRESHOLD)."""
+
+    if mode == CASCADE_OFF or not items:
+        return list(items)
+    if threshold is None:
+        threshold = env_float("CASCADE_THRESHOLD", 0.5)
+
+    texts = [text_of(item) for item in items]
+    scorer_tokens = 0
+    if mode == CASCADE_MODEL and model_scorer is not None:
+        scores, scorer_tokens = await model_scorer(texts)
+    else:
+        if mode != CASCADE_KEYWORDS:
+            logger.warning("Unknown cascade mode '%s', falling back to keywords", mode)
+        scores = keyword_scores(texts, _keywords())
+
+    kept = []
+    saved_tokens = -scorer_tokens
+    for item, text, score in zip(items, texts, scores):
+        if score >= threshold:
+            kept.append(item)
+        else:
+            saved_tokens += estimate_tokens(text)
+
+    cascade_stats.evaluated += len(items)
+    cascade_stats.passed += len(kept)
+    cascade_stats.saved_tokens += saved_tokens
+    cascade_stats.scorer_tokens += scorer_tokens
+    logger.info(
+        "Relevance cascade (%s) passed %s of %s items, ~%s tokens saved net of %s scorer tokens "
+        "(totals: %s)",
+        mode,
+        len(kept),
+        len(items),
+        saved_tokens,
+        scorer_tokens,
+        cascade_stats.snapshot(),
+    )
+    return kept
+
+
+__all__ = [
+    "CASCADE_OFF",
+    "CASCADE_KEYWORDS",
+    "CASCADE_MODEL",
+    "CascadeStats",
+    "cascade_stats",
+    "filter_relevant",
+    "keyword_scores",
+    "relevance_system_prompt",
+    "relevance_user_prompt",
+]
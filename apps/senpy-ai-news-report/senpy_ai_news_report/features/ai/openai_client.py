@@ -1,28 +1,139 @@
 import os
+import io
+import logging
+import itertools
 import json
-import tempfile
 import asyncio
-from typing import List, Dict, Any
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple, TypeVar
 from dotenv import load_dotenv
-from openai import AsyncOpenAI
+from openai import (
+    APIConnectionError,
+    APIStatusError,
+    APITimeoutError,
+    AsyncOpenAI,
+    InternalServerError,
+    RateLimitError,
+)
+from openai.types.chat import ChatCompletion
+
+from senpy_ai_news_report.features.ai.batch_jobs import (
+    JOB_COMPLETED,
+    JOB_DELIVERED,
+    JOB_FAILED,
+    JOB_SUBMITTED,
+    OPENAI_TERMINAL_STATUSES,
+    BatchJob,
+    BatchShard,
+    get_batch_job_store,
+    next_poll_interval,
+)
+from senpy_ai_news_report.features.ai.cascade import (
+    filter_relevant as cascade_filter,
+    relevance_system_prompt,
+    relevance_user_prompt,
+)
+from senpy_ai_news_report.features.ai.prompt_packing import (
+    PACKED_OUTPUT_INSTRUCTIONS,
+    PackedRequest,
+    pack_items,
+    unpack_results,
+)
+from senpy_ai_news_report.features.ai.rate_limiter import backoff_delay, get_rate_limiter
+from senpy_ai_news_report.features.ai.response_cache import get_response_cache, make_cache_key
+from senpy_ai_news_report.utils.env import env_int
+from senpy_ai_news_report.utils.tokens import estimate_tokens
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
 
-def test_debug():
-    print("Hellow world")
+
+def _retry_after_seconds(exc: APIStatusError) -> float | None:
+    headers = exc.response.headers if exc.response is not None else {}
+    for header, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(header)
+        if value:
+            try:
+                return float(value) * scale
+            except ValueError:
+                continue
+    return None
 
 
 class AiNewsClient:
     async_client = AsyncOpenAI(
         api_key=os.getenv("OPENAI_API_KEY"),  # This is the default and can be omitted
     )
+    # Used by the concurrent path, which owns retries so it can feed
+    # Retry-After back into the shared rate limiter.
+    realtime_client = async_client.with_options(max_retries=0)
+    temperature = 0.5
+
+    def _cache_key(self, system_prompt: str, user_prompt: str, data: Any, model: str) -> str:
+        return make_cache_key(
+            model=model,
+            temperature=self.temperature,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            data=data,
+        )
+
+    async def process_news(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        data: str,
+        model: str = "gpt-4o-mini",
+        use_cache: bool = True,
+    ):
+        cache = get_response_cache() if use_cache else None
+        cache_key = self._cache_key(system_prompt, user_prompt, data, model)
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.info("LLM cache hit (%s)", cache.snapshot())
+                return ChatCompletion.model_validate_json(cached)
+
+        completion = await self._create_completion(
+            self.async_client, system_prompt, user_prompt, data, model
+        )
+        if cache is not None:
+            cache.set(cache_key, completion.model_dump_json())
+        return completion
+
+    async def stream_news(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        data: Any,
+        model: str = "gpt-4o-mini",
+    ) -> AsyncIterator[str]:
+        """Yield the completion text as it is generated (not cached)."""
+        stream = await self.async_client.chat.completions.create(
+            model=model,
+            temperature=self.temperature,
+            stream=True,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {
+                    "role": "user",
+                    "content": f"{user_prompt}, data: {data}",
+                },
+            ],
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
 
-    async def process_news(self, system_prompt: str, user_prompt: str, data: str, model: str = "gpt-4o-mini"):
-        print("process news")
-        return await self.async_client.chat.completions.create(
+    async def _create_completion(
+        self, client: AsyncOpenAI, system_prompt: str, user_prompt: str, data: Any, model: str
+    ) -> ChatCompletion:
+        return await client.chat.completions.create(
             model=model,
-            temperature=0.5,
+            temperature=self.temperature,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {
@@ -31,101 +142,532 @@ class AiNewsClient:
                 },
             ],
         )
-    
 
+    async def _process_news_rate_limited(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        data: Any,
+        model: str,
+        use_cache: bool,
+        max_attempts: int,
+    ) -> ChatCompletion:
+        cache = get_response_cache() if use_cache else None
+        cache_key = self._cache_key(system_prompt, user_prompt, data, model)
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return ChatCompletion.model_validate_json(cached)
+
+        limiter = get_rate_limiter()
+        estimated_tokens = estimate_tokens(f"{system_prompt}{user_prompt}{data}") + env_int(
+            "OPENAI_EXPECTED_COMPLETION_TOKENS", 800
+        )
+        attempt = 0
+        while True:
+            await limiter.acquire(estimated_tokens)
+            try:
+                completion = await self._create_completion(
+                    self.realtime_client, system_prompt, user_prompt, data, model
+                )
+                break
+            except RateLimitError as exc:
+                attempt += 1
+                # An exhausted quota or budget is a billing problem, waiting does not fix it
+                if exc.code == "insufficient_quota" or attempt >= max_attempts:
+                    raise
+                delay = _retry_after_seconds(exc) or backoff_delay(attempt)
+                limiter.pause(delay)
+            except (APIConnectionError, APITimeoutError, InternalServerError):
+                attempt += 1
+                if attempt >= max_attempts:
+                    raise
+                await asyncio.sleep(backoff_delay(attempt))
 
+        if cache is not None:
+            cache.set(cache_key, completion.model_dump_json())
+        return completion
 
-    async def process_news_in_batch(self, system_prompt: str, user_prompt: str, data_list: List[Any], model: str = "gpt-4o-mini"):
+    async def process_news_concurrently(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        data_list: List[Any],
+        model: str = "gpt-4o-mini",
+        use_cache: bool = True,
+        max_concurrency: int | None = None,
+    ):
         """
-        Process multiple news items using OpenAI Batch API for cost efficiency.
-        
-        Args:
-            system_prompt: The system prompt for the AI
-            user_prompt: The user prompt template
-            data_list: List of data items to process
-            model: OpenAI model to use
-            
+        Process multiple news items with concurrent real-time completions.
+
+        Lower latency than the Batch API at full price. Requests are governed by
+        the shared RPM/TPM token-bucket limiter, honor Retry-After and retry with
+        jittered exponential backoff.
+
         Returns:
-            List of processed results
+            Results in the same shape as ``process_news_in_batch``, ordered by
+            ``custom_id``. Items that failed carry an ``error`` instead of a
+            ``response``.
         """
-        print(f"Processing {len(data_list)} items in batch")
-        
-        # Prepare batch requests
-        batch_requests = []
-        for i, data in enumerate(data_list):
+        if max_concurrency is None:
+            max_concurrency = env_int("OPENAI_MAX_CONCURRENCY", 8)
+        max_attempts = env_int("OPENAI_MAX_ATTEMPTS", 5)
+        logger.info("Processing %s items concurrently (concurrency=%s)", len(data_list), max_concurrency)
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def run(i: int, data: Any) -> Dict[str, Any]:
+            custom_id = f"request-{i}"
+            async with semaphore:
+                try:
+                    completion = await self._process_news_rate_limited(
+                        system_prompt, user_prompt, data, model, use_cache, max_attempts
+                    )
+                except Exception as exc:
+                    logger.error("Request %s failed: %s", custom_id, exc)
+                    return {"custom_id": custom_id, "response": None, "error": {"message": str(exc)}}
+            return {
+                "custom_id": custom_id,
+                "response": {"status_code": 200, "body": completion.model_dump()},
+            }
+
+        return await asyncio.gather(*(run(i, data) for i, data in enumerate(data_list)))
+
+    def _prepare_batch_requests(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        data_list: List[Any],
+        model: str,
+        use_cache: bool,
+    ):
+        """Split items into cache hits and the indices that still need the Batch API."""
+        cache = get_response_cache() if use_cache else None
+        cache_keys = [self._cache_key(system_prompt, user_prompt, data, model) for data in data_list]
+        cached_results = []
+        pending_indices = []
+
+        for i in range(len(data_list)):
+            cached = cache.get(cache_keys[i]) if cache is not None else None
+            if cached is not None:
+                cached_results.append(
+                    {
+                        "custom_id": f"request-{i}",
+                        "response": {"status_code": 200, "body": json.loads(cached)},
+                        "cached": True,
+                    }
+                )
+            else:
+                pending_indices.append(i)
+
+        if cached_results:
+            logger.info(
+                "%s of %s batch items served from LLM cache", len(cached_results), len(data_list)
+            )
+        return pending_indices, cached_results, cache_keys
+
+    def _iter_batch_request_lines(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        data_list: List[Any],
+        indices: Iterable[int],
+        model: str,
+    ) -> Iterator[bytes]:
+        """Lazily render Batch API input as JSONL, one encoded line per request."""
+        for i in indices:
             request = {
                 "custom_id": f"request-{i}",
                 "method": "POST",
                 "url": "/v1/chat/completions",
                 "body": {
                     "model": model,
-                    "temperature": 0.5,
+                    "temperature": self.temperature,
                     "messages": [
                         {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": f"{user_prompt}, data: {data}"}
+                        {"role": "user", "content": f"{user_prompt}, data: {data_list[i]}"}
                     ]
                 }
             }
-            batch_requests.append(request)
-        
-        # Create temporary file for batch input
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.jsonl', delete=False) as temp_file:
-            for request in batch_requests:
-                temp_file.write(json.dumps(request) + '\n')
-            temp_file_path = temp_file.name
-        
+            yield (json.dumps(request) + "\n").encode("utf-8")
+
+    async def _submit_shard(self, shard: BatchShard, buffer: io.BytesIO) -> BatchShard:
+        """Upload one shard's JSONL buffer and create its batch; failures stay on the shard."""
+        buffer.seek(0)
         try:
-            # Upload batch input file
-            with open(temp_file_path, 'rb') as file:
-                batch_input_file = await self.async_client.files.create(
-                    file=file,
-                    purpose="batch"
-                )
-            
+            batch_input_file = await self.async_client.files.create(
+                file=(f"batch_input_{shard.index}.jsonl", buffer, "application/jsonl"),
+                purpose="batch"
+            )
+            shard.input_file_id = batch_input_file.id
+
             # Create batch job
-            batch_job = await self.async_client.batches.create(
+            batch = await self.async_client.batches.create(
                 input_file_id=batch_input_file.id,
                 endpoint="/v1/chat/completions",
                 completion_window="24h"
             )
-            
-            print(f"Batch job created with ID: {batch_job.id}")
-            
-            # Poll for completion
-            while batch_job.status in ["validating", "in_progress", "finalizing"]:
-                await asyncio.sleep(2)  # Wait 5 seconds before checking again
-                batch_job = await self.async_client.batches.retrieve(batch_job.id)
-                print(f"Batch status: {batch_job.status}")
-            
-            if batch_job.status == "completed":
-                # Download results
-                result_file_id = batch_job.output_file_id
-                if result_file_id:
-                    result_content = await self.async_client.files.content(result_file_id)
-                    
-                    # Parse results
-                    results = []
-                    for line in result_content.text.strip().split('\n'):
-                        if line:
-                            result = json.loads(line)
-                            results.append(result)
-                    
-                    # Sort results by custom_id to maintain order
-                    results.sort(key=lambda x: int(x['custom_id'].split('-')[1]))
-                    
-                    # Clean up files
-                    await self.async_client.files.delete(batch_input_file.id)
-                    await self.async_client.files.delete(result_file_id)
-                    
-                    return results
-                else:
-                    print("No output file ID found")
-                    return []
-            else:
-                print(f"Batch job failed with status: {batch_job.status}")
-                return []
-                
+        except Exception as exc:
+            logger.error("Batch shard %s could not be submitted: %s", shard.index, exc)
+            shard.openai_status = "failed"
+            shard.failed_requests = shard.request_count
+            shard.error = str(exc)
+            return shard
         finally:
-            # Clean up temporary file
-            os.unlink(temp_file_path)
-    
\ No newline at end of file
+            buffer.close()
+
+        shard.batch_id = batch.id
+        shard.openai_status = batch.status
+        logger.info(
+            "Batch shard %s created with ID: %s (%s requests)", shard.index, batch.id, shard.request_count
+        )
+        return shard
+
+    async def _submit_shards(self, request_lines: Iterable[bytes]) -> List[BatchShard]:
+        """
+        Split streamed JSONL into shards under the per-file request and size
+        limits, submitting each shard as soon as it is full.
+
+        A shard is only built once an upload slot (BATCH_SUBMIT_CONCURRENCY)
+        is free, so at most that many shard buffers are in memory at once.
+        The request lines are serialized in a worker thread.
+        """
+        max_requests = env_int("BATCH_MAX_REQUESTS_PER_SHARD", 50_000)
+        max_bytes = env_int("BATCH_MAX_BYTES_PER_SHARD", 190 * 1024 * 1024)
+        semaphore = asyncio.Semaphore(max(1, env_int("BATCH_SUBMIT_CONCURRENCY", 4)))
+        lines = iter(request_lines)
+        # The line that did not fit into the previous shard.
+        carry: List[bytes] = []
+
+        def build_shard(index: int) -> tuple[BatchShard, io.BytesIO] | None:
+            buffer = io.BytesIO()
+            shard = BatchShard(index=index, request_count=0, byte_size=0)
+            for line in itertools.chain([carry.pop()] if carry else [], lines):
+                if shard.request_count and (
+                    shard.request_count >= max_requests or shard.byte_size + len(line) > max_bytes
+                ):
+                    carry.append(line)
+                    break
+                buffer.write(line)
+                shard.request_count += 1
+                shard.byte_size += len(line)
+            return (shard, buffer) if shard.request_count else None
+
+        async def submit(shard: BatchShard, buffer: io.BytesIO) -> BatchShard:
+            try:
+                return await self._submit_shard(shard, buffer)
+            finally:
+                semaphore.release()
+
+        tasks = []
+        while True:
+            await semaphore.acquire()
+            try:
+                built = await asyncio.to_thread(build_shard, len(tasks))
+            except BaseException:
+                semaphore.release()
+                raise
+            if built is None:
+                semaphore.release()
+                break
+            tasks.append(asyncio.create_task(submit(*built)))
+
+        return list(await asyncio.gather(*tasks))
+
+    async def submit_batch(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        data_list: List[Any],
+        model: str = "gpt-4o-mini",
+        use_cache: bool = True,
+        continuation: str | None = None,
+        continuation_context: Dict[str, Any] | None = None,
+    ) -> BatchJob:
+        """
+        Submit news items to the Batch API and record the job without waiting.
+
+        Large ``data_list``s are sharded into several batches by request count
+        (BATCH_MAX_REQUESTS_PER_SHARD) and input size
+        (BATCH_MAX_BYTES_PER_SHARD), submitted in parallel and tracked as one job.
+
+        Args:
+            continuation: Name of a handler registered with
+                ``batch_poller.register_continuation``. The background poller
+                calls it with the results once every shard finishes, also after
+                a restart.
+            continuation_context: JSON-serializable data passed to the continuation.
+
+        Returns:
+            The persisted job record.
+        """
+        logger.info("Submitting %s items in batch", len(data_list))
+        pending_indices, cached_results, cache_keys = self._prepare_batch_requests(
+            system_prompt, user_prompt, data_list, model, use_cache
+        )
+        context = {
+            "cache_keys": cache_keys if use_cache else [],
+            "cached_results": cached_results,
+            "continuation_context": continuation_context or {},
+        }
+
+        store = get_batch_job_store()
+        if not pending_indices:
+            # Everything came from the cache, the job is complete right away.
+            return store.create([], continuation, context, status=JOB_COMPLETED)
+
+        shards = await self._submit_shards(
+            self._iter_batch_request_lines(
+                system_prompt, user_prompt, data_list, pending_indices, model
+            )
+        )
+        job = store.create(shards, continuation, context)
+        if all(shard.finished for shard in shards):
+            # Every shard failed to submit, nothing left to poll.
+            job.status = JOB_COMPLETED
+            job.error = "No batch shard could be submitted"
+            job.next_poll_at = time.time()
+            store.save(job)
+        return job
+
+    async def _refresh_shard(self, shard: BatchShard) -> None:
+        batch = await self.async_client.batches.retrieve(shard.batch_id)
+        shard.openai_status = batch.status
+        if batch.request_counts is not None:
+            shard.completed_requests = batch.request_counts.completed
+            shard.failed_requests = batch.request_counts.failed
+        if batch.status in OPENAI_TERMINAL_STATUSES:
+            shard.output_file_id = batch.output_file_id
+            shard.error_file_id = batch.error_file_id
+            if batch.status != "completed":
+                shard.error = f"Batch finished with status {batch.status}"
+
+    async def refresh_batch_job(self, job: BatchJob) -> BatchJob:
+        """Poll OpenAI once for every unfinished shard and schedule the next poll."""
+
+        if job.status != JOB_SUBMITTED:
+            return job
+
+        pending = [shard for shard in job.shards if not shard.finished]
+        await asyncio.gather(*(self._refresh_shard(shard) for shard in pending))
+        statuses = ", ".join(f"{shard.index}:{shard.openai_status}" for shard in job.shards)
+        logger.info("Batch job %s shard statuses: %s", job.id, statuses)
+
+        if all(shard.finished for shard in job.shards):
+            job.status = JOB_COMPLETED
+            job.next_poll_at = time.time()
+            failed = job.failed_shards()
+            if failed:
+                job.error = "; ".join(
+                    f"shard {shard.index}: {shard.error or f'{shard.failed_requests} failed requests'}"
+                    for shard in failed
+                )
+        else:
+            job.poll_interval = next_poll_interval(job.poll_interval)
+            job.next_poll_at = time.time() + job.poll_interval
+        get_batch_job_store().save(job)
+        return job
+
+    async def iter_batch_results(self, job: BatchJob) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield a finished job's results one by one as the shard output files stream in.
+
+        Results arrive in completion order, not ``custom_id`` order; cached
+        results are yielded last. Successful responses are written to the
+        response cache along the way.
+        """
+        cache = get_response_cache()
+        cache_keys = job.context.get("cache_keys") or []
+
+        for shard in job.shards:
+            if not shard.output_file_id:
+                if shard.batch_id:
+                    logger.warning(
+                        "No output file for batch shard %s (%s)", shard.index, shard.batch_id
+                    )
+                continue
+            async with self.async_client.files.with_streaming_response.content(
+                shard.output_file_id
+            ) as response:
+                async for line in response.iter_lines():
+                    if not line.strip():
+                        continue
+                    result = json.loads(line)
+                    result_response = result.get("response") or {}
+                    if cache is not None and cache_keys and result_response.get("status_code") == 200:
+                        index = int(result["custom_id"].split("-")[1])
+                        cache.set(cache_keys[index], json.dumps(result_response["body"]))
+                    yield result
+
+        for result in job.context.get("cached_results") or []:
+            yield result
+
+    async def collect_batch_results(self, job: BatchJob) -> List[Dict[str, Any]]:
+        """Gather a finished job's results from all shards, sorted by ``custom_id``."""
+
+        results = [result async for result in self.iter_batch_results(job)]
+        # Sort results by custom_id to maintain order
+        results.sort(key=lambda x: int(x['custom_id'].split('-')[1]))
+        for shard in job.failed_shards():
+            logger.warning(
+                "Batch job %s shard %s: %s of %s requests failed (%s)",
+                job.id,
+                shard.index,
+                shard.failed_requests,
+                shard.request_count,
+                shard.error or shard.openai_status,
+            )
+        return results
+
+    async def delete_batch_files(self, job: BatchJob) -> None:
+        for shard in job.shards:
+            for file_id in (shard.input_file_id, shard.output_file_id, shard.error_file_id):
+                if file_id:
+                    try:
+                        await self.async_client.files.delete(file_id)
+                    except Exception as exc:
+                        logger.warning("Could not delete batch file %s: %s", file_id, exc)
+
+    async def wait_for_batch(self, job: BatchJob) -> List[Dict[str, Any]]:
+        """Poll a job with exponentially growing intervals and return its results."""
+
+        while job.status == JOB_SUBMITTED:
+            await asyncio.sleep(max(0.0, job.next_poll_at - time.time()))
+            job = await self.refresh_batch_job(job)
+
+        results = await self.collect_batch_results(job)
+        job.status = JOB_FAILED if job.failed_shards() else JOB_DELIVERED
+        get_batch_job_store().save(job)
+        await self.delete_batch_files(job)
+        return results
+
+    async def process_news_in_batch(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        data_list: List[Any],
+        model: str = "gpt-4o-mini",
+        use_cache: bool = True,
+    ):
+        """
+        Process multiple news items using OpenAI Batch API for cost efficiency.
+
+        Waits for the batch to finish. Use ``submit_batch`` with a continuation
+        to hand the results off without holding the caller.
+
+        Args:
+            system_prompt: The system prompt for the AI
+            user_prompt: The user prompt template
+            data_list: List of data items to process
+            model: OpenAI model to use
+            use_cache: Serve identical requests from the response cache and
+                only send the misses to the Batch API
+
+        Returns:
+            List of processed results
+        """
+        job = await self.submit_batch(system_prompt, user_prompt, data_list, model, use_cache)
+        return await self.wait_for_batch(job)
+
+    async def process_news_packed(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        items: List[str],
+        model: str = "gpt-4o-mini",
+        token_budget: int | None = None,
+        use_openai_batch_api: bool = True,
+        use_cache: bool = True,
+    ):
+        """
+        Process many small items with as few requests as the token budget allows.
+
+        Items are bin-packed into requests of at most ``token_budget`` estimated
+        tokens (PACKED_REQUEST_TOKEN_BUDGET), the model answers with one JSON
+        entry per item and the answers are unpacked again.
+
+        Returns:
+            One result per item in the ``process_news_in_batch`` shape, with
+            ``custom_id`` ``request-<item index>``.
+        """
+        return unpack_results(
+            *await self._process_packed(
+                system_prompt, user_prompt, items, model, token_budget, use_openai_batch_api, use_cache
+            )
+        )
+
+    async def _process_packed(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        items: List[str],
+        model: str,
+        token_budget: int | None,
+        use_openai_batch_api: bool,
+        use_cache: bool,
+    ) -> Tuple[List[PackedRequest], List[Dict[str, Any]]]:
+        """Pack and send the items; returns the packed requests and their raw results."""
+        if token_budget is None:
+            token_budget = env_int("PACKED_REQUEST_TOKEN_BUDGET", 6000)
+        packed_requests = pack_items(items, token_budget)
+        payloads = [packed.payload for packed in packed_requests]
+        packed_user_prompt = user_prompt + PACKED_OUTPUT_INSTRUCTIONS
+
+        if use_openai_batch_api:
+            results = await self.process_news_in_batch(
+                system_prompt, packed_user_prompt, payloads, model, use_cache
+            )
+        else:
+            results = await self.process_news_concurrently(
+                system_prompt, packed_user_prompt, payloads, model, use_cache
+            )
+        return packed_requests, results
+
+    async def score_relevance(
+        self, texts: List[str], model: str | None = None
+    ) -> Tuple[List[float], int]:
+        """
+        Score items 0..1 with a cheap model; items it fails to rate pass through.
+
+        Returns the scores and the total tokens the scoring requests used.
+        """
+        if model is None:
+            model = os.getenv("CASCADE_MODEL") or "gpt-4.1-nano"
+        packed_requests, raw_results = await self._process_packed(
+            relevance_system_prompt,
+            relevance_user_prompt,
+            texts,
+            model,
+            token_budget=None,
+            use_openai_batch_api=False,
+            use_cache=True,
+        )
+        used_tokens = 0
+        for result in raw_results:
+            usage = ((result.get("response") or {}).get("body") or {}).get("usage") or {}
+            used_tokens += usage.get("total_tokens") or 0
+
+        scores = []
+        for result in unpack_results(packed_requests, raw_results):
+            try:
+                content = result["response"]["body"]["choices"][0]["message"]["content"]
+                scores.append(min(1.0, max(0.0, float(content) / 10)))
+            except (KeyError, TypeError, ValueError):
+                scores.append(1.0)
+        return scores, used_tokens
+
+    async def filter_relevant(
+        self,
+        items: Sequence[T],
+        text_of: Callable[[T], str],
+        mode: str | None = None,
+    ) -> List[T]:
+        """
+        First stage of the model cascade: drop irrelevant items before the writer model.
+
+        ``mode`` (CASCADE_MODE) is ``off``, ``keywords`` for a local keyword
+        scorer or ``model`` for a cheap model (CASCADE_MODEL).
+        """
+        if mode is None:
+            mode = (os.getenv("CASCADE_MODE") or "off").strip().lower()
+        return await cascade_filter(items, text_of, mode, model_scorer=self.score_relevance)
@@ -0,0 +1,140 @@
+"""Pack many small items into few chat requests and unpack the structured replies.
+
+Every request repeats the system and user prompts, so sending one item per
+request wastes most of its tokens on overhead. Items are bin-packed into
+requests up to a token budget, the model is asked to answer with one JSON
+object per item, and the answers are split back into per-item results that
+look like ordinary batch results.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Sequence
+
+from senpy_ai_news_report.utils.tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+PACKED_OUTPUT_INSTRUCTIONS = """
+The data contains several independent items, each introduced by a line "### item <id>".
+Handle every item on its own, following the instructions above.
+Answer with a single JSON object and nothing else, in the form:
+{"items": [{"id": <item id>, "content": "<result for that item>"}]}
+Include exactly one entry for every item id.
+"""
+
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+@dataclass
+class PackedRequest:
+    item_ids: List[int]
+    payload: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _item_block(item_id: int, text: str) -> str:
+    return f"### item {item_id}\n{text}"
+
+
+def pack_items(items: Sequence[str], token_budget: int) -> List[PackedRequest]:
+    """First-fit-decreasing bin packing of items into requests under ``token_budget``.
+
+    An item larger than the budget gets a request of its own.
+    """
+
+    sizes = [estimate_tokens(_item_block(i, text)) + 1 for i, text in enumerate(items)]
+    bins: List[List[int]] = []
+    loads: List[int] = []
+    for i in sorted(range(len(items)), key=lambda i: sizes[i], reverse=True):
+        for b, load in enumerate(loads):
+            if load + sizes[i] <= token_budget:
+                bins[b].append(i)
+                loads[b] += sizes[i]
+                break
+        else:
+            bins.append([i])
+            loads.append(sizes[i])
+
+    requests = []
+    for item_ids in bins:
+        item_ids.sort()
+        payload = "\n\n".join(_item_block(i, items[i]) for i in item_ids)
+        requests.append(PackedRequest(item_ids, payload))
+    logger.info("Packed %s items into %s requests", len(items), len(requests))
+    return requests
+
+
+def _parse_items(content: str) -> Dict[int, str]:
+    """Map item id to content; raises ValueError unless the reply holds a list of items."""
+
+    data = json.loads(_FENCE_RE.sub("", content.strip()))
+    items = data.get("items") if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        raise ValueError(f"expected a list of items, got {type(items).__name__}")
+    parsed = {}
+    for item in items:
+        try:
+            if item["content"] is not None:
+                parsed[int(item["id"])] = str(item["content"])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return parsed
+
+
+def _item_result(item_id: int, content: str | None, error: str | None = None) -> Dict[str, Any]:
+    custom_id = f"request-{item_id}"
+    if content is None:
+        return {"custom_id": custom_id, "response": None, "error": {"message": error}}
+    return {
+        "custom_id": custom_id,
+        "response": {
+            "status_code": 200,
+            "body": {"choices": [{"index": 0, "message": {"role": "assistant", "content": content}}]},
+        },
+    }
+
+
+def unpack_results(
+    packed_requests: Sequence[PackedRequest], results: Sequence[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Turn packed batch results back into one result per original item, in item order."""
+
+    by_custom_id = {result["custom_id"]: result for result in results}
+    unpacked = []
+    for index, packed in enumerate(packed_requests):
+        result = by_custom_id.get(f"request-{index}") or {}
+        response = result.get("response") or {}
+        if response.get("status_code") != 200:
+            error = str(result.get("error") or "packed request failed")
+            unpacked.extend(_item_result(item_id, None, error) for item_id in packed.item_ids)
+            continue
+
+        content = response["body"]["choices"][0]["message"]["content"] or ""
+        try:
+            parsed = _parse_items(content)
+        except ValueError as exc:
+            logger.warning("Packed request %s returned unparseable output: %s", index, exc)
+            parsed = {}
+        for item_id in packed.item_ids:
+            if item_id in parsed:
+                unpacked.append(_item_result(item_id, parsed[item_id]))
+            else:
+                unpacked.append(_item_result(item_id, None, "missing from packed response"))
+
+    unpacked.sort(key=lambda result: int(result["custom_id"].split("-")[1]))
+    return unpacked
+
+
+__all__ = [
+    "PACKED_OUTPUT_INSTRUCTIONS",
+    "PackedRequest",
+    "pack_items",
+    "unpack_results",
+]
@@ -0,0 +1,90 @@
+"""Token-bucket limiter for OpenAI requests-per-minute and tokens-per-minute quotas."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+
+from senpy_ai_news_report.utils.env import env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at ``rate_per_minute``."""
+
+    def __init__(self, rate_per_minute: float):
+        self.capacity = max(1.0, rate_per_minute)
+        self.refill_per_second = self.capacity / 60.0
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.refill_per_second)
+        self._updated_at = now
+
+    def delay_for(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens are available (0 when they already are)."""
+
+        self._refill()
+        # Requests larger than the whole bucket are let through once it is full.
+        amount = min(amount, self.capacity)
+        if self._tokens >= amount:
+            return 0.0
+        return (amount - self._tokens) / self.refill_per_second
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self._tokens -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """Combined RPM/TPM limiter shared by all concurrent completion calls."""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._lock = asyncio.Lock()
+        self._paused_until = 0.0
+
+    async def acquire(self, estimated_tokens: int) -> None:
+        async with self._lock:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                delay = max(pause, self.requests.delay_for(1), self.tokens.delay_for(estimated_tokens))
+                if delay <= 0:
+                    self.requests.consume(1)
+                    self.tokens.consume(estimated_tokens)
+                    return
+                await asyncio.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller back, e.g. after the API answered with Retry-After."""
+
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        logger.warning("OpenAI rate limit hit, pausing new requests for %.1fs", seconds)
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """Full-jitter exponential backoff."""
+
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+_rate_limiter: RateLimiter | None = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter(
+            requests_per_minute=env_float("OPENAI_RPM_LIMIT", 500),
+            tokens_per_minute=env_int("OPENAI_TPM_LIMIT", 200_000),
+        )
+    return _rate_limiter
+
+
+__all__ = ["TokenBucket", "RateLimiter", "backoff_delay", "get_rate_limiter"]
@@ -0,0 +1,163 @@
+"""Content-addressed cache for LLM responses.
+
+A small in-memory LRU tier sits in front of a SQLite tier on disk. Entries
+expire after a TTL and the disk tier is trimmed by entry count and total
+size, least recently used first.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Tuple
+
+from senpy_ai_news_report.utils.env import env_bool, env_int
+from senpy_ai_news_report.utils.storage import connect_sqlite
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+
+def make_cache_key(**parts: Any) -> str:
+    """Stable key over every input that influences the completion."""
+
+    encoded = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        filename: str = "llm_cache.sqlite3",
+        memory_entries: int = 256,
+        ttl_seconds: int = 7 * 24 * 3600,
+        max_disk_entries: int = 10_000,
+        max_disk_bytes: int = 100 * 1024 * 1024,
+    ):
+        self.memory_entries = memory_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_entries = max_disk_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.stats = CacheStats()
+        self._memory: OrderedDict[str, Tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(filename)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_last_access ON llm_cache (last_access)")
+        self._conn.commit()
+
+    def _remember(self, key: str, value: str, expires_at: float) -> None:
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                value, expires_at = cached
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.stats.memory_hits += 1
+                    return value
+                del self._memory[key]
+
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row["expires_at"] <= now:
+                self.stats.misses += 1
+                return None
+
+            self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self._remember(key, row["value"], row["expires_at"])
+            self.stats.disk_hits += 1
+            return row["value"]
+
+    def set(self, key: str, value: str, ttl_seconds: int | None = None) -> None:
+        now = time.time()
+        expires_at = now + (ttl_seconds if ttl_seconds is not None else self.ttl_seconds)
+        with self._lock:
+            self._remember(key, value, expires_at)
+            self._conn.execute(
+                """
+                INSERT INTO llm_cache (key, value, size, expires_at, last_access)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    value = excluded.value,
+                    size = excluded.size,
+                    expires_at = excluded.expires_at,
+                    last_access = excluded.last_access
+                """,
+                (key, value, len(value.encode("utf-8")), expires_at, now),
+            )
+            self.stats.writes += 1
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        evicted = self._conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,)).rowcount
+        count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+        if count > self.max_disk_entries or total > self.max_disk_bytes:
+            for row in self._conn.execute(
+                "SELECT key, size FROM llm_cache ORDER BY last_access ASC"
+            ).fetchall():
+                if count <= self.max_disk_entries and total <= self.max_disk_bytes:
+                    break
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (row["key"],))
+                self._memory.pop(row["key"], None)
+                count -= 1
+                total -= row["size"]
+                evicted += 1
+        self.stats.evictions += evicted
+
+    def snapshot(self) -> dict:
+        return asdict(self.stats)
+
+
+_response_cache: ResponseCache | None = None
+
+
+def get_response_cache() -> ResponseCache | None:
+    """Return the process-wide cache, or None when LLM_CACHE_ENABLED is off."""
+
+    global _response_cache
+    if not env_bool("LLM_CACHE_ENABLED", True):
+        return None
+    if _response_cache is None:
+        _response_cache = ResponseCache(
+            memory_entries=env_int("LLM_CACHE_MEMORY_ENTRIES", 256),
+            ttl_seconds=env_int("LLM_CACHE_TTL_SECONDS", 7 * 24 * 3600),
+            max_disk_entries=env_int("LLM_CACHE_MAX_ENTRIES", 10_000),
+            max_disk_bytes=env_int("LLM_CACHE_MAX_BYTES", 100 * 1024 * 1024),
+        )
+    return _response_cache
+
+
+__all__ = ["CacheStats", "ResponseCache", "get_response_cache", "make_cache_key"]
@@ -1,4 +1,7 @@
+from typing import AsyncIterator
+
 from senpy_ai_news_report.features.ai.openai_client import AiNewsClient
+from .article_content import article_prompt_data
 from .article_prompts import (
     article_system_promt,
     article_user_promt,
@@ -13,20 +16,31 @@ async def process_article_with_ai(link: str):
     return await AiNewsClient().process_news(
         system_prompt=article_system_promt,
         user_prompt=article_user_promt,
-        data=f"here is the article link: {link}",
+        data=await article_prompt_data(link),
         model="gpt-4o-mini",
     )
 
 
 async def process_article(link: str):
     """
-    Fetch GitHub trending repositories and process them with AI.
+    Fetch an article and write a blogpost about it with AI.
     """
-    # Fetch the trending repositories
-
-    # Process the trends with AI
+    # Process the article with AI
     processed_trends = await process_article_with_ai(link)
 
     processed_article_blogpost = processed_trends.choices[0].message.content or ""
 
     return processed_article_blogpost
+
+
+async def stream_article(link: str) -> AsyncIterator[str]:
+    """
+    Stream the AI blogpost for an article as it is written.
+    """
+    async for delta in AiNewsClient().stream_news(
+        system_prompt=article_system_promt,
+        user_prompt=article_user_promt,
+        data=await article_prompt_data(link),
+        model="gpt-4o-mini",
+    ):
+        yield delta
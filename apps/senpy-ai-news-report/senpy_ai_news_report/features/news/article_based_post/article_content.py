@@ -0,0 +1,255 @@
+"""Download an article and extract its readable text for the prompt.
+
+The page is streamed through a size cap (ARTICLE_MAX_BYTES) and a timeout
+(ARTICLE_FETCH_TIMEOUT_SECONDS). Boilerplate such as navigation, footers
+and sidebars is removed, and the main text block is picked in a worker
+thread. The result is cut to ARTICLE_TOKEN_BUDGET tokens.
+
+Extracted text is cached twice over. A URL seen within
+ARTICLE_CACHE_TTL_SECONDS is not downloaded again. A page whose body hash
+is already known, under another URL or after a re-download, is not
+extracted again. The same text also hits the LLM response cache, so
+re-posting a popular link costs neither a download nor a completion.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import aiohttp
+from bs4 import BeautifulSoup
+
+from senpy_ai_news_report.utils.env import env_float, env_int
+from senpy_ai_news_report.utils.http_client import get_http_session, read_text_limited
+from senpy_ai_news_report.utils.storage import connect_sqlite
+from senpy_ai_news_report.utils.tokens import trim_to_tokens
+
+logger = logging.getLogger(__name__)
+
+_BOILERPLATE_TAGS = [
+    "script",
+    "style",
+    "noscript",
+    "template",
+    "svg",
+    "iframe",
+    "form",
+    "nav",
+    "header",
+    "footer",
+    "aside",
+    "button",
+]
+_BOILERPLATE_RE = re.compile(
+    r"comment|footer|sidebar|\bnav|menu|share|social|promo|related|advert|\bads?\b|cookie|"
+    r"subscribe|newsletter|banner|popup|breadcrumb",
+    re.IGNORECASE,
+)
+_TEXT_TAGS = ["h1", "h2", "h3", "h4", "p", "li", "pre", "blockquote"]
+_WHITESPACE_RE = re.compile(r"[ \t\r\f\v]+")
+_TRACKING_PARAMS = re.compile(r"^(utm_\w+|fbclid|gclid|mc_cid|mc_eid|ref)$")
+
+
+@dataclass
+class ArticleContent:
+    url: str
+    title: str
+    text: str
+    content_hash: str
+
+    def prompt_data(self) -> str:
+        return f"here is the article link: {self.url}\n\nTitle: {self.title}\n\n{self.text}"
+
+
+def normalize_url(url: str) -> str:
+    """Cache key for a link: no fragment and no tracking parameters."""
+
+    parts = urlsplit(url.strip())
+    query = [(key, value) for key, value in parse_qsl(parts.query) if not _TRACKING_PARAMS.match(key)]
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, urlencode(query), ""))
+
+
+def _link_density(node) -> float:
+    text_length = len(node.get_text(" ", strip=True)) or 1
+    link_length = sum(len(link.get_text(" ", strip=True)) for link in node.find_all("a"))
+    return link_length / text_length
+
+
+def _main_container(soup: BeautifulSoup):
+    """The article element if there is one, else the block with the most paragraph text."""
+
+    for candidate in (soup.find("article"), soup.find("main"), soup.find(attrs={"role": "main"})):
+        if candidate is not None and len(candidate.get_text(" ", strip=True)) > 200:
+            return candidate
+
+    best, best_score = soup.body or soup, 0.0
+    scored = set()
+    for paragraph in soup.find_all("p"):
+        parent = paragraph.parent
+        if parent is None or id(parent) in scored:
+            continue
+        scored.add(id(parent))
+        text_length = sum(len(p.get_text(" ", strip=True)) for p in parent.find_all("p", recursive=False))
+        score = text_length * (1 - _link_density(parent))
+        if score > best_score:
+            best, best_score = parent, score
+    return best
+
+
+def extract_readable_text(html: str) -> tuple[str, str]:
+    """Return ``(title, text)`` of a page with the boilerplate removed. CPU-bound."""
+
+    soup = BeautifulSoup(html, "html.parser")
+    og_title = soup.find("meta", attrs={"property": "og:title"})
+    if og_title and og_title.get("content"):
+        title = og_title["content"].strip()
+    else:
+        title = soup.title.get_text(strip=True) if soup.title else ""
+
+    for tag in soup.find_all(_BOILERPLATE_TAGS):
+        tag.decompose()
+    for tag in soup.find_all(True):
+        if tag.decomposed or tag.name in ("html", "body", "article", "main"):
+            continue
+        marker = " ".join(tag.get("class") or []) + " " + (tag.get("id") or "")
+        if marker.strip() and _BOILERPLATE_RE.search(marker):
+            tag.decompose()
+
+    container = _main_container(soup)
+    blocks = []
+    for node in container.find_all(_TEXT_TAGS):
+        # Nested text tags (e.g. p inside li) are covered by their parent.
+        if node.find_parent(_TEXT_TAGS) is not None:
+            continue
+        text = _WHITESPACE_RE.sub(" ", node.get_text(" ", strip=True))
+        if len(text) >= 20 or node.name.startswith("h"):
+            blocks.append(text)
+    if not blocks:
+        blocks = [_WHITESPACE_RE.sub(" ", container.get_text("\n", strip=True))]
+    return title, "\n\n".join(blocks)
+
+
+class ArticleCache:
+    def __init__(self, filename: str = "articles.sqlite3"):
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(filename)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS article_texts (
+                content_hash TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                text TEXT NOT NULL,
+                extracted_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS article_urls (
+                url TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    def by_url(self, url: str, max_age: float) -> tuple[str, str, str] | None:
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT t.content_hash, t.title, t.text FROM article_urls u
+                JOIN article_texts t ON t.content_hash = u.content_hash
+                WHERE u.url = ? AND u.fetched_at >= ?
+                """,
+                (url, time.time() - max_age),
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def by_hash(self, content_hash: str) -> tuple[str, str] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT title, text FROM article_texts WHERE content_hash = ?", (content_hash,)
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def save(self, url: str, content_hash: str, title: str, text: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO article_texts VALUES (?, ?, ?, ?)", (content_hash, title, text, now)
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO article_urls VALUES (?, ?, ?)", (url, content_hash, now)
+            )
+            self._conn.commit()
+
+
+_article_cache: ArticleCache | None = None
+
+
+def get_article_cache() -> ArticleCache:
+    global _article_cache
+    if _article_cache is None:
+        _article_cache = ArticleCache()
+    return _article_cache
+
+
+async def _download(url: str) -> str:
+    session = await get_http_session()
+    timeout = aiohttp.ClientTimeout(total=env_float("ARTICLE_FETCH_TIMEOUT_SECONDS", 20.0))
+    async with session.get(url, timeout=timeout) as response:
+        response.raise_for_status()
+        content_type = response.headers.get("Content-Type", "")
+        if content_type and "html" not in content_type and not content_type.startswith("text/"):
+            raise ValueError(f"{url} is not an HTML page ({content_type})")
+        return await read_text_limited(response, env_int("ARTICLE_MAX_BYTES", 3 * 1024 * 1024))
+
+
+async def fetch_article(link: str) -> ArticleContent:
+    """Readable text of an article, from the cache when possible."""
+
+    url = normalize_url(link)
+    cache = get_article_cache()
+    budget = env_int("ARTICLE_TOKEN_BUDGET", 3000)
+
+    cached = cache.by_url(url, env_float("ARTICLE_CACHE_TTL_SECONDS", 24 * 3600))
+    if cached is not None:
+        content_hash, title, text = cached
+        logger.info("Article %s served from cache", url)
+        return ArticleContent(link, title, trim_to_tokens(text, budget), content_hash)
+
+    html = await _download(link)
+    content_hash = hashlib.sha256(html.encode("utf-8")).hexdigest()
+    known = cache.by_hash(content_hash)
+    if known is not None:
+        title, text = known
+    else:
+        title, text = await asyncio.to_thread(extract_readable_text, html)
+        logger.info("Extracted %s characters of article text from %s", len(text), url)
+    cache.save(url, content_hash, title, text)
+    return ArticleContent(link, title, trim_to_tokens(text, budget), content_hash)
+
+
+async def article_prompt_data(link: str) -> str:
+    """Prompt data for an article: its readable text, or just the link if it cannot be fetched."""
+
+    try:
+        return (await fetch_article(link)).prompt_data()
+    except Exception as exc:
+        logger.warning("Could not fetch article %s, sending only the link: %s", link, exc)
+        return f"here is the article link: {link}"
+
+
+__all__ = [
+    "ArticleCache",
+    "ArticleContent",
+    "article_prompt_data",
+    "extract_readable_text",
+    "fetch_article",
+    "get_article_cache",
+    "normalize_url",
+]
@@ -1,13 +1,22 @@
 from senpy_ai_news_report.features.news.article_based_post.article_based_post import (
     process_article,
+    stream_article,
 )
-from senpy_ai_news_report.features.telegram_integration_features.send_channel_message import (
-    send_message_to_channel,
+from senpy_ai_news_report.features.telegram_integration_features.message_outbox import (
+    fan_out_message,
+)
+from senpy_ai_news_report.features.telegram_integration_features.stream_channel_message import (
+    stream_message_to_channel,
 )
 
 
 async def create_and_post_blogpost(
     link: str,
+    stream: bool = False,
 ):
+    if stream:
+        return await stream_message_to_channel(stream_article(link), None)
+
     processed_article = await process_article(link)
-    return await send_message_to_channel(processed_article, None)
+    fan_out_message(processed_article)
+    return processed_article
@@ -1,4 +1,9 @@
-from bs4 import BeautifulSoup
+import asyncio
+import importlib.util
+import re
+from dataclasses import asdict, dataclass
+
+from bs4 import BeautifulSoup, SoupStrainer
 from senpy_ai_news_report.utils import fetch_text
 from senpy_ai_news_report.utils.serializable_dataclass import SerilizableDataclass
 
@@ -10,52 +15,95 @@ class GithubTrending(SerilizableDataclass):
         self.full_repo_url = full_repo_url
 
 
-async def fetch_github_trending(language=None, limit=5) -> list[GithubTrending]:
+_COUNT_RE = re.compile(r"\d[\d,]*")
+_STARS_HREF_RE = re.compile(r"/stargazers$")
+_FORKS_HREF_RE = re.compile(r"/(forks|network/members)$")
+_STARS_IN_WINDOW_RE = re.compile(r"stars? (today|this week|this month)")
+
+# Only the repository rows are built into a tree; the rest of the page is skipped.
+_REPO_ROWS = SoupStrainer("article", class_="Box-row")
+
+# lxml is optional; it is several times faster than the pure-Python parser.
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") is not None else "html.parser"
+
+
+@dataclass(slots=True)
+class TrendingRepo:
+    repo_name: str
+    repo_desc: str
+    full_repo_url: str
+    language: str | None = None
+    stars: int = 0
+    forks: int = 0
+    # Stars gained in the page's since window
+    stars_today: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def trending_url(language: str | None = None, since: str = "daily") -> str:
+    if language:
+        return f"https://github.com/trending/{language}?since={since}"
+    return f"https://github.com/trending?since={since}"
+
+
+def _parse_count(text: str | None) -> int:
+    match = _COUNT_RE.search(text or "")
+    return int(match.group().replace(",", "")) if match else 0
+
+
+def _repo_from_row(row) -> TrendingRepo | None:
+    h2 = row.find("h2")
+    if not h2:
+        return None
+    link_tag = h2.find("a")
+    if not link_tag:
+        return None
+
+    # e.g. "/owner/repo"
+    repo_link = link_tag.get("href", "").strip()
+    repo_name = repo_link.strip("/")
+
+    desc_tag = row.find("p")
+    language_tag = row.find(attrs={"itemprop": "programmingLanguage"})
+    stars_tag = row.find("a", href=_STARS_HREF_RE)
+    forks_tag = row.find("a", href=_FORKS_HREF_RE)
+    # e.g. "1,234 stars today" / "stars this week" in the right-floated span
+    window_tag = row.find(string=_STARS_IN_WINDOW_RE)
+
+    return TrendingRepo(
+        repo_name=repo_name,
+        repo_desc=desc_tag.get_text(strip=True) if desc_tag else "No description",
+        full_repo_url=f"https://github.com{repo_link}",
+        language=language_tag.get_text(strip=True) if language_tag else None,
+        stars=_parse_count(stars_tag.get_text() if stars_tag else None),
+        forks=_parse_count(forks_tag.get_text() if forks_tag else None),
+        stars_today=_parse_count(str(window_tag) if window_tag else None),
+    )
+
+
+def parse_trending_html(html: str, parser: str | None = None) -> list[TrendingRepo]:
     """
-    Scrape GitHub Trending. If 'language' is None, fetch the overall trending page.
-    If 'language' is provided, fetch that language's trending page.
+    Extract every repository listed on a GitHub trending page.
 
-    Returns a list of (repo_name, repo_description, repo_url).
+    Only the ``article.Box-row`` subtrees are parsed. This is CPU-bound, so
+    async callers run it in a worker thread (see ``scrape_github_trending``).
     """
 
-    if language:
-        url = f"https://github.com/trending/{language}?since=daily"
-    else:
-        url = "https://github.com/trending?since=daily"
-
-    try:
-        html = await fetch_text.fetch_text(url)
-        soup = BeautifulSoup(html, "html.parser")
-        # Each repo item is typically an <article> with class "Box-row"
-        repo_rows = soup.find_all("article", class_="Box-row")
-        repos = []
-        for row in repo_rows[:limit]:
-            h2 = row.find("h2")
-            if not h2:
-                continue
-            link_tag = h2.find("a")
-            if not link_tag:
-                continue
-
-            # e.g. "/owner/repo"
-            repo_link = link_tag.get("href", "").strip()
-            repo_name = repo_link.strip("/")
-
-            full_repo_url = f"https://github.com{repo_link}"
-
-            desc_tag = row.find("p")
-            repo_desc = desc_tag.get_text(strip=True) if desc_tag else "No description"
-
-            repos.append(
-                {
-                    "repo_name": repo_name,
-                    "repo_desc": repo_desc,
-                    "full_repo_url": full_repo_url,
-                }
-            )
-
-        return repos
-
-    except Exception as e:
-        print(f"[ERROR] Could not scrape GitHub trending - {e}")
-        return []
+    soup = BeautifulSoup(html, parser or HTML_PARSER, parse_only=_REPO_ROWS)
+    repos = [_repo_from_row(row) for row in soup.find_all("article")]
+    return [repo for repo in repos if repo is not None]
+
+
+async def scrape_github_trending(language: str | None = None, since: str = "daily") -> list[dict]:
+    """
+    Scrape one GitHub Trending page, bypassing the snapshot cache.
+    If 'language' is None, fetch the overall trending page.
+
+    Raises if the page cannot be fetched.
+    """
+
+    html = await fetch_text.fetch_text(trending_url(language, since))
+    repos = await asyncio.to_thread(parse_trending_html, html)
+    return [repo.to_dict() for repo in repos]
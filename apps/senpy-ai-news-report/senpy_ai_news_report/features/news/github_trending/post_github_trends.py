@@ -1,17 +1,41 @@
+import logging
+
 from senpy_ai_news_report.features.news.github_trending.process_github_trends_with_ai import (
-    process_github_trends,
+    process_trends_with_ai,
+    select_github_trends,
+    stream_trends_with_ai,
+)
+from senpy_ai_news_report.features.news.github_trending.trending_history import (
+    get_trending_history,
+)
+from senpy_ai_news_report.features.telegram_integration_features.message_outbox import (
+    fan_out_message,
 )
-from senpy_ai_news_report.features.telegram_integration_features.send_channel_message import (
-    send_message_to_channel,
+from senpy_ai_news_report.features.telegram_integration_features.stream_channel_message import (
+    stream_message_to_channel,
 )
 
 
 async def post_github_trends(
-    language: str | None, limit: int, telegram_channel_id: int | None
+    language: str | None,
+    limit: int,
+    telegram_channel_id: int | None,
+    stream: bool = False,
 ):
-    processed_trends = await process_github_trends(language, limit)
-    await send_message_to_channel(processed_trends, telegram_channel_id)
-    return processed_trends
-
+    trends = await select_github_trends(language, limit)
+    if not trends:
+        logging.info("No new or accelerating GitHub trends to post")
+        return ""
 
+    if stream:
+        processed_trends = await stream_message_to_channel(
+            stream_trends_with_ai(trends), telegram_channel_id
+        )
+    else:
+        completion = await process_trends_with_ai(trends)
+        processed_trends = completion.choices[0].message.content or ""
+        fan_out_message(processed_trends, telegram_channel_id)
 
+    # Remember what was posted so the same repos are skipped until they accelerate
+    get_trending_history().mark_posted(trends)
+    return processed_trends
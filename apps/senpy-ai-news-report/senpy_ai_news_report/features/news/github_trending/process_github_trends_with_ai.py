@@ -1,10 +1,13 @@
 import json
-from typing import List
+from typing import AsyncIterator, List
 
 from dataclasses import dataclass
 
 from senpy_ai_news_report.features.ai.openai_client import AiNewsClient
-from .github_trends_searcher import GithubTrending, fetch_github_trending
+from senpy_ai_news_report.utils.env import env_bool
+from .repo_enrichment import enrich_repos
+from .trending_collector import get_trending
+from .trending_history import get_trending_history
 from .github_trends_prompts import github_trends_system_promt, github_trends_user_promt
 
 
@@ -21,7 +24,7 @@ class TrendsData:
     trends: List[Trend]
 
 
-async def process_trends_with_ai(trends: list[GithubTrending]):
+async def process_trends_with_ai(trends: list[dict]):
     """
     Process GitHub trends with AI.
     """
@@ -32,12 +35,35 @@ async def process_trends_with_ai(trends: list[GithubTrending]):
     )
 
 
+def _trend_text(repo: dict) -> str:
+    return f"{repo['repo_name']} ({repo.get('language') or 'unknown'}). {repo['repo_desc']}"
+
+
+async def select_github_trends(language: str | None = None, limit: int = 10) -> list[dict]:
+    """
+    Pick the new or accelerating repositories of a trending page, fastest first,
+    drop the ones the relevance cascade (CASCADE_MODE) rejects, and add their
+    README excerpt and metadata (GITHUB_ENRICH_REPOS).
+    """
+    snapshot = await get_trending(language)
+    repos = snapshot.repos if snapshot is not None else []
+    candidates = get_trending_history().select_for_post(repos, len(repos))
+    relevant = await AiNewsClient().filter_relevant(
+        candidates,
+        text_of=_trend_text,
+    )
+    trends = relevant[:limit]
+    if trends and env_bool("GITHUB_ENRICH_REPOS", True):
+        trends = await enrich_repos(trends)
+    return trends
+
+
 async def process_github_trends(language: str | None = None, limit: int = 10):
     """
     Fetch GitHub trending repositories and process them with AI.
     """
-    # Fetch the trending repositories
-    trends = await fetch_github_trending(language, limit)
+    # Pick the repositories worth posting
+    trends = await select_github_trends(language, limit)
 
     # Process the trends with AI
     processed_trends = await process_trends_with_ai(trends)
@@ -45,3 +71,26 @@ async def process_github_trends(language: str | None = None, limit: int = 10):
     processed_trends_json = processed_trends.choices[0].message.content or ""
 
     return processed_trends_json
+
+
+async def stream_trends_with_ai(trends: list[dict]) -> AsyncIterator[str]:
+    """
+    Stream the AI blogpost about the given trends as it is written.
+    """
+    async for delta in AiNewsClient().stream_news(
+        github_trends_system_promt, github_trends_user_promt, json.dumps(trends),
+        model="gpt-4.1-mini"
+    ):
+        yield delta
+
+
+async def stream_github_trends(
+    language: str | None = None, limit: int = 10
+) -> AsyncIterator[str]:
+    """
+    Fetch GitHub trending repositories and stream the AI blogpost as it is written.
+    """
+    trends = await select_github_trends(language, limit)
+
+    async for delta in stream_trends_with_ai(trends):
+        yield delta
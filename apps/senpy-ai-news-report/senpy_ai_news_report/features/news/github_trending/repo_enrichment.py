@@ -0,0 +1,216 @@
+"""README and metadata enrichment for trending repositories.
+
+Repository metadata and the README are fetched from the GitHub REST API,
+for all repos at once under GITHUB_ENRICH_CONCURRENCY. Both responses are
+cached in SQLite together with their ETags. Within GITHUB_ENRICH_TTL_SECONDS
+the cache is used without asking GitHub at all. After that, the request is
+conditional, so an unchanged README answers 304 and is never downloaded
+again (304s also do not count against the API rate limit). The README is
+reduced to a plain-text excerpt of GITHUB_README_EXCERPT_TOKENS tokens.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import html
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Sequence
+
+from senpy_ai_news_report.utils.env import env_float, env_int
+from senpy_ai_news_report.utils.http_client import get_http_session, read_limited
+from senpy_ai_news_report.utils.storage import connect_sqlite
+from senpy_ai_news_report.utils.tokens import trim_to_tokens
+
+logger = logging.getLogger(__name__)
+
+GITHUB_API_URL = "https://api.github.com"
+
+_CODE_BLOCK_RE = re.compile(r"```.*?```", re.DOTALL)
+_HTML_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]+>")
+_IMAGE_RE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+_LINK_RE = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+_HEADING_RE = re.compile(r"^#{1,6}\s*", re.MULTILINE)
+_EMPHASIS_RE = re.compile(r"[*`|]+|^>+", re.MULTILINE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def readme_excerpt(markdown: str, max_tokens: int | None = None) -> str:
+    """Plain-text start of a README: no badges, images, markup or code blocks."""
+
+    if max_tokens is None:
+        max_tokens = env_int("GITHUB_README_EXCERPT_TOKENS", 400)
+    text = _CODE_BLOCK_RE.sub(" ", markdown)
+    text = _HTML_COMMENT_RE.sub(" ", text)
+    text = _IMAGE_RE.sub(" ", text)
+    text = _LINK_RE.sub(r"\1", text)
+    text = html.unescape(_TAG_RE.sub(" ", text))
+    text = _HEADING_RE.sub("", text)
+    text = _EMPHASIS_RE.sub(" ", text)
+    text = _WHITESPACE_RE.sub(" ", text).strip()
+    return trim_to_tokens(text, max_tokens)
+
+
+def _metadata(data: Dict[str, Any]) -> Dict[str, Any]:
+    license_info = data.get("license") or {}
+    return {
+        "topics": data.get("topics") or [],
+        "license": license_info.get("spdx_id"),
+        "homepage": data.get("homepage") or None,
+        "open_issues": data.get("open_issues_count"),
+        "created_at": data.get("created_at"),
+        "pushed_at": data.get("pushed_at"),
+    }
+
+
+class RepoEnrichmentCache:
+    def __init__(self, filename: str = "github_trending.sqlite3"):
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(filename)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS repo_enrichment (
+                repo TEXT PRIMARY KEY,
+                metadata TEXT,
+                metadata_etag TEXT,
+                readme_excerpt TEXT,
+                readme_etag TEXT,
+                checked_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, repo: str) -> Dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM repo_enrichment WHERE repo = ?", (repo,)).fetchone()
+        if row is None:
+            return None
+        values = dict(row)
+        values["metadata"] = json.loads(values["metadata"]) if values["metadata"] else None
+        return values
+
+    def save(self, repo: str, values: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO repo_enrichment VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    repo,
+                    json.dumps(values["metadata"]) if values.get("metadata") is not None else None,
+                    values.get("metadata_etag"),
+                    values.get("readme_excerpt"),
+                    values.get("readme_etag"),
+                    values["checked_at"],
+                ),
+            )
+            self._conn.commit()
+
+
+_enrichment_cache: RepoEnrichmentCache | None = None
+
+
+def get_enrichment_cache() -> RepoEnrichmentCache:
+    global _enrichment_cache
+    if _enrichment_cache is None:
+        _enrichment_cache = RepoEnrichmentCache()
+    return _enrichment_cache
+
+
+def _api_headers(etag: str | None, accept: str) -> Dict[str, str]:
+    headers = {"Accept": accept, "X-GitHub-Api-Version": "2022-11-28"}
+    token = os.getenv("GITHUB_TOKEN")
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    if etag:
+        headers["If-None-Match"] = etag
+    return headers
+
+
+async def _conditional_get(
+    path: str, etag: str | None, accept: str, max_bytes: int | None = None
+) -> tuple[int, bytes | None, str | None]:
+    """GET an API path; returns (status, body or None when unchanged/missing, etag)."""
+
+    session = await get_http_session()
+    async with session.get(f"{GITHUB_API_URL}{path}", headers=_api_headers(etag, accept)) as response:
+        if response.status == 304:
+            return 304, None, etag
+        if response.status == 404:
+            return 404, None, None
+        if response.status in (403, 429) and response.headers.get("X-RateLimit-Remaining") == "0":
+            raise RuntimeError("GitHub API rate limit exhausted")
+        response.raise_for_status()
+        return response.status, await read_limited(response, max_bytes), response.headers.get("ETag")
+
+
+async def _enrich_one(repo_name: str, semaphore: asyncio.Semaphore) -> Dict[str, Any] | None:
+    cache = get_enrichment_cache()
+    cached = cache.get(repo_name) or {}
+    if cached and time.time() - cached["checked_at"] < env_float("GITHUB_ENRICH_TTL_SECONDS", 6 * 3600):
+        return cached
+
+    async with semaphore:
+        meta_status, meta_body, meta_etag = await _conditional_get(
+            f"/repos/{repo_name}", cached.get("metadata_etag"), "application/vnd.github+json"
+        )
+        readme_status, readme_body, readme_etag = await _conditional_get(
+            f"/repos/{repo_name}/readme",
+            cached.get("readme_etag"),
+            "application/vnd.github.raw+json",
+            env_int("GITHUB_README_MAX_BYTES", 512 * 1024),
+        )
+
+    values = {
+        "metadata": cached.get("metadata"),
+        "metadata_etag": meta_etag,
+        "readme_excerpt": cached.get("readme_excerpt"),
+        "readme_etag": readme_etag,
+        "checked_at": time.time(),
+    }
+    if meta_body is not None:
+        values["metadata"] = _metadata(json.loads(meta_body))
+    if readme_body is not None:
+        markdown = readme_body.decode("utf-8", errors="replace")
+        values["readme_excerpt"] = await asyncio.to_thread(readme_excerpt, markdown)
+    elif readme_status == 404:
+        values["readme_excerpt"] = None
+    logger.debug("Enriched %s (metadata %s, readme %s)", repo_name, meta_status, readme_status)
+    cache.save(repo_name, values)
+    return values
+
+
+async def enrich_repos(repos: Sequence[dict]) -> List[dict]:
+    """Add ``readme_excerpt`` and metadata fields to trending repo dicts.
+
+    Repos that cannot be enriched are returned unchanged.
+    """
+
+    semaphore = asyncio.Semaphore(env_int("GITHUB_ENRICH_CONCURRENCY", 6))
+    results = await asyncio.gather(
+        *(_enrich_one(repo["repo_name"], semaphore) for repo in repos), return_exceptions=True
+    )
+
+    enriched = []
+    for repo, result in zip(repos, results):
+        if isinstance(result, Exception) or not result:
+            if isinstance(result, Exception):
+                logger.warning("Could not enrich %s: %s", repo["repo_name"], result)
+            enriched.append(dict(repo))
+            continue
+        enriched.append(
+            {**repo, **(result.get("metadata") or {}), "readme_excerpt": result.get("readme_excerpt")}
+        )
+    return enriched
+
+
+__all__ = [
+    "RepoEnrichmentCache",
+    "enrich_repos",
+    "get_enrichment_cache",
+    "readme_excerpt",
+]
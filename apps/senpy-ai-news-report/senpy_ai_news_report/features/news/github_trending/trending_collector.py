@@ -0,0 +1,189 @@
+"""Snapshot cache and concurrent collector for GitHub trending pages.
+
+Every scraped page (language × ``since`` window) is stored as a timestamped
+snapshot. Reads are served from the newest snapshot while it is younger
+than GITHUB_TRENDING_TTL_SECONDS. Concurrent reads of the same stale page
+share one fetch, and fetches to github.com are capped at
+GITHUB_TRENDING_CONCURRENCY. Every fetched page is also added to the
+trending history. If a fetch fails, the last snapshot is served
+even when it is stale.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+from senpy_ai_news_report.utils.env import env_float, env_int
+from senpy_ai_news_report.utils.storage import connect_sqlite
+from .github_trends_searcher import scrape_github_trending
+from .trending_history import get_trending_history
+
+logger = logging.getLogger(__name__)
+
+SINCE_WINDOWS = ("daily", "weekly", "monthly")
+
+PageKey = Tuple[str, str]
+
+
+@dataclass
+class TrendingSnapshot:
+    language: str
+    since: str
+    fetched_at: float
+    repos: List[dict]
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+class TrendingSnapshotStore:
+    def __init__(self, filename: str = "github_trending.sqlite3"):
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(filename)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS trending_snapshots (
+                language TEXT NOT NULL,
+                since TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                repos TEXT NOT NULL,
+                PRIMARY KEY (language, since, fetched_at)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def latest(self, language: str, since: str) -> TrendingSnapshot | None:
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT * FROM trending_snapshots WHERE language = ? AND since = ?
+                ORDER BY fetched_at DESC LIMIT 1
+                """,
+                (language, since),
+            ).fetchone()
+        if row is None:
+            return None
+        return TrendingSnapshot(row["language"], row["since"], row["fetched_at"], json.loads(row["repos"]))
+
+    def save(self, snapshot: TrendingSnapshot) -> None:
+        retention = env_float("GITHUB_TRENDING_RETENTION_DAYS", 30.0) * 24 * 3600
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO trending_snapshots VALUES (?, ?, ?, ?)",
+                (snapshot.language, snapshot.since, snapshot.fetched_at, json.dumps(snapshot.repos)),
+            )
+            self._conn.execute(
+                "DELETE FROM trending_snapshots WHERE fetched_at < ?", (time.time() - retention,)
+            )
+            self._conn.commit()
+
+
+_snapshot_store: TrendingSnapshotStore | None = None
+_inflight: Dict[PageKey, asyncio.Task[TrendingSnapshot]] = {}
+_fetch_semaphore: asyncio.Semaphore | None = None
+
+
+def get_trending_snapshot_store() -> TrendingSnapshotStore:
+    global _snapshot_store
+    if _snapshot_store is None:
+        _snapshot_store = TrendingSnapshotStore()
+    return _snapshot_store
+
+
+def _get_fetch_semaphore() -> asyncio.Semaphore:
+    global _fetch_semaphore
+    if _fetch_semaphore is None:
+        _fetch_semaphore = asyncio.Semaphore(env_int("GITHUB_TRENDING_CONCURRENCY", 4))
+    return _fetch_semaphore
+
+
+async def _refresh(language: str, since: str) -> TrendingSnapshot:
+    async with _get_fetch_semaphore():
+        repos = await scrape_github_trending(language or None, since)
+    snapshot = TrendingSnapshot(language, since, time.time(), repos)
+    get_trending_snapshot_store().save(snapshot)
+    get_trending_history().record(repos, since, snapshot.fetched_at)
+    logger.info("Fetched GitHub trending '%s' (%s): %s repos", language or "all", since, len(repos))
+    return snapshot
+
+
+async def get_trending(
+    language: str | None = None, since: str = "daily", max_age: float | None = None
+) -> TrendingSnapshot | None:
+    """Newest snapshot for a page, refetched when older than ``max_age`` seconds.
+
+    Returns None only if the page was never fetched and cannot be fetched now.
+    """
+
+    if max_age is None:
+        max_age = env_float("GITHUB_TRENDING_TTL_SECONDS", 3600.0)
+    key = (language or "", since)
+    cached = get_trending_snapshot_store().latest(*key)
+    if cached is not None and cached.age < max_age:
+        return cached
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.get_running_loop().create_task(_refresh(*key))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    try:
+        # shield: one caller giving up must not cancel the fetch for the others.
+        return await asyncio.shield(task)
+    except Exception as exc:
+        logger.error("Could not scrape GitHub trending '%s' (%s): %s", key[0] or "all", since, exc)
+        return cached
+
+
+def configured_pages() -> List[PageKey]:
+    """Pages from GITHUB_TRENDING_LANGUAGES × GITHUB_TRENDING_SINCE ("" is all languages)."""
+
+    languages = [part.strip() for part in os.getenv("GITHUB_TRENDING_LANGUAGES", "").split(",")]
+    sinces = [
+        part.strip()
+        for part in (os.getenv("GITHUB_TRENDING_SINCE") or "daily").split(",")
+        if part.strip() in SINCE_WINDOWS
+    ]
+    return [(language, since) for language in dict.fromkeys(languages) for since in sinces or ["daily"]]
+
+
+async def collect_trending(
+    pages: Sequence[PageKey] | None = None, max_age: float | None = None
+) -> Dict[PageKey, TrendingSnapshot]:
+    """Fetch many pages concurrently; pages that could not be fetched are left out."""
+
+    pages = list(pages) if pages is not None else configured_pages()
+    snapshots = await asyncio.gather(*(get_trending(language, since, max_age) for language, since in pages))
+    return {page: snapshot for page, snapshot in zip(pages, snapshots) if snapshot is not None}
+
+
+async def fetch_github_trending(language=None, limit=5, since: str = "daily") -> list[dict]:
+    """
+    GitHub Trending for one language (None for all), served from the snapshot cache.
+
+    Returns the repo dicts produced by ``parse_trending_html``.
+    """
+
+    snapshot = await get_trending(language, since)
+    return snapshot.repos[:limit] if snapshot is not None else []
+
+
+__all__ = [
+    "SINCE_WINDOWS",
+    "TrendingSnapshot",
+    "TrendingSnapshotStore",
+    "get_trending_snapshot_store",
+    "get_trending",
+    "configured_pages",
+    "collect_trending",
+    "fetch_github_trending",
+]
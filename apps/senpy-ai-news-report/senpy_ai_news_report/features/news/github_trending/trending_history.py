@@ -0,0 +1,161 @@
+"""Time series of trending repositories and what was already posted.
+
+Each scraped trending page adds one compact row per repository and day
+(the latest observation of the day wins): stars, forks and stars gained in
+the page's window. Star velocity, in stars per day, comes from the star
+difference to an earlier day when the history has one. Otherwise it comes
+from GitHub's own "stars today/this week/this month" figure.
+
+Repos are picked for a post when they were never posted, or when their
+velocity has grown by TRENDING_ACCELERATION_FACTOR since they were last
+posted. The picks are ranked by velocity.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Sequence
+
+from senpy_ai_news_report.utils.env import env_float
+from senpy_ai_news_report.utils.storage import connect_sqlite
+
+logger = logging.getLogger(__name__)
+
+WINDOW_DAYS = {"daily": 1, "weekly": 7, "monthly": 30}
+
+
+def _day(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+class TrendingHistory:
+    def __init__(self, filename: str = "github_trending.sqlite3"):
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(filename)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS trending_history (
+                repo TEXT NOT NULL,
+                day TEXT NOT NULL,
+                since TEXT NOT NULL,
+                observed_at REAL NOT NULL,
+                stars INTEGER NOT NULL,
+                forks INTEGER NOT NULL,
+                stars_today INTEGER NOT NULL,
+                language TEXT,
+                PRIMARY KEY (repo, day, since)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS trending_history_day ON trending_history (day, since);
+            CREATE TABLE IF NOT EXISTS trending_posted (
+                repo TEXT PRIMARY KEY,
+                posted_at REAL NOT NULL,
+                velocity REAL NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    def record(self, repos: Sequence[dict], since: str, observed_at: float | None = None) -> None:
+        observed_at = time.time() if observed_at is None else observed_at
+        day = _day(observed_at)
+        rows = [
+            (
+                repo["repo_name"],
+                day,
+                since,
+                observed_at,
+                repo.get("stars") or 0,
+                repo.get("forks") or 0,
+                repo.get("stars_today") or 0,
+                repo.get("language"),
+            )
+            for repo in repos
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO trending_history VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+
+    def repo_history(self, repo: str, days: int = 30) -> List[dict]:
+        since_day = _day(time.time() - days * 24 * 3600)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM trending_history WHERE repo = ? AND day >= ? ORDER BY day",
+                (repo, since_day),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def day_rows(self, day: str, since: str = "daily") -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM trending_history WHERE day = ? AND since = ? ORDER BY stars_today DESC",
+                (day, since),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def velocity(self, repo: dict, since: str = "daily") -> float:
+        """Stars per day for a scraped repo dict."""
+
+        today = _day(time.time())
+        with self._lock:
+            previous = self._conn.execute(
+                """
+                SELECT day, stars FROM trending_history
+                WHERE repo = ? AND day < ? AND stars > 0
+                ORDER BY day DESC LIMIT 1
+                """,
+                (repo["repo_name"], today),
+            ).fetchone()
+        stars = repo.get("stars") or 0
+        if previous is not None and stars:
+            elapsed = (
+                datetime.strptime(today, "%Y-%m-%d") - datetime.strptime(previous["day"], "%Y-%m-%d")
+            ).days
+            return max(0.0, (stars - previous["stars"]) / max(1, elapsed))
+        return (repo.get("stars_today") or 0) / WINDOW_DAYS.get(since, 1)
+
+    def select_for_post(self, repos: Sequence[dict], limit: int, since: str = "daily") -> List[dict]:
+        """New or accelerating repos, fastest first, with a ``star_velocity`` field added."""
+
+        factor = env_float("TRENDING_ACCELERATION_FACTOR", 1.5)
+        with self._lock:
+            posted: Dict[str, float] = {
+                row["repo"]: row["velocity"]
+                for row in self._conn.execute("SELECT repo, velocity FROM trending_posted")
+            }
+
+        picked = []
+        for repo in repos:
+            velocity = self.velocity(repo, since)
+            last_velocity = posted.get(repo["repo_name"])
+            if last_velocity is None or velocity >= max(1.0, last_velocity) * factor:
+                picked.append({**repo, "star_velocity": round(velocity, 1)})
+        picked.sort(key=lambda repo: repo["star_velocity"], reverse=True)
+        logger.info("%s of %s trending repos are new or accelerating", len(picked), len(repos))
+        return picked[:limit]
+
+    def mark_posted(self, repos: Sequence[dict]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO trending_posted VALUES (?, ?, ?)",
+                [(repo["repo_name"], now, repo.get("star_velocity") or 0.0) for repo in repos],
+            )
+            self._conn.commit()
+
+
+_trending_history: TrendingHistory | None = None
+
+
+def get_trending_history() -> TrendingHistory:
+    global _trending_history
+    if _trending_history is None:
+        _trending_history = TrendingHistory()
+    return _trending_history
+
+
+__all__ = ["TrendingHistory", "get_trending_history", "WINDOW_DAYS"]
@@ -8,9 +8,19 @@ from senpy_ai_news_report.features.news.article_based_post.post_article import (
 from senpy_ai_news_report.features.news.github_trending.post_github_trends import (
     post_github_trends,
 )
-from senpy_ai_news_report.features.news.rss.feed_parser import parse_feeds, post_feeds
+from senpy_ai_news_report.features.ai.batch_jobs import get_batch_job_store
+from senpy_ai_news_report.features.ai.cascade import cascade_stats
+from senpy_ai_news_report.features.ai.response_cache import get_response_cache
+from senpy_ai_news_report.features.news.rss.feed_parser import (
+    parse_feeds,
+    submit_feeds_for_posting,
+)
+from senpy_ai_news_report.features.telegram_integration_features.outbox_store import (
+    get_outbox_store,
+)
 from senpy_ai_news_report.utils.auth import require_api_token
-from .github_trending.github_trends_searcher import (
+from .github_trending.trending_collector import (
+    collect_trending,
     fetch_github_trending,
 )
 
@@ -21,29 +31,77 @@ router = APIRouter(dependencies=[Depends(require_api_token)])
 
 
 @router.get("/github-trends")
-async def fetch_github_trends(language: str | None = None, limit: int = 10):
-    return await fetch_github_trending(language, limit)
+async def fetch_github_trends(language: str | None = None, limit: int = 10, since: str = "daily"):
+    return await fetch_github_trending(language, limit, since)
+
+
+@router.post("/github-trends/collect")
+async def collect_github_trends():
+    snapshots = await collect_trending()
+    return [
+        {
+            "language": language or None,
+            "since": since,
+            "fetched_at": snapshot.fetched_at,
+            "repos": len(snapshot.repos),
+        }
+        for (language, since), snapshot in snapshots.items()
+    ]
 
 
 @router.post("/post-github-trends-to-telegram-channel")
 async def post_github_trends_to_channel(
-    language: str | None = None, limit: int = 10, telegram_channel_id: int | None = None
+    language: str | None = None,
+    limit: int = 10,
+    telegram_channel_id: int | None = None,
+    stream: bool = False,
 ):
-    return await post_github_trends(language, limit, telegram_channel_id)
+    return await post_github_trends(language, limit, telegram_channel_id, stream=stream)
 
 
 @router.post("/post-article")
-async def post_article_to_channel(article: Article):
-    return await create_and_post_blogpost(article.link)
+async def post_article_to_channel(article: Article, stream: bool = False):
+    return await create_and_post_blogpost(article.link, stream=stream)
 
 
 @router.get("/parse-feeds")
-async def parse_feeds_news():
-    return await parse_feeds()
+async def parse_feeds_news(
+    use_batch_api: bool | None = None, pack_prompts: bool | None = None
+):
+    return await parse_feeds(use_openai_batch_api=use_batch_api, pack_prompts=pack_prompts)
 
 
 @router.post("/post-feeds-news")
-async def post_feeds_news():
+async def post_feeds_news(
+    use_batch_api: bool | None = None, pack_prompts: bool | None = None
+):
+    return await submit_feeds_for_posting(
+        use_openai_batch_api=use_batch_api, pack_prompts=pack_prompts
+    )
+
+
+@router.get("/batch-jobs")
+async def batch_jobs(limit: int = 50):
+    return [job.summary() for job in get_batch_job_store().recent(limit)]
+
+
+@router.get("/telegram-outbox")
+async def telegram_outbox(limit: int = 50):
+    store = get_outbox_store()
+    return {
+        "counts": store.counts(),
+        "channels": store.channel_counts(),
+        "recent": [
+            {key: value for key, value in vars(message).items() if key != "message"}
+            for message in store.recent(limit)
+        ],
+    }
+
 
-    parsed_feed = await parse_feeds()
-    return await post_feeds(parsed_feed)
+@router.get("/ai-stats")
+async def ai_stats():
+    cache = get_response_cache()
+    return {
+        "cascade": cascade_stats.snapshot(),
+        "response_cache": cache.snapshot() if cache is not None else None,
+    }
@@ -0,0 +1,133 @@
+"""Persistent ETag / Last-Modified cache used for conditional feed polling."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Dict
+
+from senpy_ai_news_report.utils.storage import data_path
+
+logger = logging.getLogger(__name__)
+
+STATUS_FETCHED = "fetched"
+STATUS_NOT_MODIFIED = "not_modified"
+STATUS_ERROR = "error"
+
+
+@dataclass
+class FeedCacheEntry:
+    etag: str | None = None
+    last_modified: str | None = None
+    last_outcome: str | None = None
+    last_http_status: int | None = None
+    checked_at: float | None = None
+    changed_at: float | None = None
+    # The last poll left entries that were not yet marked seen
+    unseen_entries: bool = False
+
+
+class FeedValidatorCache:
+    """Remembers HTTP validators and the last poll outcome for every feed URL."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._entries: Dict[str, FeedCacheEntry] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("Ignoring unreadable feed cache at %s: %s", self.path, exc)
+            return
+
+        known = {f.name for f in fields(FeedCacheEntry)}
+        for url, values in raw.items():
+            if isinstance(values, dict):
+                self._entries[url] = FeedCacheEntry(**{k: v for k, v in values.items() if k in known})
+
+    def get(self, url: str) -> FeedCacheEntry:
+        return self._entries.get(url) or FeedCacheEntry()
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Validators for the next poll, none while the feed still has unseen entries.
+
+        Entries cut by the per-feed limit or the token budget, or behind a
+        failed request, are only in the current document. A 304 would hide
+        them until the feed changes again, so such feeds are polled in full.
+        """
+        entry = self._entries.get(url)
+        if entry is None or entry.unseen_entries:
+            return {}
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def record(
+        self,
+        url: str,
+        outcome: str,
+        http_status: int | None = None,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        entry = self._entries.setdefault(url, FeedCacheEntry())
+        now = time.time()
+        entry.last_outcome = outcome
+        entry.last_http_status = http_status
+        entry.checked_at = now
+        if outcome == STATUS_FETCHED:
+            # Validators are replaced wholesale so a server that stops sending
+            # one does not keep receiving a stale value.
+            entry.etag = etag
+            entry.last_modified = last_modified
+            entry.changed_at = now
+            # Cleared once the run found every entry of the new document seen
+            entry.unseen_entries = True
+        self._dirty = True
+
+    def set_unseen_entries(self, url: str, unseen: bool) -> None:
+        entry = self._entries.setdefault(url, FeedCacheEntry())
+        if entry.unseen_entries != unseen:
+            entry.unseen_entries = unseen
+            self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        payload = {url: asdict(entry) for url, entry in self._entries.items()}
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+
+_feed_cache: FeedValidatorCache | None = None
+
+
+def get_feed_cache() -> FeedValidatorCache:
+    global _feed_cache
+    if _feed_cache is None:
+        _feed_cache = FeedValidatorCache(data_path("feed_validators.json"))
+    return _feed_cache
+
+
+__all__ = [
+    "FeedCacheEntry",
+    "FeedValidatorCache",
+    "get_feed_cache",
+    "STATUS_FETCHED",
+    "STATUS_NOT_MODIFIED",
+    "STATUS_ERROR",
+]
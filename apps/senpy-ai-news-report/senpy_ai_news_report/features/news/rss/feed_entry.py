@@ -0,0 +1,103 @@
+"""Compact feed entry record and prompt payload rendering."""
+
+from __future__ import annotations
+
+import html
+import re
+from typing import Iterable, List, Tuple
+
+from senpy_ai_news_report.utils.tokens import estimate_tokens, trim_to_tokens
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+DEFAULT_SUMMARY_MAX_CHARS = 600
+
+
+def clean_summary(raw: str | None, max_chars: int = DEFAULT_SUMMARY_MAX_CHARS) -> str:
+    """Strip markup and collapse whitespace from a feed summary."""
+
+    if not raw:
+        return ""
+    text = html.unescape(_TAG_RE.sub(" ", raw))
+    text = _WHITESPACE_RE.sub(" ", text).strip()
+    if len(text) > max_chars:
+        text = text[:max_chars].rsplit(" ", 1)[0] + "…"
+    return text
+
+
+class FeedEntry:
+    """Single feed item with only the fields the prompt needs.
+
+    Uses ``__slots__`` because thousands of these are held per run and are
+    pickled back from the parse workers.
+    """
+
+    __slots__ = ("id", "title", "link", "published", "summary", "related_links")
+
+    def __init__(
+        self,
+        id: str | None,
+        title: str,
+        link: str,
+        published: str | None,
+        summary: str,
+        related_links: Tuple[str, ...] = (),
+    ):
+        self.id = id
+        self.title = title
+        self.link = link
+        self.published = published
+        self.summary = summary
+        # Links of near-duplicate entries from other feeds, see story_clusters.
+        self.related_links = related_links
+
+    def __repr__(self) -> str:
+        return f"FeedEntry(title={self.title!r}, link={self.link!r})"
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def render(self, summary_tokens: int | None = None) -> str:
+        summary = self.summary
+        if summary_tokens is not None:
+            summary = trim_to_tokens(summary, summary_tokens)
+        lines = [f"- {self.title}"]
+        if self.published:
+            lines.append(f"  published: {self.published}")
+        if self.link:
+            lines.append(f"  link: {self.link}")
+        if self.related_links:
+            lines.append(f"  also covered by: {', '.join(self.related_links)}")
+        if summary:
+            lines.append(f"  summary: {summary}")
+        return "\n".join(lines)
+
+
+def render_entries(entries: Iterable[FeedEntry], token_budget: int) -> Tuple[str, List[FeedEntry]]:
+    """Pack entries into a prompt payload that fits ``token_budget``.
+
+    Returns the payload and the entries that made it in, so callers only mark
+    what the model actually saw. The first entry is always included, with its
+    summary trimmed if it alone exceeds the budget.
+    """
+
+    parts: List[str] = []
+    included: List[FeedEntry] = []
+    used = 0
+    for entry in entries:
+        block = entry.render()
+        cost = estimate_tokens(block) + 1
+        if used + cost > token_budget:
+            if included:
+                break
+            overhead = estimate_tokens(entry.render(summary_tokens=0))
+            block = entry.render(summary_tokens=max(0, token_budget - overhead - 1))
+            cost = estimate_tokens(block) + 1
+        parts.append(block)
+        included.append(entry)
+        used += cost
+    return "\n".join(parts), included
+
+
+__all__ = ["FeedEntry", "clean_summary", "render_entries"]
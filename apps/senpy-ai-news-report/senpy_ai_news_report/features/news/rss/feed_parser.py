@@ -1,27 +1,48 @@
 import asyncio
-import feedparser
 from datetime import datetime
 import time
 import logging
 import os
 
-from telethon.client.downloads import aiohttp
-
+from senpy_ai_news_report.features.ai.batch_jobs import get_batch_job_store
+from senpy_ai_news_report.features.ai.batch_poller import notify_new_job, register_continuation
 from senpy_ai_news_report.features.ai.openai_client import AiNewsClient
+from senpy_ai_news_report.features.ai.prompt_packing import (
+    PACKED_OUTPUT_INSTRUCTIONS,
+    PackedRequest,
+    pack_items,
+    unpack_results,
+)
+from senpy_ai_news_report.features.news.rss.feed_cache import (
+    STATUS_ERROR,
+    STATUS_FETCHED,
+    STATUS_NOT_MODIFIED,
+    FeedValidatorCache,
+    get_feed_cache,
+)
+from senpy_ai_news_report.features.news.rss.feed_entry import render_entries
+from senpy_ai_news_report.features.news.rss.parse_executor import parse_feed
 from senpy_ai_news_report.features.news.rss.rss_feeds import RSS_FEEDS
-from senpy_ai_news_report.features.telegram_integration_features.send_channel_message import (
-    send_message_to_channel,
+from senpy_ai_news_report.features.news.rss.seen_entries import (
+    STATUS_FILTERED,
+    entry_keys,
+    get_seen_index,
 )
+from senpy_ai_news_report.features.news.rss.story_clusters import cluster_stories
+from senpy_ai_news_report.features.telegram_integration_features.message_outbox import (
+    fan_out_message,
+)
+from senpy_ai_news_report.features.telegram_integration_features.posting_planner import (
+    schedule_posts,
+)
+from senpy_ai_news_report.utils.env import env_bool, env_float, env_int
+from senpy_ai_news_report.utils.http_client import get_http_session, read_limited
 from .rss_prompts import rss_system_promt, rss_user_promt
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
-async def process_rss_with_ai(rss_entries, model: str | None = None):
-    if model is None:
-        model = "gpt-4o-mini"
-
 async def process_rss_with_ai(rss_entries, model: str | None = None):
     if model is None:
         model = "gpt-4o-mini"
@@ -62,8 +83,17 @@ async def process_rss_with_ai_batch(
 
     ai_client = AiNewsClient()
 
-    # Use OpenAI Batch API for cost efficiency (slower but cheaper)
-    return await ai_client.process_news_in_batch(
+    if use_openai_batch_api:
+        # Use OpenAI Batch API for cost efficiency (slower but cheaper)
+        return await ai_client.process_news_in_batch(
+            system_prompt=rss_system_promt,
+            user_prompt=rss_user_promt,
+            data_list=rss_entries_list,
+            model=model,
+        )
+
+    # Rate-limited concurrent completions for low latency (full price)
+    return await ai_client.process_news_concurrently(
         system_prompt=rss_system_promt,
         user_prompt=rss_user_promt,
         data_list=rss_entries_list,
@@ -71,29 +101,107 @@ async def process_rss_with_ai_batch(
     )
 
 
-async def fetch_feed(session, url):
-    """Fetch a single RSS feed asynchronously."""
+async def fetch_feed(session, url, feed_cache: FeedValidatorCache | None = None):
+    """Fetch a single RSS feed document asynchronously.
+
+    Sends the stored ETag / Last-Modified validators so unchanged feeds answer
+    with 304 and are neither downloaded nor parsed. Returns the raw bytes,
+    parsing is left to the parse executor. feedparser works out the encoding
+    from the XML declaration, many feeds send no charset in Content-Type.
+    """
     logging.info(f"Fetching feed from {url}")
+    headers = feed_cache.conditional_headers(url) if feed_cache else {}
     try:
-        async with session.get(url) as response:
+        async with session.get(url, headers=headers) as response:
+            if response.status == 304:
+                logging.info(f"Feed not modified since last poll: {url}")
+                if feed_cache:
+                    feed_cache.record(url, STATUS_NOT_MODIFIED, response.status)
+                return url, None
             if response.status == 200:
-                feed_data = await response.text()
+                feed_data = await read_limited(response)
                 logging.info(f"Successfully fetched feed from {url}")
-                return url, feedparser.parse(feed_data)
+                if feed_cache:
+                    feed_cache.record(
+                        url,
+                        STATUS_FETCHED,
+                        response.status,
+                        etag=response.headers.get("ETag"),
+                        last_modified=response.headers.get("Last-Modified"),
+                    )
+                return url, feed_data
             else:
                 logging.error(f"Failed to fetch {url} (status: {response.status})")
+                if feed_cache:
+                    feed_cache.record(url, STATUS_ERROR, response.status)
                 return url, None
     except Exception as e:
         logging.error(f"Error fetching {url}: {e}")
+        if feed_cache:
+            feed_cache.record(url, STATUS_ERROR)
         return url, None
 
 
-async def fetch_all_feeds(urls):
-    """Fetch all RSS feeds concurrently."""
-    logging.info("Fetching all RSS feeds.")
-    async with aiohttp.ClientSession() as session:
-        tasks = [fetch_feed(session, url) for url in urls]
-        results = await asyncio.gather(*tasks)
+async def fetch_and_parse_feed(
+    session,
+    url,
+    feed_cache: FeedValidatorCache | None = None,
+    semaphore: asyncio.Semaphore | None = None,
+):
+    """Fetch a feed and parse it in the parse executor into compact entry records."""
+    if semaphore is None:
+        url, document = await fetch_feed(session, url, feed_cache)
+    else:
+        async with semaphore:
+            url, document = await fetch_feed(session, url, feed_cache)
+    if document is None:
+        return url, None
+    try:
+        return url, await parse_feed(document)
+    except Exception as e:
+        logging.error(f"Error parsing feed {url}: {e}")
+        return url, None
+
+
+async def fetch_all_feeds(
+    urls, concurrency: int | None = None, time_budget: float | None = None
+):
+    """Fetch all RSS feeds concurrently and parse them off the event loop.
+
+    At most ``concurrency`` feeds are downloaded at once. Feeds that have not
+    finished within ``time_budget`` seconds are cancelled and reported as
+    ``(url, None)`` so one slow host cannot stall the whole run. The updated
+    validators are saved by the caller, once per run.
+    """
+    if concurrency is None:
+        concurrency = env_int("FEEDS_FETCH_CONCURRENCY", 20)
+    if time_budget is None:
+        time_budget = env_float("FEEDS_FETCH_TIME_BUDGET", 120.0)
+
+    logging.info(f"Fetching {len(urls)} RSS feeds (concurrency={concurrency}).")
+    feed_cache = get_feed_cache()
+    session = await get_http_session()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    tasks = {
+        asyncio.create_task(fetch_and_parse_feed(session, url, feed_cache, semaphore)): url
+        for url in urls
+    }
+    if tasks:
+        _, pending = await asyncio.wait(tasks, timeout=time_budget)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            logging.warning(
+                f"{len(pending)} feeds did not finish within {time_budget}s and were skipped"
+            )
+
+    results = []
+    for task, url in tasks.items():
+        if task.cancelled() or task.exception() is not None:
+            results.append((url, None))
+        else:
+            results.append(task.result())
     logging.info("Finished fetching all RSS feeds.")
     return results
 
@@ -113,50 +221,304 @@ def check_feed_updated(feed, last_run_date):
     return False, None
 
 
-async def parse_feeds():
+def _feeds_options(
+    entries_per_feed: int | None,
+    token_budget: int | None,
+    use_openai_batch_api: bool | None,
+    pack_prompts: bool | None = None,
+):
+    if entries_per_feed is None:
+        entries_per_feed = env_int("FEED_ENTRIES_PER_FEED", 5)
+    if token_budget is None:
+        token_budget = env_int("FEED_PROMPT_TOKEN_BUDGET", 1500)
+    if use_openai_batch_api is None:
+        use_openai_batch_api = env_bool("FEEDS_USE_BATCH_API", True)
+    if pack_prompts is None:
+        pack_prompts = env_bool("FEEDS_PACK_PROMPTS", False)
+    return entries_per_feed, token_budget, use_openai_batch_api, pack_prompts
+
+
+async def collect_feed_payloads(
+    entries_per_feed: int, token_budget: int, per_entry: bool = False
+):
+    """
+    Fetch every configured feed and build one prompt payload per feed.
+
+    With ``per_entry`` every story gets a payload of its own, which is what
+    prompt packing works on.
 
+    Returns the payloads and, for each payload, the entries it covers, so
+    callers can mark exactly those entries as seen once the model answered
+    for them.
+    """
     # Fetch all feeds asynchronously
     feed_results = await fetch_all_feeds(RSS_FEEDS)
-    # print(feed_results[:1][0])
 
-    # Extract data from feed results
+    # Extract data from feed results, skipping entries that already reached the model
+    seen_index = get_seen_index()
+    feed_cache = get_feed_cache()
+    in_flight = _in_flight_entry_keys()
+    new_entries_per_feed = []
+    for url, entries in feed_results:
+        if entries is None:
+            continue
+        new_entries = seen_index.filter_new(entries)
+        # Until every entry is marked seen the feed is polled without validators,
+        # so entries left out of this run are not hidden behind a 304.
+        feed_cache.set_unseen_entries(url, bool(new_entries))
+        # Entries of a batch job that is still running are not submitted twice
+        new_entries = [
+            entry for entry in new_entries if in_flight.isdisjoint(entry_keys(entry))
+        ]
+        if new_entries:
+            logging.info(f"{len(new_entries)} new entries in {url}")
+            new_entries_per_feed.append((url, new_entries[:entries_per_feed]))
+    # One save per run, covering the fetched validators and the unseen flags
+    try:
+        feed_cache.save()
+    except OSError as e:
+        logging.error(f"Could not persist feed validator cache: {e}")
+
+    # Collapse the same story reported by several feeds into one representative
+    clusters = await asyncio.to_thread(
+        cluster_stories, [entry for _, entries in new_entries_per_feed for entry in entries]
+    )
+
+    # Cheap relevance triage so only promising stories reach the writer model
+    relevant = await AiNewsClient().filter_relevant(
+        [cluster.representative for cluster in clusters],
+        text_of=lambda entry: f"{entry.title}. {entry.summary}",
+    )
+    relevant_ids = {id(entry) for entry in relevant}
+    rejected = [cluster for cluster in clusters if id(cluster.representative) not in relevant_ids]
+    seen_index.mark(
+        (entry for cluster in rejected for entry in cluster.members), status=STATUS_FILTERED
+    )
+    cluster_by_representative = {
+        id(cluster.representative): cluster
+        for cluster in clusters
+        if id(cluster.representative) in relevant_ids
+    }
+
     feed_data_list = []
-    for feed_entry in feed_results[:1]:  # Process first feed for now
-        url, data = feed_entry
-        if data:  # Make sure data is not None
-            print(data.entries[:5])
-            feed_data_list.append(
-                data.entries[:5]
-            )  # Limit to first 5 entries for batch processing
+    payload_entries = []
+    for url, entries in new_entries_per_feed:
+        representatives = [entry for entry in entries if id(entry) in cluster_by_representative]
+        if not representatives:
+            continue
+        groups = [[entry] for entry in representatives] if per_entry else [representatives]
+        for group in groups:
+            payload, included = render_entries(group, token_budget)
+            feed_data_list.append(payload)
+            # Duplicates are marked seen together with the entry that stood in for them
+            payload_entries.append(
+                [member for entry in included for member in cluster_by_representative[id(entry)].members]
+            )
+    logging.info(
+        f"{len(feed_data_list)} of {len(feed_results)} feeds have new stories to process"
+    )
+    return feed_data_list, payload_entries
+
+
+def _in_flight_entry_keys() -> set[str]:
+    """Entry keys of feed batch jobs that were submitted but not delivered yet."""
+    jobs = get_batch_job_store().pending_jobs(
+        [POST_FEEDS_CONTINUATION, POST_PACKED_FEEDS_CONTINUATION]
+    )
+    return {
+        key
+        for job in jobs
+        for keys in (job.context.get("continuation_context") or {}).get("entry_keys", [])
+        for key in keys
+    }
+
+
+def _successful_request_indexes(results) -> set[int]:
+    """Indexes ``i`` of the ``request-<i>`` results that came back with status 200."""
+    return {
+        int(result["custom_id"].split("-")[1])
+        for result in results
+        if (result.get("response") or {}).get("status_code") == 200
+    }
+
+
+async def parse_feeds(
+    entries_per_feed: int | None = None,
+    token_budget: int | None = None,
+    use_openai_batch_api: bool | None = None,
+    pack_prompts: bool | None = None,
+):
+    """
+    Fetch every configured feed and process the new entries with the model.
+
+    Each feed contributes one request to the batch, capped at
+    ``entries_per_feed`` entries (FEED_ENTRIES_PER_FEED, 5 by default) and
+    trimmed to ``token_budget`` estimated tokens (FEED_PROMPT_TOKEN_BUDGET).
+    ``use_openai_batch_api`` picks the cheap Batch API over concurrent
+    real-time completions; it defaults to FEEDS_USE_BATCH_API (on).
+    ``pack_prompts`` (FEEDS_PACK_PROMPTS) writes one post per story instead
+    of one per feed and packs the stories into as few requests as the
+    PACKED_REQUEST_TOKEN_BUDGET allows.
+    Waits for the results, see ``submit_feeds_for_posting`` for the
+    non-blocking variant.
+    """
+    entries_per_feed, token_budget, use_openai_batch_api, pack_prompts = _feeds_options(
+        entries_per_feed, token_budget, use_openai_batch_api, pack_prompts
+    )
+    feed_data_list, payload_entries = await collect_feed_payloads(
+        entries_per_feed, token_budget, per_entry=pack_prompts
+    )
 
     if feed_data_list:
-        # Process all feeds in batch
-        batch_results = await process_rss_with_ai_in_batch(
-            feed_data_list,
-            model="gpt-4.1",
+        if pack_prompts:
+            batch_results = await AiNewsClient().process_news_packed(
+                system_prompt=rss_system_promt,
+                user_prompt=rss_user_promt,
+                items=feed_data_list,
+                model="gpt-4.1",
+                use_openai_batch_api=use_openai_batch_api,
+            )
+        else:
+            # Process all feeds in batch
+            batch_results = await process_rss_with_ai_batch(
+                feed_data_list,
+                model="gpt-4.1",
+                use_openai_batch_api=use_openai_batch_api,
+            )
+        # Entries behind a failed request stay unseen and are retried next run
+        succeeded = _successful_request_indexes(batch_results)
+        get_seen_index().mark(
+            entry for index in sorted(succeeded) for entry in payload_entries[index]
         )
         return batch_results
     else:
-        print("No valid feed data to process")
+        print("No new feed data to process")
         return []
 
 
+async def submit_feeds_for_posting(
+    entries_per_feed: int | None = None,
+    token_budget: int | None = None,
+    use_openai_batch_api: bool | None = None,
+    pack_prompts: bool | None = None,
+):
+    """
+    Process new feed entries and post the results without blocking on the Batch API.
+
+    In batch mode the job is recorded and the background poller posts the
+    results when it finishes, also across restarts. In real-time mode the
+    results are posted right away.
+    """
+    entries_per_feed, token_budget, use_openai_batch_api, pack_prompts = _feeds_options(
+        entries_per_feed, token_budget, use_openai_batch_api, pack_prompts
+    )
+    if not use_openai_batch_api:
+        return await post_feeds(
+            await parse_feeds(
+                entries_per_feed, token_budget, use_openai_batch_api=False, pack_prompts=pack_prompts
+            )
+        )
+
+    feed_data_list, payload_entries = await collect_feed_payloads(
+        entries_per_feed, token_budget, per_entry=pack_prompts
+    )
+    if not feed_data_list:
+        print("No new feed data to process")
+        return {"batch_job": None}
+
+    user_prompt = rss_user_promt
+    continuation = POST_FEEDS_CONTINUATION
+    # Entries are marked seen by the continuation, only behind successful requests
+    continuation_context = {
+        "entry_keys": [
+            [key for entry in entries for key in entry_keys(entry)] for entries in payload_entries
+        ]
+    }
+    if pack_prompts:
+        packed_requests = pack_items(
+            feed_data_list, env_int("PACKED_REQUEST_TOKEN_BUDGET", 6000)
+        )
+        feed_data_list = [packed.payload for packed in packed_requests]
+        user_prompt = rss_user_promt + PACKED_OUTPUT_INSTRUCTIONS
+        continuation = POST_PACKED_FEEDS_CONTINUATION
+        continuation_context["packed_requests"] = [
+            packed.to_dict() for packed in packed_requests
+        ]
+
+    job = await AiNewsClient().submit_batch(
+        system_prompt=rss_system_promt,
+        user_prompt=user_prompt,
+        data_list=feed_data_list,
+        model="gpt-4.1",
+        continuation=continuation,
+        continuation_context=continuation_context,
+    )
+    notify_new_job()
+    logging.info(f"Submitted feeds batch job {job.id} ({len(feed_data_list)} requests)")
+    return {"batch_job": job.summary()}
+
+
 async def post_feeds(
     feed_results,
+    schedule: bool | None = None,
 ):
     """
-    Main function to process multiple feeds asynchronously and send to Telegram.
+    Queue the content of every successful result for posting to Telegram.
 
     Args:
-        telegram_channel_id: Telegram channel ID to send messages to
+        schedule: Spread the posts over the posting window, held in the
+            outbox until their slot, instead of posting them now
+            (FEEDS_SCHEDULE_POSTS).
     """
 
+    if schedule is None:
+        schedule = env_bool("FEEDS_SCHEDULE_POSTS", False)
+
+    contents = []
     for result in feed_results:
-        response = result["response"]
+        response = result.get("response")
+        if not response or response.get("status_code") != 200:
+            logging.error(f"Skipping failed result {result.get('custom_id')}: {result.get('error')}")
+            continue
         body = response["body"]
         choices = body["choices"][0]
         content = choices["message"]["content"]
         if content is not None:
-            await send_message_to_channel(message=content, telegram_channel_id=None)
+            contents.append(content)
+
+    if schedule:
+        schedule_posts(contents)
+    else:
+        for content in contents:
+            fan_out_message(content)
 
     return feed_results
+
+
+def _mark_submitted_entries(results, context):
+    """Mark the entries behind every successful result of a feeds batch job as seen."""
+    keys = context.get("entry_keys") or []
+    get_seen_index().mark_keys(
+        key
+        for index in sorted(_successful_request_indexes(results))
+        if index < len(keys)
+        for key in keys[index]
+    )
+
+
+async def _post_feeds_continuation(results, context):
+    await post_feeds(results)
+    _mark_submitted_entries(results, context)
+
+
+async def _post_packed_feeds_continuation(results, context):
+    packed_requests = [PackedRequest(**packed) for packed in context["packed_requests"]]
+    results = unpack_results(packed_requests, results)
+    await post_feeds(results)
+    _mark_submitted_entries(results, context)
+
+
+POST_FEEDS_CONTINUATION = "post_feeds"
+POST_PACKED_FEEDS_CONTINUATION = "post_packed_feeds"
+register_continuation(POST_FEEDS_CONTINUATION, _post_feeds_continuation)
+register_continuation(POST_PACKED_FEEDS_CONTINUATION, _post_packed_feeds_continuation)
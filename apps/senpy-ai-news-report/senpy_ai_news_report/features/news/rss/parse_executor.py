@@ -0,0 +1,86 @@
+"""Process pool that keeps CPU-bound feed parsing off the event loop.
+
+This module is imported by the worker processes, so it must stay free of
+heavy application imports that would pull in clients or read credentials.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import List
+
+import feedparser
+
+from senpy_ai_news_report.features.news.rss.feed_entry import FeedEntry, clean_summary
+from senpy_ai_news_report.utils.env import env_int
+
+logger = logging.getLogger(__name__)
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def _worker_count() -> int:
+    return max(0, env_int("FEED_PARSE_WORKERS", min(4, os.cpu_count() or 1)))
+
+
+def parse_feed_document(document: str | bytes) -> List[FeedEntry]:
+    """Parse a raw RSS/Atom document into compact, picklable entry records."""
+
+    parsed = feedparser.parse(document)
+    summary_chars = env_int("FEED_SUMMARY_MAX_CHARS", 600)
+    records = []
+    for entry in parsed.entries:
+        records.append(
+            FeedEntry(
+                id=entry.get("id"),
+                title=(entry.get("title") or "").strip(),
+                link=entry.get("link") or "",
+                published=entry.get("published") or entry.get("updated"),
+                summary=clean_summary(entry.get("summary"), summary_chars),
+            )
+        )
+    return records
+
+
+def start_parse_executor() -> Executor | None:
+    """Start the worker pool. With FEED_PARSE_WORKERS=0 parsing runs in a thread instead."""
+
+    global _executor
+    if _executor is None:
+        workers = _worker_count()
+        if workers == 0:
+            return None
+        _executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        logger.info("Feed parse executor started with %s workers", workers)
+    return _executor
+
+
+def shutdown_parse_executor(wait: bool = True) -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=wait, cancel_futures=True)
+        logger.info("Feed parse executor shut down (wait=%s)", wait)
+    _executor = None
+
+
+async def parse_feed(document: str | bytes) -> List[FeedEntry]:
+    executor = _executor or start_parse_executor()
+    if executor is None:
+        return await asyncio.to_thread(parse_feed_document, document)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, parse_feed_document, document)
+
+
+__all__ = [
+    "parse_feed",
+    "parse_feed_document",
+    "start_parse_executor",
+    "shutdown_parse_executor",
+]
@@ -0,0 +1,154 @@
+"""Persistent index of feed entries that were already sent to the model."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import re
+import threading
+import time
+from typing import Any, Iterable, List
+from urllib.parse import urlsplit, urlunsplit
+
+from senpy_ai_news_report.utils.env import env_int
+from senpy_ai_news_report.utils.storage import connect_sqlite
+
+logger = logging.getLogger(__name__)
+
+STATUS_PROCESSED = "processed"
+STATUS_POSTED = "posted"
+STATUS_FILTERED = "filtered"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter used as a fast negative check in front of SQLite."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> Iterable[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+def _field(entry: Any, name: str) -> str:
+    value = entry.get(name) if isinstance(entry, dict) else getattr(entry, name, None)
+    return str(value).strip() if value else ""
+
+
+def _normalize_link(link: str) -> str:
+    parts = urlsplit(link)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), parts.query, ""))
+
+
+def entry_keys(entry: Any) -> List[str]:
+    """Dedupe keys for an entry: guid, normalized link and a content hash."""
+
+    keys = []
+    guid = _field(entry, "id")
+    if guid:
+        keys.append(f"guid:{guid}")
+    link = _field(entry, "link")
+    if link:
+        keys.append(f"link:{_normalize_link(link)}")
+    content = _WHITESPACE_RE.sub(" ", f"{_field(entry, 'title')} {_field(entry, 'summary')}").strip().lower()
+    if content:
+        keys.append("hash:" + hashlib.sha256(content.encode("utf-8")).hexdigest())
+    return keys
+
+
+class SeenEntryIndex:
+    def __init__(self, filename: str = "seen_entries.sqlite3"):
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(filename)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS seen_entries (
+                key TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+        count = self._conn.execute("SELECT COUNT(*) FROM seen_entries").fetchone()[0]
+        capacity = max(env_int("SEEN_ENTRIES_BLOOM_CAPACITY", 100_000), count * 2)
+        self._bloom = BloomFilter(capacity)
+        for row in self._conn.execute("SELECT key FROM seen_entries"):
+            self._bloom.add(row[0])
+        logger.info("Seen-entry index loaded with %s keys", count)
+
+    def _has_key(self, key: str) -> bool:
+        if key not in self._bloom:
+            return False
+        row = self._conn.execute("SELECT 1 FROM seen_entries WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def is_seen(self, entry: Any) -> bool:
+        with self._lock:
+            return any(self._has_key(key) for key in entry_keys(entry))
+
+    def filter_new(self, entries: Iterable[Any]) -> List[Any]:
+        return [entry for entry in entries if not self.is_seen(entry)]
+
+    def mark(self, entries: Iterable[Any], status: str = STATUS_PROCESSED) -> None:
+        self.mark_keys((key for entry in entries for key in entry_keys(entry)), status)
+
+    def mark_keys(self, keys: Iterable[str], status: str = STATUS_PROCESSED) -> None:
+        """Mark entries by their ``entry_keys``, e.g. keys stored with a batch job."""
+
+        now = time.time()
+        rows = [(key, status, now, now) for key in keys]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT INTO seen_entries (key, status, first_seen, updated_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET status = excluded.status, updated_at = excluded.updated_at
+                """,
+                rows,
+            )
+            self._conn.commit()
+            for key, *_ in rows:
+                self._bloom.add(key)
+
+
+_seen_index: SeenEntryIndex | None = None
+
+
+def get_seen_index() -> SeenEntryIndex:
+    global _seen_index
+    if _seen_index is None:
+        _seen_index = SeenEntryIndex()
+    return _seen_index
+
+
+__all__ = [
+    "BloomFilter",
+    "SeenEntryIndex",
+    "entry_keys",
+    "get_seen_index",
+    "STATUS_PROCESSED",
+    "STATUS_POSTED",
+    "STATUS_FILTERED",
+]
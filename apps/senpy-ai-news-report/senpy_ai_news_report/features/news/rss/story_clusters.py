@@ -0,0 +1,143 @@
+"""Near-duplicate story clustering across feeds using MinHash LSH.
+
+Feeds reword the same story ("OpenAI launches GPT-5" / "GPT-5 released by
+OpenAI"), so entries are compared on the set of normalized content words of
+their headline (stop words dropped, crude suffix stemming). The summary is
+only used when the title has too few words, since summaries of one story
+differ far more between feeds than their headlines do.
+
+Each word set gets a MinHash signature that is split into bands of
+``_ROWS_PER_BAND`` values. Entries sharing a band become candidates, and a
+candidate pair is merged when the exact Jaccard similarity of the word sets
+reaches STORY_SIMILARITY_THRESHOLD. With 32 bands of 2 rows a pair at
+similarity 0.4 shares a band with probability above 99%, while comparisons
+stay confined to band buckets, so the pass stays linear in the number of
+entries. Entries without any words are never clustered.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import random
+import re
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+from senpy_ai_news_report.features.news.rss.feed_entry import FeedEntry
+from senpy_ai_news_report.utils.env import env_float
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_SIZE = 64
+_ROWS_PER_BAND = 2
+_MIN_TITLE_TERMS = 3
+_MERSENNE_PRIME = (1 << 61) - 1
+# Fixed seed: signatures must be comparable between runs and processes.
+_rng = random.Random(7)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(SIGNATURE_SIZE)
+]
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_SUFFIXES = ("ing", "ed", "es", "s", "e")
+_STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in into is it its of on or over says that the "
+    "this to was were will with new now just".split()
+)
+# Bound work per bucket so a pathological bucket cannot go quadratic.
+_MAX_BUCKET_COMPARISONS = 32
+
+
+@dataclass
+class StoryCluster:
+    representative: FeedEntry
+    members: List[FeedEntry] = field(default_factory=list)
+
+
+def _stem(word: str) -> str:
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[: -len(suffix)]
+    return word
+
+
+def _terms(text: str) -> FrozenSet[str]:
+    return frozenset(_stem(word) for word in _WORD_RE.findall(text.lower()) if word not in _STOP_WORDS)
+
+
+def story_terms(entry: FeedEntry) -> FrozenSet[str]:
+    """Normalized words an entry is compared on: the headline, or headline and summary if it is short."""
+
+    terms = _terms(entry.title or "")
+    if len(terms) < _MIN_TITLE_TERMS:
+        terms |= _terms(entry.summary or "")
+    return terms
+
+
+def minhash(terms: Iterable[str]) -> Tuple[int, ...]:
+    """MinHash signature of a word set; an empty set has an empty signature."""
+
+    values = [
+        int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little")
+        for term in terms
+    ]
+    if not values:
+        return ()
+    return tuple(min((a * value + b) % _MERSENNE_PRIME for value in values) for a, b in _PERMUTATIONS)
+
+
+def jaccard(left: FrozenSet[str], right: FrozenSet[str]) -> float:
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def cluster_stories(entries: Iterable[FeedEntry], threshold: float | None = None) -> List[StoryCluster]:
+    """Group near-duplicate entries; each cluster keeps the most detailed entry.
+
+    The representative's ``related_links`` is filled with the other members'
+    links so the prompt can credit every source. CPU-bound, async callers
+    run it in a worker thread.
+    """
+
+    if threshold is None:
+        threshold = env_float("STORY_SIMILARITY_THRESHOLD", 0.4)
+
+    entries = list(entries)
+    parent = list(range(len(entries)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    terms = [story_terms(entry) for entry in entries]
+    buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+    for i, entry_terms in enumerate(terms):
+        signature = minhash(entry_terms)
+        for band, start in enumerate(range(0, len(signature), _ROWS_PER_BAND)):
+            bucket = buckets.setdefault((band, signature[start : start + _ROWS_PER_BAND]), [])
+            for j in bucket[-_MAX_BUCKET_COMPARISONS:]:
+                if find(i) != find(j) and jaccard(entry_terms, terms[j]) >= threshold:
+                    parent[find(i)] = find(j)
+            bucket.append(i)
+
+    groups: Dict[int, List[FeedEntry]] = {}
+    for i, entry in enumerate(entries):
+        groups.setdefault(find(i), []).append(entry)
+
+    clusters = []
+    for members in groups.values():
+        representative = max(members, key=lambda entry: len(entry.summary))
+        representative.related_links = tuple(
+            entry.link for entry in members if entry is not representative and entry.link
+        )
+        clusters.append(StoryCluster(representative, members))
+
+    if len(clusters) < len(entries):
+        logger.info("Collapsed %s entries into %s story clusters", len(entries), len(clusters))
+    return clusters
+
+
+__all__ = ["StoryCluster", "cluster_stories", "jaccard", "minhash", "story_terms"]
@@ -0,0 +1,74 @@
+"""Split long model output into messages Telegram accepts.
+
+Text is cut on the coarsest boundary that fits (blank line, line break,
+space, and only then mid-word). A code fence that is still open at a cut is
+closed at the end of the chunk and reopened, with the same language, at the
+start of the next one, so Markdown renders the same on both sides.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import List, Sequence
+
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+_FENCE_RE = re.compile(r"^```(\S*)", re.MULTILINE)
+_SEPARATORS = ("\n\n", "\n", " ")
+
+
+def _pieces(text: str, limit: int, separators: Sequence[str] = _SEPARATORS) -> List[str]:
+    if len(text) <= limit:
+        return [text]
+    if not separators:
+        return [text[i : i + limit] for i in range(0, len(text), limit)]
+
+    separator, finer = separators[0], separators[1:]
+    parts = text.split(separator)
+    pieces = []
+    for i, part in enumerate(parts):
+        if i < len(parts) - 1:
+            part += separator
+        pieces.extend(_pieces(part, limit, finer))
+    return pieces
+
+
+def _fence_after(chunk: str, fence: str | None) -> str | None:
+    """Language of the fence left open after ``chunk`` (None when all are closed)."""
+
+    for match in _FENCE_RE.finditer(chunk):
+        fence = None if fence is not None else match.group(1)
+    return fence
+
+
+def split_message(text: str, limit: int = TELEGRAM_MESSAGE_LIMIT) -> List[str]:
+    if len(text) <= limit:
+        return [text]
+
+    # Leave room for closing and reopening the longest fence in the text.
+    reserve = max((len(match.group(1)) for match in _FENCE_RE.finditer(text)), default=0) + 8
+    budget = max(1, limit - reserve)
+
+    bodies = []
+    current = ""
+    for piece in _pieces(text, budget):
+        if current and len(current) + len(piece) > budget:
+            bodies.append(current)
+            current = ""
+        current += piece
+    if current:
+        bodies.append(current)
+
+    chunks = []
+    fence = None
+    for body in bodies:
+        prefix = f"```{fence}\n" if fence is not None else ""
+        fence = _fence_after(body, fence)
+        body = body.rstrip()
+        suffix = "\n```" if fence is not None else ""
+        if body:
+            chunks.append(prefix + body + suffix)
+    return chunks
+
+
+__all__ = ["TELEGRAM_MESSAGE_LIMIT", "split_message"]
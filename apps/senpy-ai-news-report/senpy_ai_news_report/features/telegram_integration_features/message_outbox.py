@@ -0,0 +1,293 @@
+"""Outbound Telegram delivery: callers enqueue, per-channel workers deliver.
+
+A message is split into Telegram-sized chunks and fanned out to every
+target channel. Chunks are first written to the durable outbox
+(``outbox_store``) and then sent by one worker per channel in insertion
+order, so messages to one channel keep their order while different
+channels are delivered concurrently, at most TELEGRAM_MAX_CONCURRENT_SENDS
+at a time. Sends pass a per-channel and a global token bucket. A
+``FloodWaitError`` pauses the channel for the requested time and the same
+message is retried. Other errors are retried with backoff up to
+TELEGRAM_SEND_MAX_ATTEMPTS. Messages with a ``schedule_at`` time stay in
+the outbox until then and are sent like any other message; Telegram does
+not let bot sessions schedule messages server-side. Delivery is
+at-least-once: a message sent just before a crash, but not yet marked, is
+sent again on the next start.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import suppress
+from typing import Dict, List
+
+from telethon import errors
+
+from senpy_ai_news_report.features.ai.rate_limiter import TokenBucket, backoff_delay
+from senpy_ai_news_report.utils.env import env_bool, env_float, env_int
+from .message_chunking import split_message
+from .outbox_store import MESSAGE_PENDING, OutboxMessage, get_outbox_store, idempotency_key
+from .send_channel_message import resolve_channel, resolve_channels, send_message_to_channel
+
+logger = logging.getLogger(__name__)
+
+# Errors that no retry can fix; the message fails right away instead of using up its attempts.
+_PERMANENT_ERRORS = (
+    errors.ChannelInvalidError,
+    errors.ChannelPrivateError,
+    errors.ChatAdminRequiredError,
+    errors.ChatWriteForbiddenError,
+    errors.MessageTooLongError,
+    errors.PeerIdInvalidError,
+    errors.ScheduleBotNotAllowedError,
+)
+
+_workers: Dict[int, "_ChannelWorker"] = {}
+_global_bucket: TokenBucket | None = None
+_send_semaphore: asyncio.Semaphore | None = None
+
+
+def _get_global_bucket() -> TokenBucket:
+    global _global_bucket
+    if _global_bucket is None:
+        _global_bucket = TokenBucket(env_float("TELEGRAM_GLOBAL_MESSAGES_PER_MINUTE", 1800))
+    return _global_bucket
+
+
+def _get_send_semaphore() -> asyncio.Semaphore:
+    global _send_semaphore
+    if _send_semaphore is None:
+        _send_semaphore = asyncio.Semaphore(env_int("TELEGRAM_MAX_CONCURRENT_SENDS", 4))
+    return _send_semaphore
+
+
+class _ChannelWorker:
+    def __init__(self, channel: int):
+        self.channel = channel
+        self.bucket = TokenBucket(env_float("TELEGRAM_CHANNEL_MESSAGES_PER_MINUTE", 20))
+        self.paused_until = 0.0
+        self.wake = asyncio.Event()
+        self.idle = asyncio.Event()
+        self.task = asyncio.get_running_loop().create_task(self._run())
+
+    def notify(self) -> None:
+        self.idle.clear()
+        self.wake.set()
+
+    async def _wait_for_slot(self) -> None:
+        global_bucket = _get_global_bucket()
+        while True:
+            delay = max(
+                self.paused_until - time.monotonic(),
+                self.bucket.delay_for(1),
+                global_bucket.delay_for(1),
+            )
+            if delay <= 0:
+                self.bucket.consume(1)
+                global_bucket.consume(1)
+                return
+            await asyncio.sleep(delay)
+
+    async def _deliver(self, item: OutboxMessage) -> None:
+        store = get_outbox_store()
+        max_attempts = env_int("TELEGRAM_SEND_MAX_ATTEMPTS", 5)
+        attempts = item.attempts
+        while True:
+            await self._wait_for_slot()
+            try:
+                async with _get_send_semaphore():
+                    await send_message_to_channel(item.message, self.channel)
+                store.mark_sent(item.key)
+                return
+            except errors.FloodWaitError as exc:
+                # Telethon sleeps through short waits itself; longer ones land here.
+                logger.warning("Flood wait of %ss for channel %s", exc.seconds, self.channel)
+                self.paused_until = time.monotonic() + exc.seconds
+            except _PERMANENT_ERRORS as exc:
+                logger.error("Dropping message %s for channel %s: %s", item.key, self.channel, exc)
+                store.mark_failed(item.key, attempts + 1, str(exc))
+                return
+            except Exception as exc:
+                attempts += 1
+                if attempts >= max_attempts:
+                    logger.error("Dropping message %s for channel %s: %s", item.key, self.channel, exc)
+                    store.mark_failed(item.key, attempts, str(exc))
+                    return
+                store.record_attempt(item.key, attempts, str(exc))
+                delay = backoff_delay(attempts)
+                logger.warning(
+                    "Sending to channel %s failed (attempt %s/%s), retrying in %.1fs: %s",
+                    self.channel,
+                    attempts,
+                    max_attempts,
+                    delay,
+                    exc,
+                )
+                # Pausing the whole channel keeps later messages behind this one.
+                self.paused_until = time.monotonic() + delay
+
+    async def _run(self) -> None:
+        store = get_outbox_store()
+        while True:
+            self.wake.clear()
+            item = store.next_pending(self.channel)
+            if item is None:
+                # Idle means nothing is due; held messages wake the worker when their time comes.
+                self.idle.set()
+                held_until = store.next_scheduled_at(self.channel)
+                timeout = None if held_until is None else max(0.0, held_until - time.time())
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self.wake.wait(), timeout)
+                continue
+            self.idle.clear()
+            await self._deliver(item)
+
+
+def _ensure_worker(channel: int) -> "_ChannelWorker":
+    worker = _workers.get(channel)
+    if worker is None or worker.task.done():
+        worker = _workers[channel] = _ChannelWorker(channel)
+    return worker
+
+
+def enqueue_message(
+    message: str, telegram_channel_id: int | None, schedule_at: float | None = None
+) -> List[str]:
+    """Store a message, split into chunks, in the outbox and wake the channel's worker.
+
+    Returns the idempotency keys of the chunks. Chunks already delivered to
+    the same channel are not queued again.
+    """
+
+    channel = resolve_channel(telegram_channel_id)
+    if not channel or not message:
+        raise Exception("Channel and message are required")
+
+    store = get_outbox_store()
+    chunks = split_message(message)
+    keys = []
+    queued = 0
+    for index, chunk in enumerate(chunks):
+        # Number the chunks so identical parts of one message keep distinct keys.
+        key = None if len(chunks) == 1 else idempotency_key(channel, f"{index}/{len(chunks)}\n{chunk}")
+        key, added = store.add(channel, chunk, key, schedule_at)
+        keys.append(key)
+        queued += added
+    if queued:
+        _ensure_worker(channel).notify()
+    if queued < len(chunks):
+        logger.info(
+            "%s of %s chunks for channel %s were already in the outbox, skipping them",
+            len(chunks) - queued,
+            len(chunks),
+            channel,
+        )
+    return keys
+
+
+def fan_out_message(
+    message: str, telegram_channel_id: int | None = None, schedule_at: float | None = None
+) -> Dict[int, List[str]]:
+    """Queue one message for every target channel (see ``resolve_channels``).
+
+    Returns the chunk keys per channel, to be looked up in the outbox.
+    """
+
+    results = {}
+    for channel in resolve_channels(telegram_channel_id):
+        try:
+            results[channel] = enqueue_message(message, channel, schedule_at)
+        except Exception as exc:
+            logger.error("Could not queue message for channel %s: %s", channel, exc)
+            results[channel] = []
+    return results
+
+
+def _resume_pending_channels() -> List[int]:
+    channels = get_outbox_store().pending_channels()
+    for channel in channels:
+        _ensure_worker(channel).notify()
+    return channels
+
+
+def start_telegram_outbox() -> None:
+    """Start workers for channels with messages left over from a previous run.
+
+    Held messages whose time passed while nothing was running go out now.
+    """
+
+    if env_bool("FEEDS_SCHEDULE_POSTS", False):
+        logger.warning(
+            "FEEDS_SCHEDULE_POSTS is on, but bot sessions cannot schedule Telegram messages: "
+            "scheduled posts are held in the outbox and only go out while a process with the "
+            "outbox running (the API server, the cron scheduler or a cron script waiting for "
+            "them) is up at their slot"
+        )
+    channels = _resume_pending_channels()
+    if channels:
+        logger.info("Resuming Telegram outbox delivery for %s channels", len(channels))
+
+
+def pending_messages() -> int:
+    return get_outbox_store().counts().get(MESSAGE_PENDING, 0)
+
+
+async def drain_telegram_outbox(include_scheduled: bool = False) -> None:
+    """Deliver every pending message, including leftovers (for one-shot scripts).
+
+    Held messages are left in the outbox unless ``include_scheduled`` is set;
+    then this also waits for each of them to come due and go out, so a
+    script that queued scheduled posts stays up until the last one is sent.
+    """
+
+    start_telegram_outbox()
+    store = get_outbox_store()
+    while True:
+        await asyncio.gather(*(worker.idle.wait() for worker in list(_workers.values())))
+        held_until = store.next_scheduled_at(None) if include_scheduled else None
+        if held_until is None:
+            return
+        logger.info(
+            "Waiting %.0fs for the next held Telegram message", max(0.0, held_until - time.time())
+        )
+        await asyncio.sleep(max(0.0, held_until - time.time()))
+        # Mark the workers busy again before waiting for them to go idle.
+        _resume_pending_channels()
+
+
+async def stop_telegram_outbox(timeout: float | None = None) -> None:
+    """Give pending messages up to ``timeout`` seconds to go out, then stop the workers.
+
+    Anything still pending stays in the outbox for the next start.
+    """
+
+    global _send_semaphore
+    if timeout is None:
+        timeout = env_float("TELEGRAM_OUTBOX_DRAIN_SECONDS", 30.0)
+    with suppress(asyncio.TimeoutError):
+        await asyncio.wait_for(
+            asyncio.gather(*(worker.idle.wait() for worker in list(_workers.values()))),
+            timeout=timeout,
+        )
+
+    left = pending_messages()
+    if left:
+        logger.warning("Stopping Telegram outbox with %s messages still pending", left)
+    for worker in _workers.values():
+        worker.task.cancel()
+        with suppress(asyncio.CancelledError):
+            await worker.task
+    _workers.clear()
+    _send_semaphore = None
+
+
+__all__ = [
+    "enqueue_message",
+    "fan_out_message",
+    "start_telegram_outbox",
+    "pending_messages",
+    "drain_telegram_outbox",
+    "stop_telegram_outbox",
+]
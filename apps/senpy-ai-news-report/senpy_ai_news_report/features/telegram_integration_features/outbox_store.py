@@ -0,0 +1,204 @@
+"""Durable table of outbound Telegram messages.
+
+Every message is written here before it is sent, keyed by a hash of target
+channel and content. Enqueuing the same message again is a no-op unless the
+earlier copy failed for good, so re-running a job never posts twice, and
+rows still pending after a crash are delivered on the next start.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List
+
+from senpy_ai_news_report.utils.storage import connect_sqlite
+
+MESSAGE_PENDING = "pending"
+MESSAGE_SENT = "sent"
+MESSAGE_FAILED = "failed"
+
+
+def idempotency_key(channel: int, message: str) -> str:
+    return hashlib.sha256(f"{channel}\n{message}".encode("utf-8")).hexdigest()
+
+
+@dataclass
+class OutboxMessage:
+    seq: int
+    key: str
+    channel: int
+    message: str
+    status: str
+    attempts: int
+    created_at: float
+    updated_at: float
+    sent_at: float | None = None
+    error: str | None = None
+    schedule_at: float | None = None
+
+
+class OutboxStore:
+    def __init__(self, filename: str = "telegram_outbox.sqlite3"):
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(filename)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS telegram_outbox (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                key TEXT NOT NULL UNIQUE,
+                channel INTEGER NOT NULL,
+                message TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                sent_at REAL,
+                error TEXT,
+                schedule_at REAL
+            )
+            """
+        )
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(telegram_outbox)")}
+        if "schedule_at" not in columns:
+            self._conn.execute("ALTER TABLE telegram_outbox ADD COLUMN schedule_at REAL")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS telegram_outbox_pending ON telegram_outbox (status, channel, seq)"
+        )
+        self._conn.commit()
+
+    def add(
+        self,
+        channel: int,
+        message: str,
+        key: str | None = None,
+        schedule_at: float | None = None,
+    ) -> tuple[str, bool]:
+        """Store a message as pending. Returns its key and whether anything changed.
+
+        ``schedule_at`` (epoch seconds) holds the message back until then.
+        """
+
+        key = key or idempotency_key(channel, message)
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                INSERT INTO telegram_outbox
+                    (key, channel, message, status, created_at, updated_at, schedule_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    status = excluded.status, attempts = 0, error = NULL,
+                    updated_at = excluded.updated_at, schedule_at = excluded.schedule_at
+                WHERE telegram_outbox.status = ?
+                """,
+                (key, channel, message, MESSAGE_PENDING, now, now, schedule_at, MESSAGE_FAILED),
+            )
+            self._conn.commit()
+        return key, cursor.rowcount > 0
+
+    def next_pending(self, channel: int, now: float | None = None) -> OutboxMessage | None:
+        """Oldest pending message of a channel that is due; held messages are skipped."""
+
+        now = time.time() if now is None else now
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT * FROM telegram_outbox
+                WHERE status = ? AND channel = ? AND (schedule_at IS NULL OR schedule_at <= ?)
+                ORDER BY seq LIMIT 1
+                """,
+                (MESSAGE_PENDING, channel, now),
+            ).fetchone()
+        return OutboxMessage(**dict(row)) if row else None
+
+    def next_scheduled_at(self, channel: int | None, now: float | None = None) -> float | None:
+        """When the next held message of a channel (any channel for None) becomes due.
+
+        None if there is no held message.
+        """
+
+        now = time.time() if now is None else now
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT MIN(schedule_at) FROM telegram_outbox
+                WHERE status = ? AND (? IS NULL OR channel = ?) AND schedule_at > ?
+                """,
+                (MESSAGE_PENDING, channel, channel, now),
+            ).fetchone()
+        return row[0]
+
+    def pending_channels(self) -> List[int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT channel FROM telegram_outbox WHERE status = ?", (MESSAGE_PENDING,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def _update(self, key: str, **values) -> None:
+        values["updated_at"] = time.time()
+        assignments = ", ".join(f"{column} = ?" for column in values)
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE telegram_outbox SET {assignments} WHERE key = ?", [*values.values(), key]
+            )
+            self._conn.commit()
+
+    def mark_sent(self, key: str) -> None:
+        self._update(key, status=MESSAGE_SENT, sent_at=time.time(), error=None)
+
+    def record_attempt(self, key: str, attempts: int, error: str) -> None:
+        self._update(key, attempts=attempts, error=error)
+
+    def mark_failed(self, key: str, attempts: int, error: str) -> None:
+        self._update(key, status=MESSAGE_FAILED, attempts=attempts, error=error)
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM telegram_outbox GROUP BY status"
+            ).fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def channel_counts(self) -> Dict[int, Dict[str, int]]:
+        """Per-channel delivery results: message count by status for every channel."""
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT channel, status, COUNT(*) FROM telegram_outbox GROUP BY channel, status"
+            ).fetchall()
+        counts: Dict[int, Dict[str, int]] = {}
+        for channel, status, count in rows:
+            counts.setdefault(channel, {})[status] = count
+        return counts
+
+    def recent(self, limit: int = 50) -> List[OutboxMessage]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM telegram_outbox ORDER BY seq DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [OutboxMessage(**dict(row)) for row in rows]
+
+
+_outbox_store: OutboxStore | None = None
+
+
+def get_outbox_store() -> OutboxStore:
+    global _outbox_store
+    if _outbox_store is None:
+        _outbox_store = OutboxStore()
+    return _outbox_store
+
+
+__all__ = [
+    "OutboxMessage",
+    "OutboxStore",
+    "get_outbox_store",
+    "idempotency_key",
+    "MESSAGE_PENDING",
+    "MESSAGE_SENT",
+    "MESSAGE_FAILED",
+]
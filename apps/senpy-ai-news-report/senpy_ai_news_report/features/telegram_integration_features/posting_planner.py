@@ -0,0 +1,84 @@
+"""Spread a run's posts over a daily posting window.
+
+All posts of a run are queued at once, each with the time of its slot, and
+the outbox holds them back until then. Telegram's server-side scheduling is
+not available to bot sessions, so a process running the outbox has to be up
+when a slot comes; posts whose slot passed while it was down go out on the
+next start. The window is TELEGRAM_POSTING_WINDOW ("HH:MM-HH:MM") in
+CRON_TIMEZONE. Posts go into the current window if enough of it is left,
+otherwise into the next day's.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from datetime import datetime, time as day_time, timedelta
+from typing import Any, Dict, List, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+from senpy_ai_news_report.utils.env import env_float
+from .message_outbox import fan_out_message
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POSTING_WINDOW = "09:00-21:00"
+
+
+def _parse_clock(value: str) -> day_time:
+    hours, minutes = value.strip().split(":")
+    return day_time(int(hours), int(minutes))
+
+
+def posting_window() -> Tuple[day_time, day_time]:
+    raw = os.getenv("TELEGRAM_POSTING_WINDOW") or DEFAULT_POSTING_WINDOW
+    try:
+        start, end = (_parse_clock(part) for part in raw.split("-"))
+    except ValueError:
+        logger.warning("Invalid TELEGRAM_POSTING_WINDOW '%s', using '%s'", raw, DEFAULT_POSTING_WINDOW)
+        start, end = (_parse_clock(part) for part in DEFAULT_POSTING_WINDOW.split("-"))
+    return start, end
+
+
+def plan_slots(count: int, now: datetime | None = None) -> List[datetime]:
+    """Evenly spaced publish times for ``count`` posts inside the next usable window."""
+
+    if count <= 0:
+        return []
+    timezone = ZoneInfo(os.getenv("CRON_TIMEZONE", "UTC"))
+    now = (now or datetime.now(timezone)).astimezone(timezone)
+    # Leave the run time to queue everything before the first slot.
+    earliest = now + timedelta(minutes=env_float("TELEGRAM_SCHEDULE_LEAD_MINUTES", 5.0))
+    min_gap = timedelta(minutes=env_float("TELEGRAM_MIN_POST_GAP_MINUTES", 10.0))
+
+    start_clock, end_clock = posting_window()
+    for day in range(2):
+        date = now.date() + timedelta(days=day)
+        start = datetime.combine(date, start_clock, timezone)
+        end = datetime.combine(date, end_clock, timezone)
+        if end <= start:
+            # Windows such as 22:00-02:00 run past midnight.
+            end += timedelta(days=1)
+        start = max(start, earliest)
+        if end - start >= min_gap * (count - 1):
+            break
+
+    step = (end - start) / count
+    return [start + step * i + step / 2 for i in range(count)]
+
+
+def schedule_posts(
+    messages: Sequence[str], telegram_channel_id: int | None = None, now: datetime | None = None
+) -> List[Dict[str, Any]]:
+    """Queue every message for its slot in one pass and return the plan."""
+
+    plan = []
+    for message, slot in zip(messages, plan_slots(len(messages), now)):
+        keys = fan_out_message(message, telegram_channel_id, schedule_at=slot.timestamp())
+        plan.append({"at": slot.isoformat(), "keys": keys})
+    if plan:
+        logger.info("Scheduled %s posts between %s and %s", len(plan), plan[0]["at"], plan[-1]["at"])
+    return plan
+
+
+__all__ = ["plan_slots", "posting_window", "schedule_posts"]
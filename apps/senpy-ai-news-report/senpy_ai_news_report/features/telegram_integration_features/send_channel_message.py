@@ -1,4 +1,5 @@
 import os
+from typing import List
 
 from dotenv import load_dotenv
 from .telegram_client import get_client
@@ -6,9 +7,24 @@ from .telegram_client import get_client
 load_dotenv()
 
 
+def resolve_channel(telegram_channel_id: int | None) -> int:
+    return telegram_channel_id or int(os.getenv("TELEGRAM_CHANNEL_ID") or "-1")
+
+
+def resolve_channels(telegram_channel_id: int | None) -> List[int]:
+    """The given channel, else TELEGRAM_CHANNEL_IDS (comma separated), else TELEGRAM_CHANNEL_ID."""
+
+    if telegram_channel_id:
+        return [telegram_channel_id]
+    raw = os.getenv("TELEGRAM_CHANNEL_IDS")
+    if raw and raw.strip():
+        return [int(channel) for channel in raw.split(",") if channel.strip()]
+    return [resolve_channel(None)]
+
+
 async def send_message_to_channel(message: str, telegram_channel_id: int | None):
     # Start the client
-    channel = telegram_channel_id or int(os.getenv("TELEGRAM_CHANNEL_ID") or "-1")
+    channel = resolve_channel(telegram_channel_id)
 
     if not channel or not message:
         raise Exception("Channel and message are required")
@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import time
+from typing import AsyncIterator
+
+from telethon import errors
+
+from senpy_ai_news_report.utils.env import env_float, env_int
+from .message_chunking import TELEGRAM_MESSAGE_LIMIT, split_message
+from .message_outbox import enqueue_message
+from .send_channel_message import resolve_channels
+from .telegram_client import get_client
+
+logger = logging.getLogger(__name__)
+
+
+async def _final_edit(client, channel: int, message, text: str) -> None:
+    """Edit the streamed message to its final text, waiting out flood waits."""
+
+    max_attempts = env_int("TELEGRAM_SEND_MAX_ATTEMPTS", 5)
+    for attempt in range(1, max_attempts + 1):
+        try:
+            await client.edit_message(channel, message, text)
+            return
+        except errors.MessageNotModifiedError:
+            return
+        except errors.FloodWaitError as exc:
+            if attempt == max_attempts:
+                raise
+            logger.warning("Flood wait of %ss before the final edit in %s", exc.seconds, channel)
+            await asyncio.sleep(exc.seconds)
+
+
+async def stream_message_to_channel(
+    chunks: AsyncIterator[str],
+    telegram_channel_id: int | None,
+    min_chars: int | None = None,
+    edit_interval: float | None = None,
+) -> str:
+    """
+    Post a message while it is still being generated.
+
+    The first message is sent once ``min_chars`` (TELEGRAM_STREAM_MIN_CHARS)
+    characters have arrived and then edited at most every ``edit_interval``
+    seconds (TELEGRAM_STREAM_EDIT_INTERVAL) until the stream ends. Text past
+    Telegram's message limit is re-split on Markdown-safe boundaries and
+    queued in the outbox as follow-up messages at the end. If no message
+    could be sent while streaming (e.g. during a flood wait), the whole text
+    goes through the outbox, which rate-limits and retries it.
+
+    Only the first target channel (see ``resolve_channels``) sees the message
+    grow. The other channels in TELEGRAM_CHANNEL_IDS get the final text
+    through the outbox once the stream ends.
+
+    Returns the full text.
+    """
+    if min_chars is None:
+        min_chars = env_int("TELEGRAM_STREAM_MIN_CHARS", 200)
+    if edit_interval is None:
+        edit_interval = env_float("TELEGRAM_STREAM_EDIT_INTERVAL", 3.0)
+
+    channel, *other_channels = resolve_channels(telegram_channel_id)
+    client = await get_client()
+
+    text = ""
+    message = None
+    shown = ""
+    last_edit = 0.0
+
+    async def show(visible: str) -> None:
+        nonlocal message, shown, last_edit
+        try:
+            if message is None:
+                message = await client.send_message(channel, visible)
+            else:
+                await client.edit_message(channel, message, visible)
+            shown = visible
+        except errors.FloodWaitError as exc:
+            # Skip this update; the next one (or the final edit) catches up.
+            logger.warning("Flood wait of %ss while streaming to %s", exc.seconds, channel)
+            last_edit = time.monotonic() + exc.seconds
+            return
+        except errors.MessageNotModifiedError:
+            # Telegram trims whitespace, so the text already matches what is shown.
+            shown = visible
+        except errors.RPCError as exc:
+            if message is None:
+                raise
+            # An intermediate edit is cosmetic; the final edit carries the full text.
+            logger.warning("Could not update streamed message in %s: %s", channel, exc)
+        last_edit = time.monotonic()
+
+    async for delta in chunks:
+        text += delta
+        visible = text[:TELEGRAM_MESSAGE_LIMIT]
+        if visible.strip() == shown.strip():
+            continue
+        if message is None:
+            # last_edit lies in the future while a flood wait is running.
+            if len(text) >= min_chars and time.monotonic() >= last_edit:
+                await show(visible)
+        elif time.monotonic() - last_edit >= edit_interval:
+            await show(visible)
+
+    if not text:
+        raise Exception("Channel and message are required")
+
+    first, *rest = split_message(text)
+    if message is None:
+        enqueue_message(text, channel)
+    else:
+        if first.strip() != shown.strip():
+            await _final_edit(client, channel, message, first)
+        for chunk in rest:
+            enqueue_message(chunk, channel)
+
+    for other in other_channels:
+        try:
+            enqueue_message(text, other)
+        except Exception as exc:
+            logger.error("Could not queue streamed message for channel %s: %s", other, exc)
+
+    return text
@@ -1,24 +1,112 @@
+"""Process-lifetime Telegram bot client.
+
+One client is connected and authorized per process and shared by every
+sender. The session is stored in DATA_DIR, so a restart reuses the existing
+authorization instead of signing in again. Telethon reconnects on its own
+after a dropped connection, and ``get_client`` reconnects if that gave up.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
 import os
-from telethon import TelegramClient
-from telethon.sessions import MemorySession
+
 from dotenv import load_dotenv
+from telethon import TelegramClient
+
+from senpy_ai_news_report.utils.env import env_int
+from senpy_ai_news_report.utils.storage import data_path
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 api_id = os.getenv("TELEGRAM_API_ID")
 api_hash = os.getenv("TELEGRAM_API_HASH")
 bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
 
+_client_lock: asyncio.Lock | None = None
+_client: TelegramClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+
 
-async def get_client():
+def _lock() -> asyncio.Lock:
+    global _client_lock
+    if _client_lock is None:
+        _client_lock = asyncio.Lock()
+    return _client_lock
+
+
+def _build_client() -> TelegramClient:
     if not api_hash or not api_id or not bot_token:
         raise Exception(
             "TELEGRAM_API_ID, TELEGRAM_API_HASH, and TELEGRAM_BOT_TOKEN must be set in the environment"
         )
 
-    # TODO: think if I need a once-per-application-lifetime session and nbot everytime created session when I turn to client
-    client = TelegramClient(MemorySession(), int(api_id), api_hash)
-    await client.connect()
+    # Telethon appends ".session" and keeps the auth key there between restarts.
+    session = data_path("telegram", os.getenv("TELEGRAM_SESSION_NAME") or "senpy_bot")
+    return TelegramClient(
+        str(session),
+        int(api_id),
+        api_hash,
+        connection_retries=env_int("TELEGRAM_CONNECTION_RETRIES", 5),
+        retry_delay=env_int("TELEGRAM_RETRY_DELAY", 1),
+        auto_reconnect=True,
+    )
+
 
-    await client.sign_in(bot_token=bot_token)
+def _release_stale_client(client: TelegramClient, loop: asyncio.AbstractEventLoop | None) -> None:
+    """Let go of a client bound to another event loop without leaking its connection or session."""
+
+    if loop is not None and loop.is_running() and not loop.is_closed():
+        # The other loop still runs (in another thread); disconnect on it.
+        asyncio.run_coroutine_threadsafe(client.disconnect(), loop)
+        return
+    # Its loop is gone, so the connection died with it; close the session file it holds.
+    try:
+        client.session.close()
+    except Exception as exc:
+        logger.warning("Could not close the stale Telegram session: %s", exc)
+
+
+async def start_telegram_client() -> TelegramClient:
+    """Connect and authorize the shared client if it is not connected yet."""
+
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    async with _lock():
+        if _client is not None and _client_loop is not loop:
+            # A client is bound to the loop it was created on (e.g. repeated asyncio.run).
+            _release_stale_client(_client, _client_loop)
+            _client = None
+        if _client is None:
+            _client = _build_client()
+            _client_loop = loop
+        if not _client.is_connected():
+            # start() only signs in when the stored session is not authorized yet.
+            await _client.start(bot_token=bot_token)
+            logger.info("Telegram client connected")
+        return _client
+
+
+async def get_client() -> TelegramClient:
+    """Return the shared client, connecting lazily for standalone scripts."""
+
+    client = _client
+    if client is None or _client_loop is not asyncio.get_running_loop() or not client.is_connected():
+        client = await start_telegram_client()
     return client
+
+
+async def stop_telegram_client() -> None:
+    global _client, _client_loop
+    async with _lock():
+        if _client is not None and _client.is_connected():
+            await _client.disconnect()
+            logger.info("Telegram client disconnected")
+        _client = None
+        _client_loop = None
+
+
+__all__ = ["get_client", "start_telegram_client", "stop_telegram_client"]
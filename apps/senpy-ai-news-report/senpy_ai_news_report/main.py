@@ -8,8 +8,22 @@ from fastapi import FastAPI
 from dotenv import load_dotenv
 
 from crons.scheduler import ensure_scheduler_started, shutdown_scheduler
+from senpy_ai_news_report.features.ai.batch_poller import start_batch_poller, stop_batch_poller
 from senpy_ai_news_report.features.cron.router import router as cron_router
 from senpy_ai_news_report.features.news.router import router as news_router
+from senpy_ai_news_report.features.news.rss.parse_executor import (
+    shutdown_parse_executor,
+    start_parse_executor,
+)
+from senpy_ai_news_report.features.telegram_integration_features.message_outbox import (
+    start_telegram_outbox,
+    stop_telegram_outbox,
+)
+from senpy_ai_news_report.features.telegram_integration_features.telegram_client import (
+    start_telegram_client,
+    stop_telegram_client,
+)
+from senpy_ai_news_report.utils.http_client import close_http_client, start_http_client
 
 load_dotenv()
 
@@ -21,6 +35,15 @@ if os.getenv("DEBUG") is not None:
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
+    await start_http_client()
+    start_parse_executor()
+    start_batch_poller()
+    try:
+        await start_telegram_client()
+    except Exception as exc:  # pragma: no cover - defensive logging
+        # Senders connect lazily, so a Telegram outage must not block startup.
+        logger.exception("Failed to connect Telegram client: %s", exc)
+    start_telegram_outbox()
     try:
         await ensure_scheduler_started()
         logger.info("Cron scheduler started")
@@ -30,6 +53,11 @@ async def lifespan(_: FastAPI):
         yield
     finally:
         await shutdown_scheduler(wait=True)
+        await stop_batch_poller()
+        await stop_telegram_outbox()
+        await stop_telegram_client()
+        await close_http_client()
+        shutdown_parse_executor()
 
 
 app = FastAPI(
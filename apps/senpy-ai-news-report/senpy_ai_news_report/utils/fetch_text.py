@@ -1,16 +1,16 @@
-import aiohttp
+from senpy_ai_news_report.utils.http_client import get_http_session, read_text_limited
 
 
-async def fetch_text(url: str):
+async def fetch_text(url: str, headers: dict | None = None):
     """
-    Fetch raw text from a URL using aiohttp.
-    Raises if the request fails or non-OK status.
+    Fetch raw text from a URL using the shared aiohttp session.
+    Raises if the request fails, non-OK status or the body exceeds the size cap.
     """
 
     if not url:
         raise ValueError("URL is required")
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as response:
-            response.raise_for_status()
-            return await response.text()
+    session = await get_http_session()
+    async with session.get(url, headers=headers) as response:
+        response.raise_for_status()
+        return await read_text_limited(response)
@@ -0,0 +1,128 @@
+"""Application-lifetime pooled aiohttp session shared by all outbound fetches."""
+
+from __future__ import annotations
+
+import asyncio
+import codecs
+import logging
+
+import aiohttp
+
+from senpy_ai_news_report.utils.env import env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = "senpy-ai-news-report/0.1 (+https://github.com/parabolabam/RAG)"
+
+_session_lock = asyncio.Lock()
+_session: aiohttp.ClientSession | None = None
+
+
+class ResponseTooLargeError(ValueError):
+    """Raised when a response body exceeds the configured size cap."""
+
+
+def max_response_bytes() -> int:
+    return env_int("HTTP_MAX_RESPONSE_BYTES", 10 * 1024 * 1024)
+
+
+def _build_session() -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=env_int("HTTP_POOL_LIMIT", 100),
+        limit_per_host=env_int("HTTP_POOL_LIMIT_PER_HOST", 8),
+        ttl_dns_cache=env_int("HTTP_DNS_CACHE_TTL", 300),
+        keepalive_timeout=env_float("HTTP_KEEPALIVE_TIMEOUT", 30.0),
+        enable_cleanup_closed=True,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=env_float("HTTP_TIMEOUT_TOTAL", 30.0),
+        connect=env_float("HTTP_TIMEOUT_CONNECT", 10.0),
+        sock_read=env_float("HTTP_TIMEOUT_READ", 20.0),
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        headers={"User-Agent": DEFAULT_USER_AGENT},
+        raise_for_status=False,
+    )
+
+
+async def start_http_client() -> aiohttp.ClientSession:
+    """Create the shared session if it does not exist yet."""
+
+    async with _session_lock:
+        global _session
+        if _session is None or _session.closed:
+            _session = _build_session()
+            logger.info("HTTP client session started")
+        return _session
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """Return the shared session, starting it lazily for standalone scripts."""
+
+    session = _session
+    if session is None or session.closed:
+        session = await start_http_client()
+    return session
+
+
+async def close_http_client() -> None:
+    async with _session_lock:
+        global _session
+        if _session is not None and not _session.closed:
+            await _session.close()
+            logger.info("HTTP client session closed")
+        _session = None
+
+
+async def read_limited(response: aiohttp.ClientResponse, max_bytes: int | None = None) -> bytes:
+    """Read a response body, refusing anything larger than ``max_bytes``."""
+
+    limit = max_bytes or max_response_bytes()
+    if response.content_length is not None and response.content_length > limit:
+        raise ResponseTooLargeError(
+            f"{response.url} declares {response.content_length} bytes (limit {limit})"
+        )
+
+    chunks = []
+    received = 0
+    async for chunk in response.content.iter_chunked(64 * 1024):
+        received += len(chunk)
+        if received > limit:
+            raise ResponseTooLargeError(f"{response.url} exceeded {limit} bytes")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def response_charset(response: aiohttp.ClientResponse, default: str = "utf-8") -> str:
+    """Charset from the Content-Type header, else ``default``.
+
+    ``response.get_encoding()`` cannot be used after ``read_limited``: without
+    a charset it sniffs ``response._body``, which streaming never fills.
+    """
+
+    charset = response.charset
+    if charset:
+        try:
+            return codecs.lookup(charset).name
+        except LookupError:
+            logger.debug("Unknown charset %r from %s, using %s", charset, response.url, default)
+    return default
+
+
+async def read_text_limited(response: aiohttp.ClientResponse, max_bytes: int | None = None) -> str:
+    body = await read_limited(response, max_bytes)
+    return body.decode(response_charset(response), errors="replace")
+
+
+__all__ = [
+    "ResponseTooLargeError",
+    "start_http_client",
+    "get_http_session",
+    "close_http_client",
+    "read_limited",
+    "read_text_limited",
+    "response_charset",
+    "max_response_bytes",
+]
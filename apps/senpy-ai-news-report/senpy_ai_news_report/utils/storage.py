@@ -0,0 +1,35 @@
+"""Location of the application's persistent state (caches, stores, sessions)."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from pathlib import Path
+
+DEFAULT_DATA_DIR = ".data"
+
+
+def data_path(*parts: str) -> Path:
+    """Return a path inside DATA_DIR, creating the directory if needed."""
+
+    base = Path(os.getenv("DATA_DIR") or DEFAULT_DATA_DIR)
+    path = base.joinpath(*parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def connect_sqlite(filename: str) -> sqlite3.Connection:
+    """Open a SQLite database inside DATA_DIR in WAL mode.
+
+    Connections are shared between the event loop and worker threads, callers
+    are expected to keep statements short and serialize writes themselves.
+    """
+
+    conn = sqlite3.connect(data_path(filename), timeout=30, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+__all__ = ["data_path", "connect_sqlite"]
@@ -0,0 +1,33 @@
+"""Cheap local token estimates used to keep prompts inside a budget."""
+
+from __future__ import annotations
+
+import math
+
+# English prose averages roughly four characters per token for OpenAI
+# tokenizers; close enough for budgeting without shipping a tokenizer.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def trim_to_tokens(text: str, max_tokens: int, suffix: str = "…") -> str:
+    """Cut ``text`` on a word boundary so it fits into ``max_tokens``."""
+
+    if max_tokens <= 0:
+        return ""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    cut = text[: max_chars - len(suffix)]
+    space = cut.rfind(" ")
+    if space > max_chars // 2:
+        cut = cut[:space]
+    return cut.rstrip() + suffix
+
+
+__all__ = ["estimate_tokens", "trim_to_tokens", "CHARS_PER_TOKEN"]
@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+# The OpenAI client is created at import time and every store lives under
+# DATA_DIR, so tests get a dummy key and a throwaway data directory.
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="senpy-tests-")
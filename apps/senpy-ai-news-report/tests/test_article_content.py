@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from senpy_ai_news_report.features.news.article_based_post import article_content
+from senpy_ai_news_report.features.news.article_based_post.article_content import (
+    ArticleCache,
+    extract_readable_text,
+    fetch_article,
+    normalize_url,
+)
+
+BODY = "The new release rewrites the scheduler and cuts tail latency in half for busy services."
+
+PAGE = f"""<html><head><title>Site | Release notes</title>
+<meta property="og:title" content="Release 2.0 is out"></head>
+<body>
+<nav><a href="/">Home</a> <a href="/blog">Blog</a></nav>
+<header><p>Subscribe to our newsletter for weekly updates and more news.</p></header>
+<div class="sidebar"><p>Popular posts you might also like to read this week.</p></div>
+<article>
+  <h1>Release 2.0</h1>
+  <p>{BODY}</p>
+  <ul><li><p>Nested paragraphs inside list items are kept only once.</p></li></ul>
+  <div class="share-buttons"><p>Share this on every social network you know of.</p></div>
+  <p>{BODY} It also adds structured logging and a new plugin API.</p>
+  <script>track()</script>
+</article>
+<footer><p>Copyright 2024 Example Corp. All rights reserved worldwide.</p></footer>
+</body></html>"""
+
+
+def test_extract_readable_text_keeps_the_article_and_drops_boilerplate():
+    title, text = extract_readable_text(PAGE)
+
+    assert title == "Release 2.0 is out"
+    assert text.split("\n\n") == [
+        "Release 2.0",
+        BODY,
+        "Nested paragraphs inside list items are kept only once.",
+        f"{BODY} It also adds structured logging and a new plugin API.",
+    ]
+
+
+def test_pages_without_an_article_use_the_densest_text_block():
+    html = f"""<html><head><title>Plain page</title></head><body>
+    <div><p><a href="/a">A link list entry</a></p><p><a href="/b">Another link entry</a></p></div>
+    <div><p>{BODY}</p><p>{BODY}</p></div>
+    </body></html>"""
+
+    title, text = extract_readable_text(html)
+
+    assert title == "Plain page"
+    assert text == f"{BODY}\n\n{BODY}"
+
+
+@pytest.mark.parametrize(
+    "link, expected",
+    [
+        ("HTTPS://Example.COM/Post?id=1#comments", "https://example.com/Post?id=1"),
+        ("https://example.com/post?utm_source=x&id=2&fbclid=y&ref=hn", "https://example.com/post?id=2"),
+        ("  https://example.com/post  ", "https://example.com/post"),
+    ],
+)
+def test_normalize_url_drops_fragments_and_tracking(link, expected):
+    assert normalize_url(link) == expected
+
+
+def test_same_page_under_another_url_is_extracted_once(monkeypatch, tmp_path):
+    cache = ArticleCache(str(tmp_path / "articles.sqlite3"))
+    downloads = []
+    extractions = []
+
+    async def download(url):
+        downloads.append(url)
+        return PAGE
+
+    def extract(html):
+        extractions.append(html)
+        return extract_readable_text(html)
+
+    monkeypatch.setattr(article_content, "get_article_cache", lambda: cache)
+    monkeypatch.setattr(article_content, "_download", download)
+    monkeypatch.setattr(article_content, "extract_readable_text", extract)
+
+    async def run():
+        first = await fetch_article("https://example.com/post?utm_source=feed")
+        again = await fetch_article("https://example.com/post#top")
+        mirror = await fetch_article("https://mirror.example.org/post")
+        return first, again, mirror
+
+    first, again, mirror = asyncio.run(run())
+
+    # The second link normalizes to the first and is served from the URL cache
+    assert downloads == ["https://example.com/post?utm_source=feed", "https://mirror.example.org/post"]
+    assert len(extractions) == 1
+    assert first.text == again.text == mirror.text
+    assert first.content_hash == mirror.content_hash
+    assert mirror.url == "https://mirror.example.org/post"
@@ -0,0 +1,154 @@
+import asyncio
+
+import pytest
+
+from senpy_ai_news_report.features.ai import batch_jobs, batch_poller
+from senpy_ai_news_report.features.ai.batch_jobs import (
+    JOB_COMPLETED,
+    JOB_DELIVERED,
+    JOB_FAILED,
+    BatchJobStore,
+    BatchShard,
+)
+from senpy_ai_news_report.features.news.rss import feed_parser
+from senpy_ai_news_report.features.news.rss.feed_entry import FeedEntry
+from senpy_ai_news_report.features.news.rss.seen_entries import SeenEntryIndex, entry_keys
+
+
+def _ok(index):
+    body = {"choices": [{"message": {"content": f"post {index}"}}]}
+    return {"custom_id": f"request-{index}", "response": {"status_code": 200, "body": body}}
+
+
+def _failed(index):
+    return {"custom_id": f"request-{index}", "response": None, "error": {"message": "boom"}}
+
+
+class FakeClient:
+    def __init__(self, results, delete_error=None):
+        self.results = results
+        self.deleted = False
+        self.delete_error = delete_error
+        self.collected = 0
+
+    async def collect_batch_results(self, job):
+        if self.deleted:
+            raise LookupError("batch files were deleted")
+        self.collected += 1
+        return self.results
+
+    async def delete_batch_files(self, job):
+        if self.delete_error:
+            raise self.delete_error
+        self.deleted = True
+
+
+def _job(store, shards):
+    return store.create(shards, "test_continuation", {"continuation_context": {"n": 1}}, status=JOB_COMPLETED)
+
+
+def test_job_with_failed_shards_is_not_delivered(tmp_path, monkeypatch):
+    store = BatchJobStore(str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setattr(batch_jobs, "_job_store", store)
+    received = []
+
+    async def handler(results, context):
+        received.append((results, context))
+
+    batch_poller.register_continuation("test_continuation", handler)
+    job = _job(
+        store,
+        [
+            BatchShard(index=0, request_count=1, byte_size=10, completed_requests=1),
+            BatchShard(index=1, request_count=1, byte_size=10, failed_requests=1, error="expired"),
+        ],
+    )
+
+    asyncio.run(batch_poller._deliver(FakeClient([_ok(0)]), job))
+
+    assert received == [([_ok(0)], {"n": 1})]
+    assert store.get(job.id).status == JOB_FAILED
+
+
+def test_job_without_failures_is_delivered(tmp_path, monkeypatch):
+    store = BatchJobStore(str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setattr(batch_jobs, "_job_store", store)
+
+    async def handler(results, context):
+        pass
+
+    batch_poller.register_continuation("test_continuation", handler)
+    job = _job(store, [BatchShard(index=0, request_count=1, byte_size=10, completed_requests=1)])
+    client = FakeClient([_ok(0)])
+
+    asyncio.run(batch_poller._deliver(client, job))
+
+    assert client.deleted
+    assert store.get(job.id).status == JOB_DELIVERED
+
+
+def test_job_is_redelivered_after_a_crash_before_its_status_is_saved(tmp_path, monkeypatch):
+    store = BatchJobStore(str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setattr(batch_jobs, "_job_store", store)
+    calls = []
+
+    async def handler(results, context):
+        calls.append(results)
+
+    batch_poller.register_continuation("test_continuation", handler)
+    job = _job(store, [BatchShard(index=0, request_count=1, byte_size=10, completed_requests=1)])
+    client = FakeClient([_ok(0)])
+    save = store.save
+
+    def crash(job):
+        raise RuntimeError("process died")
+
+    monkeypatch.setattr(store, "save", crash)
+    with pytest.raises(RuntimeError):
+        asyncio.run(batch_poller._deliver(client, job))
+    monkeypatch.setattr(store, "save", save)
+
+    # The files are still there, so the next poll delivers the job again.
+    assert store.get(job.id).status == JOB_COMPLETED
+    assert not client.deleted
+    asyncio.run(batch_poller._deliver(client, store.get(job.id)))
+
+    assert calls == [[_ok(0)], [_ok(0)]]
+    assert store.get(job.id).status == JOB_DELIVERED
+    assert client.deleted
+
+
+def test_failed_file_cleanup_does_not_undo_delivery(tmp_path, monkeypatch):
+    store = BatchJobStore(str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setattr(batch_jobs, "_job_store", store)
+
+    async def handler(results, context):
+        pass
+
+    batch_poller.register_continuation("test_continuation", handler)
+    job = _job(store, [BatchShard(index=0, request_count=1, byte_size=10, completed_requests=1)])
+
+    asyncio.run(batch_poller._deliver(FakeClient([_ok(0)], delete_error=OSError("network down")), job))
+
+    assert store.get(job.id).status == JOB_DELIVERED
+    assert job.id not in [due.id for due in store.due_jobs()]
+
+
+def test_feeds_continuation_marks_only_successful_entries(tmp_path, monkeypatch):
+    seen = SeenEntryIndex(str(tmp_path / "seen.sqlite3"))
+    monkeypatch.setattr(feed_parser, "get_seen_index", lambda: seen)
+    posted = []
+
+    async def post_feeds(results):
+        posted.extend(results)
+
+    monkeypatch.setattr(feed_parser, "post_feeds", post_feeds)
+    first = [FeedEntry("a", "First story", "https://a.example/1", None, "")]
+    second = [FeedEntry("b", "Second story", "https://b.example/2", None, "")]
+    context = {"entry_keys": [entry_keys(entry) for entry in first + second]}
+
+    asyncio.run(feed_parser._post_feeds_continuation([_ok(0), _failed(1)], context))
+
+    assert len(posted) == 2
+    assert seen.is_seen(first[0])
+    assert not seen.is_seen(second[0])
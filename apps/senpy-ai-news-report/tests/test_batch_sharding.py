@@ -0,0 +1,81 @@
+import asyncio
+from types import SimpleNamespace
+
+from senpy_ai_news_report.features.ai.openai_client import AiNewsClient
+
+
+class FakeFiles:
+    def __init__(self):
+        self.uploads = []
+
+    async def create(self, file, purpose):
+        name, buffer, _ = file
+        self.uploads.append((name, buffer.read()))
+        await asyncio.sleep(0.01)
+        return SimpleNamespace(id=f"file-{len(self.uploads)}")
+
+
+class FakeBatches:
+    async def create(self, input_file_id, endpoint, completion_window):
+        return SimpleNamespace(id=f"batch-{input_file_id}", status="validating")
+
+
+def _client(monkeypatch, files):
+    client = AiNewsClient()
+    monkeypatch.setattr(client, "async_client", SimpleNamespace(files=files, batches=FakeBatches()))
+    return client
+
+
+def test_shards_are_split_by_request_count(monkeypatch):
+    monkeypatch.setenv("BATCH_MAX_REQUESTS_PER_SHARD", "2")
+    files = FakeFiles()
+    client = _client(monkeypatch, files)
+    lines = [f'{{"custom_id": "request-{i}"}}\n'.encode() for i in range(5)]
+
+    shards = asyncio.run(client._submit_shards(iter(lines)))
+
+    assert [shard.request_count for shard in shards] == [2, 2, 1]
+    assert all(shard.batch_id for shard in shards)
+    assert b"".join(body for _, body in sorted(files.uploads)) == b"".join(lines)
+
+
+def test_line_over_the_byte_limit_starts_the_next_shard(monkeypatch):
+    monkeypatch.setenv("BATCH_MAX_BYTES_PER_SHARD", "25")
+    client = _client(monkeypatch, FakeFiles())
+    lines = [b"x" * 10 + b"\n", b"y" * 10 + b"\n", b"z" * 10 + b"\n"]
+
+    shards = asyncio.run(client._submit_shards(iter(lines)))
+
+    assert [(shard.request_count, shard.byte_size) for shard in shards] == [(2, 22), (1, 11)]
+
+
+def test_at_most_concurrency_shards_are_buffered(monkeypatch):
+    monkeypatch.setenv("BATCH_MAX_REQUESTS_PER_SHARD", "1")
+    monkeypatch.setenv("BATCH_SUBMIT_CONCURRENCY", "2")
+    client = _client(monkeypatch, FakeFiles())
+    uploading = 0
+    peak = 0
+    uploading_when_built = []
+
+    def lines():
+        for i in range(6):
+            uploading_when_built.append(uploading)
+            yield f"{i}\n".encode()
+
+    async def submit_shard(shard, buffer):
+        nonlocal uploading, peak
+        uploading += 1
+        peak = max(peak, uploading)
+        await asyncio.sleep(0.01)
+        uploading -= 1
+        shard.batch_id = f"batch-{shard.index}"
+        return shard
+
+    monkeypatch.setattr(client, "_submit_shard", submit_shard)
+
+    shards = asyncio.run(client._submit_shards(lines()))
+
+    assert [shard.index for shard in shards] == list(range(6))
+    assert peak == 2
+    # A shard is only built while an upload slot is free.
+    assert max(uploading_when_built) <= 1
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from senpy_ai_news_report.features.ai import cascade
+from senpy_ai_news_report.features.ai.cascade import (
+    CASCADE_KEYWORDS,
+    CASCADE_MODEL,
+    CASCADE_OFF,
+    CascadeStats,
+    filter_relevant,
+    keyword_scores,
+)
+from senpy_ai_news_report.utils.tokens import estimate_tokens
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats(monkeypatch):
+    monkeypatch.setattr(cascade, "cascade_stats", CascadeStats())
+
+
+def _scorer(scores, used_tokens):
+    async def score(texts):
+        assert len(texts) == len(scores)
+        return scores, used_tokens
+
+    return score
+
+
+def test_items_at_the_threshold_are_kept():
+    items = ["keep", "edge", "drop"]
+
+    kept = asyncio.run(
+        filter_relevant(items, str, CASCADE_MODEL, _scorer([0.9, 0.5, 0.49], 0), threshold=0.5)
+    )
+
+    assert kept == ["keep", "edge"]
+    assert cascade.cascade_stats.evaluated == 3
+    assert cascade.cascade_stats.passed == 2
+
+
+def test_saved_tokens_are_net_of_the_scorer_usage():
+    dropped = "a long story nobody on the channel cares about " * 20
+    items = ["relevant", dropped]
+
+    asyncio.run(filter_relevant(items, str, CASCADE_MODEL, _scorer([1.0, 0.0], 30), threshold=0.5))
+
+    assert cascade.cascade_stats.scorer_tokens == 30
+    assert cascade.cascade_stats.saved_tokens == estimate_tokens(dropped) - 30
+
+
+def test_scoring_can_cost_more_than_it_saves():
+    asyncio.run(filter_relevant(["a", "b"], str, CASCADE_MODEL, _scorer([1.0, 1.0], 40), threshold=0.5))
+
+    assert cascade.cascade_stats.saved_tokens == -40
+
+
+def test_keyword_mode_needs_two_hits_by_default():
+    assert keyword_scores(["New Python release", "Python tips", "Cooking"], ["python", "release"]) == [
+        1.0,
+        0.5,
+        0.0,
+    ]
+
+    kept = asyncio.run(
+        filter_relevant(["GitHub ships an API", "Celebrity gossip"], str, CASCADE_KEYWORDS, threshold=1.0)
+    )
+    assert kept == ["GitHub ships an API"]
+
+
+def test_off_passes_everything_through():
+    assert asyncio.run(filter_relevant(["a", "b"], str, CASCADE_OFF)) == ["a", "b"]
+    assert cascade.cascade_stats.evaluated == 0
@@ -0,0 +1,42 @@
+from senpy_ai_news_report.features.news.rss.feed_cache import (
+    STATUS_FETCHED,
+    STATUS_NOT_MODIFIED,
+    FeedValidatorCache,
+)
+
+URL = "https://example.com/feed.xml"
+
+
+def test_validators_are_withheld_until_entries_are_seen(tmp_path):
+    cache = FeedValidatorCache(tmp_path / "validators.json")
+    cache.record(URL, STATUS_FETCHED, 200, etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+
+    assert cache.conditional_headers(URL) == {}
+
+    cache.set_unseen_entries(URL, False)
+    assert cache.conditional_headers(URL) == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+
+
+def test_unseen_entries_flag_survives_a_restart(tmp_path):
+    path = tmp_path / "validators.json"
+    cache = FeedValidatorCache(path)
+    cache.record(URL, STATUS_FETCHED, 200, etag='"v1"')
+    cache.set_unseen_entries(URL, True)
+    cache.save()
+
+    reloaded = FeedValidatorCache(path)
+    assert reloaded.conditional_headers(URL) == {}
+    reloaded.set_unseen_entries(URL, False)
+    assert reloaded.conditional_headers(URL) == {"If-None-Match": '"v1"'}
+
+
+def test_not_modified_keeps_validators(tmp_path):
+    cache = FeedValidatorCache(tmp_path / "validators.json")
+    cache.record(URL, STATUS_FETCHED, 200, etag='"v1"')
+    cache.set_unseen_entries(URL, False)
+    cache.record(URL, STATUS_NOT_MODIFIED, 304)
+
+    assert cache.conditional_headers(URL) == {"If-None-Match": '"v1"'}
@@ -0,0 +1,60 @@
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from senpy_ai_news_report.features.news.github_trending.github_trends_searcher import (
+    TrendingRepo,
+    _repo_from_row,
+    parse_trending_html,
+)
+
+FIXTURE = Path(__file__).parent / "fixtures" / "github_trending.html"
+
+
+def _html() -> str:
+    return FIXTURE.read_text(encoding="utf-8")
+
+
+def test_rows_are_parsed_with_counts_and_language():
+    repos = parse_trending_html(_html(), "html.parser")
+
+    assert [repo.repo_name for repo in repos] == [
+        "microsoft/markitdown",
+        "ollama/ollama",
+        "browser-use/browser-use",
+        "awesome-selfhosted/awesome-selfhosted",
+        "tauri-apps/tauri",
+        "vercel/ai",
+    ]
+    assert repos[0] == TrendingRepo(
+        repo_name="microsoft/markitdown",
+        repo_desc="Python tool for converting files and office documents to Markdown.",
+        full_repo_url="https://github.com/microsoft/markitdown",
+        language="Python",
+        stars=58311,
+        forks=3037,
+        stars_today=1145,
+    )
+
+
+def test_missing_language_and_description():
+    repos = {repo.repo_name: repo for repo in parse_trending_html(_html(), "html.parser")}
+
+    assert repos["awesome-selfhosted/awesome-selfhosted"].language is None
+    assert repos["tauri-apps/tauri"].repo_desc == "No description"
+    assert repos["tauri-apps/tauri"].stars_today == 1
+
+
+def test_strained_parse_matches_a_full_tree_parse():
+    soup = BeautifulSoup(_html(), "html.parser")
+    full_tree = [_repo_from_row(row) for row in soup.find_all("article", class_="Box-row")]
+
+    assert parse_trending_html(_html(), "html.parser") == full_tree
+
+
+def test_weekly_window_counts_are_read():
+    html = _html().replace("stars today", "stars this week")
+
+    assert [repo.stars_today for repo in parse_trending_html(html, "html.parser")] == [
+        1145, 392, 1032, 87, 1, 214,
+    ]
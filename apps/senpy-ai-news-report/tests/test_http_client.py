@@ -0,0 +1,53 @@
+import asyncio
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from senpy_ai_news_report.features.news.rss.feed_parser import fetch_feed
+from senpy_ai_news_report.features.news.rss.parse_executor import parse_feed_document
+from senpy_ai_news_report.utils.http_client import read_text_limited
+
+RSS = """<?xml version="1.0" encoding="windows-1251"?>
+<rss version="2.0"><channel><title>Feed</title>
+<item><guid>1</guid><title>Привет, мир</title><link>https://example.com/1</link></item>
+</channel></rss>""".encode("windows-1251")
+
+
+async def _with_server(handler, test):
+    app = web.Application()
+    app.router.add_get("/{name}", handler)
+    async with TestServer(app) as server, aiohttp.ClientSession() as session:
+        return await test(server, session)
+
+
+async def _serve(request):
+    name = request.match_info["name"]
+    if name == "feed":
+        # No charset: the encoding is only in the XML declaration.
+        return web.Response(body=RSS, headers={"Content-Type": "application/rss+xml"})
+    if name == "plain":
+        return web.Response(body="café".encode("utf-8"), headers={"Content-Type": "text/html"})
+    return web.Response(body="café".encode("latin-1"), headers={"Content-Type": "text/html; charset=latin-1"})
+
+
+def test_text_without_charset_is_read_as_utf8():
+    async def test(server, session):
+        async with session.get(server.make_url("/plain")) as response:
+            plain = await read_text_limited(response)
+        async with session.get(server.make_url("/latin")) as response:
+            latin = await read_text_limited(response)
+        return plain, latin
+
+    assert asyncio.run(_with_server(_serve, test)) == ("café", "café")
+
+
+def test_feed_without_charset_is_fetched_and_decoded_by_its_xml_declaration():
+    async def test(server, session):
+        return await fetch_feed(session, str(server.make_url("/feed")))
+
+    _, document = asyncio.run(_with_server(_serve, test))
+
+    assert document == RSS
+    (entry,) = parse_feed_document(document)
+    assert entry.title == "Привет, мир"
@@ -0,0 +1,61 @@
+import re
+
+from senpy_ai_news_report.features.telegram_integration_features.message_chunking import split_message
+
+
+def _fences_balanced(chunk):
+    return len(re.findall(r"^```", chunk, re.MULTILINE)) % 2 == 0
+
+
+def test_short_text_is_one_chunk():
+    assert split_message("hello", limit=50) == ["hello"]
+
+
+def test_splits_on_paragraphs_before_lines_and_words():
+    paragraphs = ["first paragraph here", "second paragraph here", "third paragraph here"]
+
+    chunks = split_message("\n\n".join(paragraphs), limit=55)
+
+    assert chunks == ["first paragraph here\n\nsecond paragraph here", "third paragraph here"]
+
+
+def test_long_words_are_cut_hard():
+    chunks = split_message("x" * 100, limit=30)
+
+    assert all(len(chunk) <= 30 for chunk in chunks)
+    assert "".join(chunks) == "x" * 100
+
+
+def test_every_chunk_fits_the_limit():
+    text = " ".join(f"word{i}" for i in range(500)) + "\n" + "line\n" * 200
+
+    chunks = split_message(text, limit=120)
+
+    assert all(len(chunk) <= 120 for chunk in chunks)
+    assert " ".join(" ".join(chunks).split()) == " ".join(text.split())
+
+
+def test_open_code_fence_is_closed_and_reopened_with_its_language():
+    code = "\n".join(f"print({i})" for i in range(40))
+    text = f"Intro text.\n\n```python\n{code}\n```\n\nOutro text."
+
+    chunks = split_message(text, limit=120)
+
+    assert len(chunks) > 2
+    assert all(len(chunk) <= 120 for chunk in chunks)
+    assert all(_fences_balanced(chunk) for chunk in chunks)
+    for chunk in chunks[1:-1]:
+        assert chunk.startswith("```python\n")
+        assert chunk.endswith("\n```")
+    body = "".join(chunks)
+    for i in range(40):
+        assert f"print({i})" in body
+
+
+def test_closed_fence_is_not_reopened():
+    text = "```\ncode\n```\n\n" + "plain words " * 30
+
+    chunks = split_message(text, limit=80)
+
+    assert chunks[0].startswith("```\ncode\n```")
+    assert not any(chunk.startswith("```") for chunk in chunks[1:])
@@ -0,0 +1,104 @@
+import asyncio
+import time
+
+from telethon import errors
+
+from senpy_ai_news_report.features.telegram_integration_features import message_outbox
+from senpy_ai_news_report.features.telegram_integration_features.outbox_store import (
+    MESSAGE_FAILED,
+    MESSAGE_PENDING,
+    MESSAGE_SENT,
+    OutboxStore,
+)
+
+CHANNEL = 1001
+
+
+def test_held_messages_are_skipped_until_due(tmp_path):
+    store = OutboxStore(str(tmp_path / "outbox.sqlite3"))
+    now = time.time()
+    store.add(CHANNEL, "later", schedule_at=now + 600)
+    store.add(CHANNEL, "now")
+
+    assert store.next_pending(CHANNEL, now).message == "now"
+    assert store.next_scheduled_at(CHANNEL, now) == now + 600
+    store.mark_sent(store.next_pending(CHANNEL, now).key)
+    assert store.next_pending(CHANNEL, now) is None
+    assert store.next_pending(CHANNEL, now + 601).message == "later"
+
+
+def _use_outbox(monkeypatch, tmp_path, send):
+    store = OutboxStore(str(tmp_path / "outbox.sqlite3"))
+    monkeypatch.setattr(message_outbox, "get_outbox_store", lambda: store)
+    monkeypatch.setattr(message_outbox, "send_message_to_channel", send)
+    return store
+
+
+def _statuses(store):
+    return {message.message: message.status for message in store.recent()}
+
+
+def test_worker_sends_held_message_when_its_slot_comes(monkeypatch, tmp_path):
+    sent = []
+
+    async def send(message, channel):
+        sent.append((message, time.time()))
+
+    store = _use_outbox(monkeypatch, tmp_path, send)
+
+    async def run():
+        due_at = time.time() + 0.3
+        message_outbox.enqueue_message("scheduled post", CHANNEL, schedule_at=due_at)
+        message_outbox.enqueue_message("immediate post", CHANNEL)
+        await message_outbox.drain_telegram_outbox()
+        assert [message for message, _ in sent] == ["immediate post"]
+        await asyncio.sleep(0.6)
+        await message_outbox.stop_telegram_outbox(timeout=1)
+        return due_at
+
+    due_at = asyncio.run(run())
+
+    assert [message for message, _ in sent] == ["immediate post", "scheduled post"]
+    assert sent[1][1] >= due_at
+    assert _statuses(store) == {"immediate post": MESSAGE_SENT, "scheduled post": MESSAGE_SENT}
+
+
+def test_drain_can_wait_for_held_messages(monkeypatch, tmp_path):
+    sent = []
+
+    async def send(message, channel):
+        sent.append(message)
+
+    store = _use_outbox(monkeypatch, tmp_path, send)
+
+    async def run():
+        message_outbox.enqueue_message("scheduled post", CHANNEL, schedule_at=time.time() + 0.3)
+        message_outbox.enqueue_message("immediate post", CHANNEL)
+        await message_outbox.drain_telegram_outbox(include_scheduled=True)
+        await message_outbox.stop_telegram_outbox(timeout=1)
+
+    asyncio.run(run())
+
+    assert sent == ["immediate post", "scheduled post"]
+    assert _statuses(store) == {"immediate post": MESSAGE_SENT, "scheduled post": MESSAGE_SENT}
+
+
+def test_permanent_errors_fail_without_retries(monkeypatch, tmp_path):
+    calls = []
+
+    async def send(message, channel):
+        calls.append(message)
+        raise errors.ChatWriteForbiddenError(request=None)
+
+    store = _use_outbox(monkeypatch, tmp_path, send)
+
+    async def run():
+        message_outbox.enqueue_message("forbidden", CHANNEL)
+        await message_outbox.drain_telegram_outbox()
+        await message_outbox.stop_telegram_outbox(timeout=1)
+
+    asyncio.run(run())
+
+    assert calls == ["forbidden"]
+    assert _statuses(store) == {"forbidden": MESSAGE_FAILED}
+    assert store.counts().get(MESSAGE_PENDING, 0) == 0
@@ -0,0 +1,85 @@
+import asyncio
+
+from senpy_ai_news_report.features.telegram_integration_features import message_outbox
+from senpy_ai_news_report.features.telegram_integration_features.outbox_store import (
+    MESSAGE_FAILED,
+    MESSAGE_PENDING,
+    MESSAGE_SENT,
+    OutboxStore,
+    idempotency_key,
+)
+
+CHANNEL = 1001
+
+
+def _store(tmp_path):
+    return OutboxStore(str(tmp_path / "outbox.sqlite3"))
+
+
+def test_same_message_is_stored_once(tmp_path):
+    store = _store(tmp_path)
+
+    first = store.add(CHANNEL, "hello")
+    second = store.add(CHANNEL, "hello")
+
+    assert first == (idempotency_key(CHANNEL, "hello"), True)
+    assert second == (first[0], False)
+    assert store.counts() == {MESSAGE_PENDING: 1}
+
+
+def test_same_message_to_another_channel_is_a_new_row(tmp_path):
+    store = _store(tmp_path)
+
+    store.add(CHANNEL, "hello")
+    _, added = store.add(CHANNEL + 1, "hello")
+
+    assert added
+    assert store.counts() == {MESSAGE_PENDING: 2}
+
+
+def test_sent_message_is_not_queued_again(tmp_path):
+    store = _store(tmp_path)
+    key, _ = store.add(CHANNEL, "hello")
+    store.mark_sent(key)
+
+    assert store.add(CHANNEL, "hello") == (key, False)
+    assert store.counts() == {MESSAGE_SENT: 1}
+
+
+def test_failed_message_is_reset_when_queued_again(tmp_path):
+    store = _store(tmp_path)
+    key, _ = store.add(CHANNEL, "hello")
+    store.mark_failed(key, 5, "flood")
+
+    assert store.add(CHANNEL, "hello", schedule_at=1234.0) == (key, True)
+    (message,) = store.recent()
+    assert (message.status, message.attempts, message.error, message.schedule_at) == (
+        MESSAGE_PENDING,
+        0,
+        None,
+        1234.0,
+    )
+    assert store.counts() == {MESSAGE_PENDING: 1}
+    assert store.counts().get(MESSAGE_FAILED) is None
+
+
+def test_enqueuing_a_chunked_message_twice_queues_it_once(monkeypatch, tmp_path):
+    store = _store(tmp_path)
+    monkeypatch.setattr(message_outbox, "get_outbox_store", lambda: store)
+    # Identical chunks still get distinct keys
+    message = "\n\n".join(["same paragraph " * 200] * 3)
+
+    async def run():
+        first = message_outbox.enqueue_message(message, CHANNEL)
+        second = message_outbox.enqueue_message(message, CHANNEL)
+        for worker in message_outbox._workers.values():
+            worker.task.cancel()
+        message_outbox._workers.clear()
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert len(first) > 1
+    assert len(set(first)) == len(first)
+    assert first == second
+    assert store.counts() == {MESSAGE_PENDING: len(first)}
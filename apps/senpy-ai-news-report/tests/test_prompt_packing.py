@@ -0,0 +1,116 @@
+import asyncio
+import json
+
+import pytest
+
+from senpy_ai_news_report.features.ai.openai_client import AiNewsClient
+from senpy_ai_news_report.features.ai.prompt_packing import (
+    PACKED_OUTPUT_INSTRUCTIONS,
+    pack_items,
+    unpack_results,
+)
+
+
+def _reply(index, content):
+    body = {"choices": [{"message": {"content": content}}]}
+    return {"custom_id": f"request-{index}", "response": {"status_code": 200, "body": body}}
+
+
+def _content(result):
+    return result["response"]["body"]["choices"][0]["message"]["content"]
+
+
+def _answer(packed, fence=False):
+    text = json.dumps({"items": [{"id": i, "content": f"post for item {i}"} for i in packed.item_ids]})
+    return f"```json\n{text}\n```" if fence else text
+
+
+ITEMS = ["short story", "a much longer story " * 20, "medium story " * 5, "tiny"]
+
+
+def test_pack_items_keeps_every_item_once_under_the_budget():
+    packed_requests = pack_items(ITEMS, token_budget=60)
+
+    assert sorted(i for packed in packed_requests for i in packed.item_ids) == [0, 1, 2, 3]
+    for packed in packed_requests:
+        for i in packed.item_ids:
+            assert f"### item {i}\n{ITEMS[i]}" in packed.payload
+
+
+def test_oversized_items_get_a_request_of_their_own():
+    packed_requests = pack_items(["huge story " * 200, "small", "small too"], token_budget=50)
+
+    assert [packed.item_ids for packed in packed_requests] == [[0], [1, 2]]
+
+
+def test_small_items_share_requests():
+    packed_requests = pack_items([f"story number {i}" for i in range(20)], token_budget=100)
+
+    assert len(packed_requests) < 20
+    assert sorted(i for packed in packed_requests for i in packed.item_ids) == list(range(20))
+
+
+def test_process_news_packed_sends_few_requests_and_unpacks_them(monkeypatch):
+    sent = []
+
+    async def process(system_prompt, user_prompt, payloads, model, use_cache):
+        sent.append((user_prompt, payloads))
+        return [
+            _reply(index, _answer(packed)) for index, packed in enumerate(pack_items(ITEMS, 60))
+        ]
+
+    client = AiNewsClient()
+    monkeypatch.setattr(client, "process_news_concurrently", process)
+
+    unpacked = asyncio.run(
+        client.process_news_packed("system", "user", ITEMS, token_budget=60, use_openai_batch_api=False)
+    )
+
+    ((user_prompt, payloads),) = sent
+    assert user_prompt == "user" + PACKED_OUTPUT_INSTRUCTIONS
+    assert len(payloads) == len(pack_items(ITEMS, 60))
+    assert [_content(result) for result in unpacked] == [f"post for item {i}" for i in range(4)]
+
+
+@pytest.mark.parametrize("fence", [False, True])
+def test_round_trip_gives_one_result_per_item_in_order(fence):
+    packed_requests = pack_items(ITEMS, token_budget=60)
+    results = [_reply(index, _answer(packed, fence)) for index, packed in enumerate(packed_requests)]
+
+    unpacked = unpack_results(packed_requests, results)
+
+    assert [result["custom_id"] for result in unpacked] == [f"request-{i}" for i in range(4)]
+    assert [_content(result) for result in unpacked] == [f"post for item {i}" for i in range(4)]
+
+
+@pytest.mark.parametrize(
+    "content",
+    ["7", "null", '{"items": null}', '{"items": {"id": 0}}', '"text"', "not json at all", ""],
+)
+def test_bad_replies_become_per_item_errors(content):
+    packed_requests = pack_items(["first", "second"], token_budget=1000)
+
+    unpacked = unpack_results(packed_requests, [_reply(0, content)])
+
+    assert [result["custom_id"] for result in unpacked] == ["request-0", "request-1"]
+    assert all(result["response"] is None and result["error"] for result in unpacked)
+
+
+def test_missing_and_malformed_items_fail_only_themselves():
+    packed_requests = pack_items(["first", "second", "third"], token_budget=1000)
+    content = json.dumps({"items": [{"id": 0, "content": "ok"}, {"id": 1, "content": None}, "junk"]})
+
+    unpacked = unpack_results(packed_requests, [_reply(0, content)])
+
+    assert _content(unpacked[0]) == "ok"
+    assert unpacked[1]["response"] is None
+    assert unpacked[2]["response"] is None
+
+
+def test_failed_packed_request_fails_all_its_items():
+    packed_requests = pack_items(["first", "second"], token_budget=1000)
+    failed = {"custom_id": "request-0", "response": None, "error": {"message": "expired"}}
+
+    unpacked = unpack_results(packed_requests, [failed])
+
+    assert all("expired" in result["error"]["message"] for result in unpacked)
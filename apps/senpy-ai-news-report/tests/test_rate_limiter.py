@@ -0,0 +1,74 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from openai import RateLimitError
+
+from senpy_ai_news_report.features.ai import openai_client
+from senpy_ai_news_report.features.ai.openai_client import AiNewsClient
+from senpy_ai_news_report.features.ai.rate_limiter import RateLimiter, TokenBucket
+
+
+def test_bucket_starts_full_and_refills_over_time():
+    bucket = TokenBucket(60)
+
+    assert bucket.delay_for(60) == 0
+    bucket.consume(60)
+    # One token per second
+    assert bucket.delay_for(1) == pytest.approx(1, abs=0.05)
+    assert bucket.delay_for(30) == pytest.approx(30, abs=0.05)
+
+
+def test_oversized_requests_pass_once_the_bucket_is_full():
+    bucket = TokenBucket(100)
+
+    assert bucket.delay_for(5000) == 0
+    bucket.consume(5000)
+    assert bucket.delay_for(1) > 0
+
+
+def _rate_limit_error(code, headers=None):
+    response = SimpleNamespace(request=None, status_code=429, headers=headers or {})
+    return RateLimitError("rate limited", response=response, body={"code": code, "message": code})
+
+
+def _client(monkeypatch, errors):
+    calls = []
+
+    async def create(client, system_prompt, user_prompt, data, model):
+        calls.append(data)
+        if errors:
+            raise errors.pop(0)
+        return "completion"
+
+    limiter = RateLimiter(requests_per_minute=6000, tokens_per_minute=10_000_000)
+    monkeypatch.setattr(openai_client, "get_rate_limiter", lambda: limiter)
+    client = AiNewsClient()
+    monkeypatch.setattr(client, "_create_completion", create)
+    return client, limiter, calls
+
+
+def test_rate_limits_are_retried_after_retry_after(monkeypatch):
+    errors = [_rate_limit_error("rate_limit_exceeded", {"retry-after-ms": "50"})]
+    client, limiter, calls = _client(monkeypatch, errors)
+
+    completion = asyncio.run(
+        client._process_news_rate_limited("system", "user", "data", "model", False, max_attempts=3)
+    )
+
+    assert completion == "completion"
+    assert len(calls) == 2
+    assert limiter._paused_until > 0
+
+
+def test_insufficient_quota_is_not_retried(monkeypatch):
+    errors = [_rate_limit_error("insufficient_quota"), _rate_limit_error("insufficient_quota")]
+    client, limiter, calls = _client(monkeypatch, errors)
+
+    with pytest.raises(RateLimitError):
+        asyncio.run(
+            client._process_news_rate_limited("system", "user", "data", "model", False, max_attempts=5)
+        )
+
+    assert len(calls) == 1
+    assert limiter._paused_until == 0
@@ -0,0 +1,93 @@
+import asyncio
+import json
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from senpy_ai_news_report.features.news.github_trending import repo_enrichment
+from senpy_ai_news_report.features.news.github_trending.repo_enrichment import (
+    RepoEnrichmentCache,
+    enrich_repos,
+    readme_excerpt,
+)
+
+README = """<!-- generated -->
+<p align="center"><img src="logo.png" alt="logo"></p>
+
+# Fast&nbsp;Tool
+
+[![CI](https://img.shields.io/ci.svg)](https://ci.example.com) ![demo](demo.gif)
+
+> A **fast** tool for [parsing](https://example.com/docs) `logs` &amp; metrics.
+
+```bash
+pip install fast-tool
+```
+
+## Features
+| parser | speed |
+"""
+
+METADATA = {
+    "topics": ["logs"],
+    "license": {"spdx_id": "MIT"},
+    "homepage": "",
+    "open_issues_count": 3,
+    "created_at": "2024-01-01T00:00:00Z",
+    "pushed_at": "2024-06-01T00:00:00Z",
+}
+
+
+def test_readme_excerpt_strips_markup_badges_and_code():
+    assert readme_excerpt(README, max_tokens=400) == (
+        "Fast Tool A fast tool for parsing logs & metrics. Features parser speed"
+    )
+
+
+def test_readme_excerpt_is_trimmed_to_the_token_budget():
+    excerpt = readme_excerpt("word " * 2000, max_tokens=20)
+
+    assert 0 < len(excerpt) < len("word " * 100)
+
+
+def test_unchanged_readme_is_revalidated_with_its_etag(monkeypatch, tmp_path):
+    monkeypatch.setenv("GITHUB_ENRICH_TTL_SECONDS", "0")
+    cache = RepoEnrichmentCache(str(tmp_path / "github.sqlite3"))
+    monkeypatch.setattr(repo_enrichment, "get_enrichment_cache", lambda: cache)
+    downloads = []
+    conditional = []
+
+    async def serve(request):
+        path = request.match_info["tail"]
+        etag = '"readme-v1"' if path.endswith("/readme") else '"meta-v1"'
+        if request.headers.get("If-None-Match") == etag:
+            conditional.append(path)
+            return web.Response(status=304, headers={"ETag": etag})
+        downloads.append(path)
+        body = README if path.endswith("/readme") else json.dumps(METADATA)
+        return web.Response(text=body, headers={"ETag": etag})
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/{tail:.*}", serve)
+        async with TestServer(app) as server, aiohttp.ClientSession() as session:
+
+            async def get_session():
+                return session
+
+            monkeypatch.setattr(repo_enrichment, "GITHUB_API_URL", str(server.make_url("")).rstrip("/"))
+            monkeypatch.setattr(repo_enrichment, "get_http_session", get_session)
+            first = await enrich_repos([{"repo_name": "a/tool"}])
+            second = await enrich_repos([{"repo_name": "a/tool"}])
+            return first, second
+
+    first, second = asyncio.run(run())
+
+    assert downloads == ["repos/a/tool", "repos/a/tool/readme"]
+    assert conditional == ["repos/a/tool", "repos/a/tool/readme"]
+    assert first == second
+    (repo,) = second
+    assert repo["readme_excerpt"].startswith("Fast Tool A fast tool")
+    assert repo["license"] == "MIT"
+    assert repo["topics"] == ["logs"]
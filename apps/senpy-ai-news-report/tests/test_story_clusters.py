@@ -0,0 +1,64 @@
+from senpy_ai_news_report.features.news.rss.feed_entry import FeedEntry
+from senpy_ai_news_report.features.news.rss.story_clusters import cluster_stories
+
+
+def _entry(title: str, link: str, summary: str = "") -> FeedEntry:
+    return FeedEntry(None, title, link, None, summary)
+
+
+def _grouped_links(clusters):
+    return sorted(sorted(entry.link for entry in cluster.members) for cluster in clusters)
+
+
+def test_paraphrased_headlines_are_clustered():
+    entries = [
+        _entry("OpenAI launches GPT-5 with better reasoning and fewer hallucinations", "a1"),
+        _entry("OpenAI releases GPT-5, promising improved reasoning and fewer hallucinations", "a2"),
+        _entry("GPT-5 is here: OpenAI's new model reasons better", "a3"),
+        _entry("Google announces Gemini 2.5 Pro with a one million token context window", "b1"),
+        _entry("Google unveils Gemini 2.5 Pro featuring a 1M token context window", "b2"),
+        _entry("Nvidia reports record quarterly revenue on AI chip demand", "c1"),
+        _entry("Nvidia posts record quarterly revenue as AI chip demand soars", "c2"),
+    ]
+
+    assert _grouped_links(cluster_stories(entries)) == [["a1", "a2", "a3"], ["b1", "b2"], ["c1", "c2"]]
+
+
+def test_different_stories_about_the_same_company_stay_apart():
+    entries = [
+        _entry("OpenAI launches GPT-5 with better reasoning", "a"),
+        _entry("OpenAI hires former Apple design chief", "b"),
+        _entry("OpenAI signs cloud deal with Oracle", "c"),
+        _entry("Meta open-sources Llama 4 models", "d"),
+    ]
+
+    assert len(cluster_stories(entries)) == 4
+
+
+def test_representative_is_most_detailed_and_credits_the_others():
+    short = _entry("Anthropic raises $2 billion in new funding round", "short", "Funding news.")
+    detailed = _entry(
+        "Anthropic raises $2B funding round led by investors",
+        "detailed",
+        "The AI lab raised two billion dollars in a round that values it at sixty billion.",
+    )
+
+    (cluster,) = cluster_stories([short, detailed])
+
+    assert cluster.representative is detailed
+    assert detailed.related_links == ("short",)
+
+
+def test_entries_without_text_are_not_clustered():
+    entries = [_entry("", "a"), _entry("", "b"), _entry("The", "c", "")]
+
+    assert len(cluster_stories(entries)) == 3
+
+
+def test_short_titles_fall_back_to_the_summary():
+    entries = [
+        _entry("Breaking", "a", "Microsoft acquires GitHub for 7.5 billion dollars in stock"),
+        _entry("Breaking", "b", "Apple announces Vision Pro headset at WWDC"),
+    ]
+
+    assert len(cluster_stories(entries)) == 2
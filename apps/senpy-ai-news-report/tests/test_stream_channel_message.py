@@ -0,0 +1,134 @@
+import asyncio
+
+from telethon import errors
+
+from senpy_ai_news_report.features.telegram_integration_features import stream_channel_message
+
+
+class FakeClient:
+    def __init__(self, edit_errors=(), send_errors=()):
+        self.sent = []
+        self.edits = []
+        self.send_calls = 0
+        self.edit_errors = list(edit_errors)
+        self.send_errors = list(send_errors)
+
+    async def send_message(self, channel, text):
+        self.send_calls += 1
+        if self.send_errors:
+            raise self.send_errors.pop(0)
+        self.sent.append(text)
+        return len(self.sent)
+
+    async def edit_message(self, channel, message, text):
+        if self.edit_errors:
+            raise self.edit_errors.pop(0)
+        self.edits.append(text)
+
+
+async def _chunks(*parts):
+    for part in parts:
+        yield part
+
+
+def _flood_wait(seconds):
+    return errors.FloodWaitError(request=None, capture=seconds)
+
+
+def _stream(monkeypatch, client, *parts, queued=None):
+    async def get_client():
+        return client
+
+    monkeypatch.setattr(stream_channel_message, "get_client", get_client)
+    monkeypatch.setattr(
+        stream_channel_message,
+        "enqueue_message",
+        lambda text, channel: (queued if queued is not None else []).append((channel, text)),
+    )
+    return asyncio.run(
+        stream_channel_message.stream_message_to_channel(_chunks(*parts), 42, min_chars=1, edit_interval=0)
+    )
+
+
+def test_whitespace_only_changes_are_not_edited(monkeypatch):
+    client = FakeClient()
+
+    text = _stream(monkeypatch, client, "Hello", " ", "\n", " world", "\n\n")
+
+    assert text == "Hello \n world\n\n"
+    assert client.sent == ["Hello"]
+    assert client.edits == ["Hello \n world"]
+
+
+def test_failed_intermediate_edits_do_not_abort_the_stream(monkeypatch):
+    client = FakeClient(
+        edit_errors=[
+            errors.MessageNotModifiedError(request=None),
+            errors.MessageIdInvalidError(request=None),
+        ]
+    )
+
+    text = _stream(monkeypatch, client, "one", " two", " three", " four")
+
+    assert text == "one two three four"
+    assert client.sent == ["one"]
+    assert client.edits[-1] == "one two three four"
+
+
+def test_other_configured_channels_get_the_final_text(monkeypatch):
+    monkeypatch.setenv("TELEGRAM_CHANNEL_IDS", "1,2,3")
+    queued = []
+    monkeypatch.setattr(
+        stream_channel_message, "enqueue_message", lambda text, channel: queued.append((channel, text))
+    )
+
+    async def get_client():
+        return client
+
+    client = FakeClient()
+    monkeypatch.setattr(stream_channel_message, "get_client", get_client)
+    text = asyncio.run(
+        stream_channel_message.stream_message_to_channel(_chunks("hello", " all"), None, min_chars=1)
+    )
+
+    assert client.sent == ["hello"]
+    assert queued == [(2, text), (3, text)]
+
+
+def test_flood_wait_on_first_send_is_not_retried_per_token(monkeypatch):
+    client = FakeClient(send_errors=[_flood_wait(60)])
+    queued = []
+
+    text = _stream(monkeypatch, client, "a", "b", "c", "d", "e", queued=queued)
+
+    assert client.send_calls == 1
+    assert client.sent == []
+    # Nothing was shown, so the outbox posts the full text once the wait is over.
+    assert queued == [(42, text)]
+
+
+def test_final_edit_waits_out_a_flood_wait(monkeypatch):
+    slept = []
+
+    async def sleep(seconds):
+        slept.append(seconds)
+
+    monkeypatch.setattr(stream_channel_message.asyncio, "sleep", sleep)
+    client = FakeClient(edit_errors=[_flood_wait(7), _flood_wait(7)])
+
+    # The first edit runs into the flood wait; the final edit must still land.
+    text = _stream(monkeypatch, client, "one", " two")
+
+    assert slept == [7]
+    assert client.edits == [text]
+
+
+def test_overflow_goes_through_the_outbox(monkeypatch):
+    client = FakeClient()
+    queued = []
+
+    text = _stream(monkeypatch, client, "word " * 1000, "tail " * 1000, queued=queued)
+
+    assert len(client.sent) == 1
+    assert queued and all(channel == 42 for channel, _ in queued)
+    assert client.edits[-1].split() + [w for _, chunk in queued for w in chunk.split()] == text.split()
@@ -0,0 +1,49 @@
+import asyncio
+
+from senpy_ai_news_report.features.telegram_integration_features import telegram_client
+
+
+class FakeSession:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeClient:
+    def __init__(self):
+        self.session = FakeSession()
+        self.connected = False
+        self.disconnected = False
+
+    def is_connected(self):
+        return self.connected
+
+    async def start(self, bot_token=None):
+        self.connected = True
+
+    async def disconnect(self):
+        self.connected = False
+        self.disconnected = True
+
+
+def test_client_from_a_finished_loop_is_released(monkeypatch):
+    built = []
+
+    def build():
+        built.append(FakeClient())
+        return built[-1]
+
+    monkeypatch.setattr(telegram_client, "_build_client", build)
+    monkeypatch.setattr(telegram_client, "_client", None)
+    monkeypatch.setattr(telegram_client, "_client_loop", None)
+
+    first = asyncio.run(telegram_client.get_client())
+    second = asyncio.run(telegram_client.get_client())
+    asyncio.run(telegram_client.stop_telegram_client())
+
+    assert first is not second
+    assert first.session.closed
+    assert second.disconnected
+    assert len(built) == 2
@@ -0,0 +1,82 @@
+import asyncio
+import time
+
+import pytest
+
+from senpy_ai_news_report.features.news.github_trending import trending_collector
+from senpy_ai_news_report.features.news.github_trending.trending_collector import (
+    TrendingSnapshot,
+    TrendingSnapshotStore,
+    get_trending,
+)
+from senpy_ai_news_report.features.news.github_trending.trending_history import TrendingHistory
+
+REPOS = [{"repo_name": "a/repo", "repo_desc": "", "stars": 10, "forks": 1, "stars_today": 5}]
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    store = TrendingSnapshotStore(str(tmp_path / "trending.sqlite3"))
+    history = TrendingHistory(str(tmp_path / "trending.sqlite3"))
+    monkeypatch.setattr(trending_collector, "get_trending_snapshot_store", lambda: store)
+    monkeypatch.setattr(trending_collector, "get_trending_history", lambda: history)
+    monkeypatch.setattr(trending_collector, "_inflight", {})
+    monkeypatch.setattr(trending_collector, "_fetch_semaphore", None)
+    return store
+
+
+def _scraper(monkeypatch, error=None):
+    calls = []
+
+    async def scrape(language, since):
+        calls.append((language, since))
+        await asyncio.sleep(0.05)
+        if error is not None:
+            raise error
+        return REPOS
+
+    monkeypatch.setattr(trending_collector, "scrape_github_trending", scrape)
+    return calls
+
+
+def test_fresh_snapshot_is_served_without_a_fetch(store, monkeypatch):
+    calls = _scraper(monkeypatch)
+    store.save(TrendingSnapshot("", "daily", time.time(), REPOS))
+
+    snapshot = asyncio.run(get_trending(max_age=60))
+
+    assert snapshot.repos == REPOS
+    assert calls == []
+
+
+def test_concurrent_stale_reads_share_one_fetch(store, monkeypatch):
+    calls = _scraper(monkeypatch)
+    store.save(TrendingSnapshot("", "daily", time.time() - 120, []))
+
+    async def run():
+        return await asyncio.gather(*(get_trending(max_age=60) for _ in range(5)))
+
+    snapshots = asyncio.run(run())
+
+    assert calls == [(None, "daily")]
+    assert all(snapshot.repos == REPOS for snapshot in snapshots)
+    assert store.latest("", "daily").repos == REPOS
+    assert trending_collector._inflight == {}
+
+
+def test_stale_snapshot_is_served_when_the_fetch_fails(store, monkeypatch):
+    calls = _scraper(monkeypatch, error=RuntimeError("github is down"))
+    stale = TrendingSnapshot("python", "weekly", time.time() - 7200, REPOS)
+    store.save(stale)
+
+    snapshot = asyncio.run(get_trending("python", "weekly", max_age=60))
+
+    assert calls == [("python", "weekly")]
+    assert snapshot.fetched_at == stale.fetched_at
+    assert snapshot.repos == REPOS
+
+
+def test_nothing_is_returned_when_a_page_was_never_fetched(store, monkeypatch):
+    _scraper(monkeypatch, error=RuntimeError("github is down"))
+
+    assert asyncio.run(get_trending("rust", max_age=60)) is None
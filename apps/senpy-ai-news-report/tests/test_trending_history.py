@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+from senpy_ai_news_report.features.news.github_trending.trending_history import TrendingHistory
+
+DAY = 24 * 3600
+
+
+def _repo(name, stars=0, stars_today=0):
+    return {"repo_name": name, "repo_desc": "", "stars": stars, "forks": 0, "stars_today": stars_today}
+
+
+@pytest.fixture
+def history(tmp_path):
+    return TrendingHistory(str(tmp_path / "trending.sqlite3"))
+
+
+def test_velocity_falls_back_to_the_window_figure(history):
+    assert history.velocity(_repo("a/new", stars=500, stars_today=120)) == 120
+    assert history.velocity(_repo("a/new", stars=500, stars_today=700), since="weekly") == 100
+
+
+def test_velocity_uses_the_star_difference_to_an_earlier_day(history):
+    history.record([_repo("a/repo", stars=1000)], "daily", observed_at=time.time() - 2 * DAY)
+
+    # 300 stars over two days, whatever the page claims for today
+    assert history.velocity(_repo("a/repo", stars=1300, stars_today=999)) == 150
+
+
+def test_velocity_ignores_todays_rows(history):
+    history.record([_repo("a/repo", stars=1000)], "daily")
+
+    assert history.velocity(_repo("a/repo", stars=1300, stars_today=40)) == 40
+
+
+def test_selection_ranks_by_velocity_and_respects_the_limit(history):
+    repos = [
+        _repo("a/slow", stars_today=10),
+        _repo("a/fast", stars_today=900),
+        _repo("a/mid", stars_today=90),
+    ]
+
+    picked = history.select_for_post(repos, limit=2)
+
+    assert [repo["repo_name"] for repo in picked] == ["a/fast", "a/mid"]
+    assert picked[0]["star_velocity"] == 900
+
+
+def test_posted_repos_come_back_only_when_accelerating(history, monkeypatch):
+    monkeypatch.setenv("TRENDING_ACCELERATION_FACTOR", "1.5")
+    history.mark_posted(history.select_for_post([_repo("a/repo", stars_today=100)], limit=5))
+
+    assert history.select_for_post([_repo("a/repo", stars_today=140)], limit=5) == []
+    picked = history.select_for_post([_repo("a/repo", stars_today=150)], limit=5)
+    assert [repo["repo_name"] for repo in picked] == ["a/repo"]